@@ -0,0 +1,102 @@
+"""
+콜드 스타트 대량 파싱 벤치마크 — 순차 vs 스레드 풀 vs 프로세스 풀
+
+합성 ranking_YYYYMMDD.json 파일을 임시 폴더에 만들고
+bulk_parse()로 전부 파싱해 RankIndex에 병합하는 시간(파싱 + 병합)을 비교.
+
+실행 (backend/ 에서):
+    python benchmarks/bench_cold_load.py                       # 250 / 1000 / 2500 파일
+    python benchmarks/bench_cold_load.py --files 250 --universe 2500 --workers 2 4 8
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bulk_loader import bulk_parse  # noqa: E402
+from rank_index import RankIndex  # noqa: E402
+
+SECTORS = ["반도체", "2차전지", "바이오", "금융", "자동차", "화학", "인터넷", "게임"]
+
+
+def write_state_dir(state_dir: Path, files: int, universe: int, seed: int = 42) -> list[Path]:
+    """ranking 파일 files개 생성 (종목 universe개, composite_rank 순 정렬) — 경로 목록(날짜순) 반환"""
+    rng = random.Random(seed)
+    tickers = [f"{i:06d}" for i in range(universe)]
+    paths = []
+    for d in range(files):
+        date = f"{2000 + d // 336:04d}{(d // 28) % 12 + 1:02d}{d % 28 + 1:02d}"
+        order = tickers[:]
+        rng.shuffle(order)
+        rankings = []
+        for i, ticker in enumerate(order, 1):
+            rankings.append({
+                "rank": i,
+                "composite_rank": i,
+                "ticker": ticker,
+                "name": f"종목{ticker}",
+                "score": round(rng.uniform(20, 110), 3),
+                "sector": SECTORS[int(ticker) % len(SECTORS)],
+                "per": round(rng.uniform(3, 40), 2),
+                "pbr": round(rng.uniform(0.3, 5), 2),
+                "roe": round(rng.uniform(-5, 30), 2),
+                "fwd_per": round(rng.uniform(3, 30), 2),
+                "price": rng.randint(1000, 500000),
+                "value_s": round(rng.random(), 4),
+                "quality_s": round(rng.random(), 4),
+                "growth_s": round(rng.random(), 4),
+                "momentum_s": round(rng.random(), 4),
+            })
+        path = state_dir / f"ranking_{date}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"date": date, "rankings": rankings, "metadata": {}}, f, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+def load_all(paths: list[Path], mode: str, workers: int) -> float:
+    """bulk_parse + RankIndex 병합 시간 (초)"""
+    index = RankIndex()
+    t0 = time.perf_counter()
+    for _, fragment in bulk_parse(paths, mode=mode, workers=workers, min_files=0):
+        index.set_fragment(fragment)
+    elapsed = time.perf_counter() - t0
+    assert index.n_dates == len(paths)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="콜드 스타트 대량 파싱 벤치마크")
+    parser.add_argument("--files", type=int, nargs="+", default=[250, 1000, 2500])
+    parser.add_argument("--universe", type=int, default=2500, help="파일당 종목 수")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="풀 크기 목록 (기본: 2, 4, ... CPU 수)")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    workers_list = args.workers or sorted({w for w in (2, 4, 8, 16) if w < cpus} | {2, cpus})
+
+    print(f"CPU {cpus}개, 파일당 {args.universe}종목")
+    for files in args.files:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = write_state_dir(Path(tmp), files, args.universe)
+            size_mb = sum(p.stat().st_size for p in paths) / 1024 / 1024
+            print(f"\n[{files}개 파일, {size_mb:.0f} MB]")
+            serial = load_all(paths, "serial", 1)
+            print(f"  {'serial':<8} {'':>3}  {serial:7.2f}s")
+            for mode in ("thread", "process"):
+                for workers in workers_list:
+                    if workers == 1:
+                        continue
+                    elapsed = load_all(paths, mode, workers)
+                    print(f"  {mode:<8} x{workers:<2}  {elapsed:7.2f}s  ({serial / elapsed:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
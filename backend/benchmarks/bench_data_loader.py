@@ -0,0 +1,178 @@
+"""
+data_loader 마이크로 벤치마크 — 함수별 콜드/웜 시간 + 기준선 비교 (성능 회귀 감지)
+
+합성 state/ (synthetic_state.py)를 규모별로 만들고, 함수마다 새 프로세스에서:
+  - cold: import 직후 첫 호출 (glob + 파일 파싱 + 인덱스 구축 + 계산)
+  - warm: 이어서 repeat번 호출한 중앙값 / 최솟값 (파일·인덱스 캐시가 찬 상태의 계산 시간)
+watcher를 띄우지 않으므로 데이터 버전 메모 없이 매번 계산함. 컴파일된 히스토리는 끔 (COMPILED_HISTORY=0).
+
+결과는 JSON ({"meta", "results": {규모: {함수: {cold_ms, warm_ms, warm_min_ms}}}}).
+--baseline을 주면 같은 항목끼리 비교해 threshold 비율 이상 (그리고 min-delta-ms 이상) 느려진 항목을 출력하고 exit 1.
+
+실행 (backend/ 에서):
+    python benchmarks/bench_data_loader.py                                  # 60x500 250x2500 1000x2500
+    python benchmarks/bench_data_loader.py --scales 250x2500 --output before.json
+    python benchmarks/bench_data_loader.py --scales 250x2500 --baseline before.json --threshold 0.25
+    python benchmarks/bench_data_loader.py --state-root /tmp/bench_state    # 합성 state 재사용 (없으면 생성)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthetic_state import generate_state  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 측정 대상 (이름 → data_loader 모듈을 받아 한 번 호출)
+FUNCTIONS = {
+    "get_ranking_history": lambda dl: dl.get_ranking_history("000001"),
+    "get_all_history": lambda dl: dl.get_all_history(),
+    "compute_picks": lambda dl: dl.compute_picks(),
+    "compute_pipeline_status": lambda dl: dl.compute_pipeline_status(),
+    "compute_death_list": lambda dl: dl.compute_death_list(),
+}
+
+
+def parse_scale(text: str) -> tuple[int, int]:
+    """"250x2500" → (날짜 수, 종목 수)"""
+    dates, _, universe = text.partition("x")
+    return int(dates), int(universe)
+
+
+# ============================================================
+# 측정 (자식 프로세스)
+# ============================================================
+
+def run_child(name: str, repeat: int) -> None:
+    """QUANT_STATE_DIR 기준으로 함수 하나를 측정해 JSON 한 줄 출력"""
+    import data_loader
+
+    fn = FUNCTIONS[name]
+    start = time.perf_counter()
+    fn(data_loader)
+    cold = time.perf_counter() - start
+
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(data_loader)
+        warm.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        "cold_ms": round(cold * 1000, 3),
+        "warm_ms": round(statistics.median(warm) * 1000, 3) if warm else None,
+        "warm_min_ms": round(min(warm) * 1000, 3) if warm else None,
+    }))
+
+
+def measure(state_dir: Path, name: str, repeat: int) -> dict:
+    """새 프로세스에서 함수 하나 측정 (콜드 시간이 이전 측정의 캐시에 영향받지 않도록)"""
+    env = {**os.environ, "QUANT_STATE_DIR": str(state_dir), "COMPILED_HISTORY": "0"}
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child", name, "--repeat", str(repeat)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} 측정 실패:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])  # data_loader 로그 뒤 마지막 줄
+
+
+# ============================================================
+# 기준선 비교
+# ============================================================
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float) -> list[str]:
+    """기준선보다 threshold 비율 + min_delta_ms 이상 느려진 항목 설명 목록"""
+    regressions = []
+    for scale, functions in current["results"].items():
+        for name, metrics in functions.items():
+            base = baseline.get("results", {}).get(scale, {}).get(name)
+            if not base:
+                continue
+            for metric, value in metrics.items():
+                before = base.get(metric)
+                if value is None or before is None:
+                    continue
+                if value > before * (1 + threshold) and value - before >= min_delta_ms:
+                    regressions.append(
+                        f"{scale} {name} {metric}: {before:.2f} → {value:.2f} ms ({value / before - 1:+.0%})"
+                    )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="data_loader 함수별 콜드/웜 벤치마크")
+    parser.add_argument("--scales", nargs="+", default=["60x500", "250x2500", "1000x2500"],
+                        help="날짜수x종목수 목록")
+    parser.add_argument("--functions", nargs="+", choices=list(FUNCTIONS), default=list(FUNCTIONS))
+    parser.add_argument("--repeat", type=int, default=20, help="웜 호출 횟수")
+    parser.add_argument("--web-days", type=int, default=0,
+                        help="web_data를 만들 최근 일수 (기본 0 — ranking에서 직접 계산하는 경로 측정)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--state-root", type=Path, default=None,
+                        help="합성 state를 보관할 폴더 (규모별 하위 폴더 재사용, 기본: 임시 폴더)")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", type=Path, default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.25, help="회귀로 볼 상대 증가율")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="회귀로 볼 최소 절대 증가 (ms)")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.state_root or Path(tmp)
+        results = {}
+        for scale in args.scales:
+            dates, universe = parse_scale(scale)
+            state_dir = root / f"{scale}_w{args.web_days}_s{args.seed}"
+            if not any(state_dir.glob("ranking_*.json")):
+                start = time.perf_counter()
+                generate_state(state_dir, dates, universe, args.seed, args.web_days)
+                print(f"[{scale}] 합성 state 생성 {time.perf_counter() - start:.1f}s → {state_dir}")
+            print(f"\n[{scale}] {'':<26} {'cold':>10} {'warm':>10} {'warm min':>10}")
+            results[scale] = {}
+            for name in args.functions:
+                r = results[scale][name] = measure(state_dir, name, args.repeat)
+                print(f"  {name:<30} {r['cold_ms']:>8.1f}ms {r['warm_ms']:>8.2f}ms {r['warm_min_ms']:>8.2f}ms")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "web_days": args.web_days,
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+
+    if args.baseline:
+        regressions = compare(json.loads(args.baseline.read_text(encoding="utf-8")), report,
+                              args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n성능 회귀 {len(regressions)}건 (기준 +{args.threshold:.0%}, {args.min_delta_ms}ms 이상):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n기준선 대비 회귀 없음 (+{args.threshold:.0%} 기준)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+HTTP 부하 테스트 — 합성 state/ 위에 uvicorn으로 main:app을 띄우고 대시보드 트래픽을 재현
+
+트래픽 (가상 사용자 = keep-alive 연결 하나, 응답을 받으면 바로 다음 요청 — closed loop):
+  - 페이지뷰 1회 = 패널 6개 (/api/rankings/latest, picks, deathlist, market, pipeline, ai)
+  - 페이지뷰마다 history-ratio 확률로 /api/history/{ticker} 1회 추가 (종목은 무작위)
+시나리오:
+  - steady: concurrency 단계별로 duration초씩 (앞 warmup초는 집계 제외)
+  - drop:   drop-concurrency로 돌리는 중간에 다음 영업일 ranking/web_data 파일을 state/에 투입
+            → 투입 전/후 지연, 새 날짜가 /api/rankings/latest에 보이기까지 걸린 시간
+보고: 라우트별·전체 p50/p95/p99, 초당 요청 수, 오류율 (5xx·4xx·연결 오류, 304는 정상)
+
+외부 부하 도구 없이 asyncio 소켓으로 HTTP/1.1 요청 (클라이언트 오버헤드를 줄이려고 본문은 파싱하지 않음).
+부하 측정이 서버와 CPU를 나눠 쓰므로, 코어가 적으면 --server-workers를 늘리기보다 결과를 상대 비교용으로 볼 것.
+
+실행 (backend/ 에서):
+    python benchmarks/bench_http_load.py                                   # 250x2500, 동시성 1 8 32 64 + drop
+    python benchmarks/bench_http_load.py --scale 60x500 --concurrency 4 16 --duration 10
+    python benchmarks/bench_http_load.py --scenarios drop --drop-concurrency 32 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthetic_state import generate_state, next_business_date  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 대시보드 패널 6개 (frontend refetchPanel과 같은 경로)
+PANEL_PATHS = (
+    "/api/rankings/latest",
+    "/api/picks",
+    "/api/deathlist",
+    "/api/market",
+    "/api/pipeline",
+    "/api/ai",
+)
+HISTORY_ROUTE = "/api/history/{ticker}"
+
+
+def parse_scale(text: str) -> tuple[int, int]:
+    """"250x2500" → (날짜 수, 종목 수)"""
+    dates, _, universe = text.partition("x")
+    return int(dates), int(universe)
+
+
+def percentile(sorted_values: list[float], q: float) -> Optional[float]:
+    """nearest-rank 백분위수 (정렬된 목록)"""
+    if not sorted_values:
+        return None
+    k = min(len(sorted_values), max(1, math.ceil(q / 100 * len(sorted_values))))
+    return sorted_values[k - 1]
+
+
+# ============================================================
+# HTTP 클라이언트 (keep-alive 연결 하나)
+# ============================================================
+
+class HttpConnection:
+    """HTTP/1.1 GET 전용 연결 — 끊기면 다음 요청에서 다시 연결"""
+
+    def __init__(self, host: str, port: int, accept_encoding: str):
+        self.host = host
+        self.port = port
+        self.accept_encoding = accept_encoding
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def get(self, path: str) -> tuple[int, bytes, dict]:
+        """(상태 코드, 본문, 헤더) — 실패하면 연결을 닫고 예외 전파"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            self.writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Accept: application/json\r\nAccept-Encoding: {self.accept_encoding}\r\n\r\n".encode()
+            )
+            await self.writer.drain()
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise ConnectionError("서버가 연결을 닫음")
+            status = int(status_line.split()[1])
+            headers = {}
+            while True:
+                line = await self.reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            body = await self._read_body(headers)
+        except BaseException:
+            self.close()
+            raise
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, body, headers
+
+    async def _read_body(self, headers: dict) -> bytes:
+        if "content-length" in headers:
+            return await self.reader.readexactly(int(headers["content-length"]))
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                chunks.append((await self.reader.readexactly(size + 2))[:-2])  # 데이터 + CRLF
+                if size == 0:
+                    return b"".join(chunks)
+        return b""
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+# ============================================================
+# 부하 실행
+# ============================================================
+
+class LoadRun:
+    """동시성 한 단계의 요청 기록 (시각, 라우트, 지연, 상태)"""
+
+    def __init__(self):
+        self.samples: list[tuple[float, str, float, int]] = []  # (시작 시각, 라우트, 지연 초, 상태 / 0 = 연결 오류)
+        self.errors: dict[str, int] = {}
+
+    def record(self, started: float, route: str, latency: float, status: int) -> None:
+        self.samples.append((started, route, latency, status))
+
+    def summarize(self, start: float, end: float) -> dict:
+        """[start, end) 구간에 시작한 요청 통계 (전체 + 라우트별)"""
+        window = [s for s in self.samples if start <= s[0] < end]
+        routes: dict[str, list] = {}
+        for sample in window:
+            routes.setdefault(sample[1], []).append(sample)
+        result = _stats(window, end - start)
+        result["routes"] = {route: _stats(samples, end - start) for route, samples in sorted(routes.items())}
+        return result
+
+
+def _stats(samples: list, seconds: float) -> dict:
+    latencies = sorted(s[2] * 1000 for s in samples)
+    errors = sum(1 for s in samples if s[3] == 0 or s[3] >= 400)
+    return {
+        "requests": len(samples),
+        "rps": round(len(samples) / seconds, 1) if seconds > 0 else None,
+        "error_rate": round(errors / len(samples), 4) if samples else None,
+        "p50_ms": _round(percentile(latencies, 50)),
+        "p95_ms": _round(percentile(latencies, 95)),
+        "p99_ms": _round(percentile(latencies, 99)),
+        "max_ms": _round(latencies[-1] if latencies else None),
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 2)
+
+
+async def _virtual_user(conn: HttpConnection, run: LoadRun, stop_at: float, history_ratio: float,
+                        tickers: list[str], rng: random.Random, think: float) -> None:
+    """페이지뷰를 반복 (패널 6개 + 가끔 종목 히스토리)"""
+    while time.perf_counter() < stop_at:
+        requests = [(path, path) for path in PANEL_PATHS]
+        if rng.random() < history_ratio:
+            requests.append((HISTORY_ROUTE, f"/api/history/{rng.choice(tickers)}"))
+        for route, path in requests:
+            started = time.perf_counter()
+            if started >= stop_at:
+                return
+            try:
+                status, _, _ = await conn.get(path)
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                status = 0
+                run.errors[type(e).__name__] = run.errors.get(type(e).__name__, 0) + 1
+            run.record(started, route, time.perf_counter() - started, status)
+        if think:
+            await asyncio.sleep(think)
+
+
+async def run_level(host: str, port: int, concurrency: int, duration: float, args, tickers: list[str],
+                    on_tick=None) -> LoadRun:
+    """동시성 concurrency로 duration초 부하 (on_tick: 부하와 함께 돌릴 코루틴 — drop 시나리오)"""
+    run = LoadRun()
+    stop_at = time.perf_counter() + duration
+    conns = [HttpConnection(host, port, args.accept_encoding) for _ in range(concurrency)]
+    rng = random.Random(args.seed)
+    users = [
+        _virtual_user(conn, run, stop_at, args.history_ratio, tickers, random.Random(rng.random()),
+                      args.think_ms / 1000)
+        for conn in conns
+    ]
+    try:
+        await asyncio.gather(*users, *([on_tick] if on_tick else []))
+    finally:
+        for conn in conns:
+            conn.close()
+    return run
+
+
+# ============================================================
+# 서버 / 데이터 투입
+# ============================================================
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(state_dir: Path, port: int, workdir: Path, args) -> subprocess.Popen:
+    """uvicorn main:app (state_dir 기준, 컴파일 히스토리는 임시 경로) — warm-up이 끝날 때까지 (/api/health/ready) 대기"""
+    env = {
+        **os.environ,
+        "QUANT_STATE_DIR": str(state_dir),
+        "COMPILED_HISTORY_PATH": str(workdir / "ranking_history.rkc"),
+        "STATE_WATCH_INTERVAL": str(args.watch_interval),
+    }
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--log-level", "warning", "--no-access-log", "--workers", str(args.server_workers)]
+    log = open(workdir / "server.log", "wb")
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.time() + args.boot_timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버 종료됨 (exit {proc.returncode}) — {workdir / 'server.log'}")
+        try:
+            status, _, _ = asyncio.run(_get_once("127.0.0.1", port, "/api/health/ready"))
+            if status == 200:
+                return proc
+        except OSError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"서버가 {args.boot_timeout}초 안에 뜨지 않음")
+
+
+async def _get_once(host: str, port: int, path: str) -> tuple[int, bytes, dict]:
+    conn = HttpConnection(host, port, "identity")
+    try:
+        return await conn.get(path)
+    finally:
+        conn.close()
+
+
+async def _latest_date(host: str, port: int) -> Optional[str]:
+    status, body, _ = await _get_once(host, port, "/api/dates")
+    dates = json.loads(body).get("dates") if status == 200 else None
+    return dates[0] if dates else None
+
+
+def prepare_drop(state_dir: Path, staging: Path, dates: int, universe: int, seed: int, web_days: int) -> list[Path]:
+    """다음 영업일 파일을 staging에 미리 생성 (투입은 같은 파일시스템 안 rename — 부분 파일이 보이지 않음)"""
+    last = max(p.stem.split("_")[-1] for p in state_dir.glob("ranking_*.json"))
+    new_date = next_business_date(last).strftime("%Y%m%d")
+    generate_state(staging, dates + 1, universe, seed, max(web_days, 1), end=next_business_date(last))
+    return [p for p in staging.glob(f"*_{new_date}.json")]
+
+
+async def drop_files(files: list[Path], state_dir: Path, delay: float, stop_at: float, host: str, port: int,
+                     timeline: dict) -> None:
+    """delay초 뒤 파일 투입 → 새 날짜가 보일 때까지 /api/dates 폴링 (stop_at까지)"""
+    await asyncio.sleep(delay)
+    new_date = files[0].stem.split("_")[-1]
+    timeline["dropped_at"] = time.perf_counter()
+    for path in sorted(files, key=lambda p: not p.name.startswith("ranking_")):  # ranking 먼저
+        os.replace(path, state_dir / path.name)
+    while time.perf_counter() < stop_at:
+        try:
+            if await _latest_date(host, port) == new_date:
+                timeline["visible_at"] = time.perf_counter()
+                return
+        except (OSError, ValueError):
+            pass
+        await asyncio.sleep(0.05)
+
+
+# ============================================================
+# 출력
+# ============================================================
+
+def print_summary(title: str, summary: dict) -> None:
+    print(f"\n{title}")
+    print(f"  {'':<24} {'req':>7} {'rps':>8} {'err':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    rows = [("(전체)", summary)] + list(summary["routes"].items())
+    for name, s in rows:
+        if not s["requests"]:
+            continue
+        print(f"  {name:<24} {s['requests']:>7} {s['rps']:>8.1f} {s['error_rate']:>7.2%} "
+              f"{s['p50_ms']:>6.1f}ms {s['p95_ms']:>6.1f}ms {s['p99_ms']:>6.1f}ms {s['max_ms']:>6.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대시보드 HTTP 부하 테스트")
+    parser.add_argument("--scale", default="250x2500", help="합성 state 규모 (날짜수x종목수)")
+    parser.add_argument("--web-days", type=int, default=3, help="web_data를 만들 최근 일수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--state-root", type=Path, default=None,
+                        help="합성 state 보관 폴더 (재사용, 기본: 임시 폴더) — drop 시나리오는 복사본에서 실행")
+    parser.add_argument("--scenarios", nargs="+", choices=("steady", "drop"), default=["steady", "drop"])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--duration", type=float, default=20, help="단계별 실행 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=2, help="단계 시작 후 집계에서 뺄 시간 (초)")
+    parser.add_argument("--drop-concurrency", type=int, default=None, help="drop 시나리오 동시성 (기본: 최대 단계)")
+    parser.add_argument("--history-ratio", type=float, default=0.2, help="페이지뷰당 종목 히스토리 요청 확률")
+    parser.add_argument("--think-ms", type=float, default=0, help="페이지뷰 사이 대기 (ms)")
+    parser.add_argument("--accept-encoding", default="gzip, deflate, br")
+    parser.add_argument("--server-workers", type=int, default=1)
+    parser.add_argument("--watch-interval", type=float, default=0.5, help="서버 STATE_WATCH_INTERVAL (초)")
+    parser.add_argument("--boot-timeout", type=float, default=300)
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    dates, universe = parse_scale(args.scale)
+    tickers = [f"{i:06d}" for i in range(universe)]
+    report = {"meta": {**{k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+                       "cpus": os.cpu_count()}, "steady": {}, "drop": None}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        root = args.state_root or tmp
+        base_dir = root / f"{args.scale}_w{args.web_days}_s{args.seed}"
+        if not any(base_dir.glob("ranking_*.json")):
+            start = time.perf_counter()
+            generate_state(base_dir, dates, universe, args.seed, args.web_days)
+            print(f"합성 state 생성 {time.perf_counter() - start:.1f}s → {base_dir}")
+
+        # drop 시나리오는 state를 바꾸므로 복사본에서 (재사용하는 원본 보존)
+        state_dir = base_dir
+        drop_files_list: list[Path] = []
+        if "drop" in args.scenarios:
+            state_dir = tmp / "state"
+            shutil.copytree(base_dir, state_dir)
+            drop_files_list = prepare_drop(state_dir, tmp / "staging", dates, universe, args.seed, args.web_days)
+
+        port = _free_port()
+        start = time.perf_counter()
+        server = start_server(state_dir, port, tmp, args)
+        print(f"서버 기동 + warm-up {time.perf_counter() - start:.1f}s (port {port}, {dates}일 × {universe}종목)")
+        try:
+            if "steady" in args.scenarios:
+                for level in args.concurrency:
+                    t0 = time.perf_counter()
+                    run = asyncio.run(run_level("127.0.0.1", port, level, args.duration, args, tickers))
+                    summary = run.summarize(t0 + args.warmup, t0 + args.duration)
+                    summary["connection_errors"] = run.errors
+                    report["steady"][str(level)] = summary
+                    print_summary(f"[steady] 동시성 {level}", summary)
+
+            if "drop" in args.scenarios:
+                level = args.drop_concurrency or max(args.concurrency)
+                timeline: dict = {}
+                t0 = time.perf_counter()
+                end = t0 + args.duration
+                run = asyncio.run(run_level(
+                    "127.0.0.1", port, level, args.duration, args, tickers,
+                    on_tick=drop_files(drop_files_list, state_dir, args.duration / 2, end, "127.0.0.1", port, timeline),
+                ))
+                dropped = timeline.get("dropped_at", end)
+                visible = timeline.get("visible_at")
+                before = run.summarize(t0 + args.warmup, dropped)
+                after = run.summarize(dropped, end)
+                report["drop"] = {
+                    "concurrency": level,
+                    "files": [p.name for p in drop_files_list],
+                    "visible_after_s": round(visible - dropped, 3) if visible else None,
+                    "before": before,
+                    "after": after,
+                    "connection_errors": run.errors,
+                }
+                print_summary(f"[drop] 동시성 {level} — 투입 전", before)
+                print_summary(f"[drop] 동시성 {level} — 투입 후", after)
+                shown = f"{visible - dropped:.2f}s" if visible else "시간 안에 안 보임"
+                print(f"  새 날짜 반영: {shown}")
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
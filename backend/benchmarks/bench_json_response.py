@@ -0,0 +1,106 @@
+"""
+JSON 응답 경로 벤치마크 — FastAPI 기본(jsonable_encoder + JSONResponse) vs FastJSONResponse
+
+get_all_history()와 같은 모양의 페이로드(종목별 Top 30 히스토리)를 만들어
+1) 직렬화 단계만 비교하고
+2) TestClient로 실제 라우트 왕복까지 비교
+
+실행 (backend/ 에서):
+    python benchmarks/bench_json_response.py --days 500 --tickers 400
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import fast_json  # noqa: E402
+from fast_json import FastJSONResponse  # noqa: E402
+
+SECTORS = ["반도체", "2차전지", "바이오", "금융", "자동차", "화학", "인터넷", "게임"]
+
+
+def make_all_history_payload(days: int, tickers: int, top_n: int = 30, seed: int = 42) -> dict:
+    """get_all_history() 형태의 합성 페이로드 — 매일 Top N이 조금씩 교체됨"""
+    rng = random.Random(seed)
+    universe = [f"{i:06d}" for i in range(tickers)]
+    dates = [f"2024{(d // 28) % 12 + 1:02d}{d % 28 + 1:02d}" for d in range(days)]
+    top = rng.sample(universe, top_n)
+    stocks = {}
+    for date in dates:
+        # 하루에 2~4 종목 교체
+        for _ in range(rng.randint(2, 4)):
+            top[rng.randrange(top_n)] = rng.choice(universe)
+        rng.shuffle(top)
+        for cr, ticker in enumerate(top, start=1):
+            entry = stocks.setdefault(ticker, {
+                "name": f"종목{ticker}",
+                "sector": SECTORS[int(ticker) % len(SECTORS)],
+                "history": [],
+            })
+            entry["history"].append({"date": date, "composite_rank": cr, "score": round(rng.uniform(40, 100), 2)})
+    return {"stocks": stocks, "dates": dates}
+
+
+def _time(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    med = statistics.median(samples)
+    print(f"  {label:<34} median {med:8.2f} ms   min {min(samples):8.2f} ms")
+    return med
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=500)
+    parser.add_argument("--tickers", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payload = make_all_history_payload(args.days, args.tickers)
+    size = len(fast_json.dumps_bytes(payload))
+    entries = sum(len(s["history"]) for s in payload["stocks"].values())
+    print(f"payload: {len(payload['stocks'])} stocks, {entries} history rows, {size / 1024:.0f} KB")
+    print(f"encoder: {'orjson' if fast_json.orjson is not None else 'json (stdlib)'}")
+
+    print("\n[직렬화 단계]")
+    base = _report("jsonable_encoder + JSONResponse",
+                   _time(lambda: JSONResponse(jsonable_encoder(payload)), args.repeat))
+    fast = _report("FastJSONResponse", _time(lambda: FastJSONResponse(payload), args.repeat))
+    print(f"  → {base / fast:.1f}x")
+
+    print("\n[라우트 왕복 (TestClient)]")
+    app = FastAPI()
+
+    @app.get("/default")
+    def default_route():
+        return payload
+
+    @app.get("/fast", response_class=FastJSONResponse)
+    def fast_route():
+        return FastJSONResponse(payload)
+
+    client = TestClient(app)
+    assert client.get("/default").json() == client.get("/fast").json()
+    base = _report("dict 반환 (기본)", _time(lambda: client.get("/default"), args.repeat))
+    fast = _report("FastJSONResponse 반환", _time(lambda: client.get("/fast"), args.repeat))
+    print(f"  → {base / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+합성 state/ 디렉토리 생성기 — ranking_YYYYMMDD.json / web_data_YYYYMMDD.json
+
+실제 quant_py-main 출력과 같은 모양의 파일을 고정 seed로 생성 (벤치마크·부하 테스트용):
+  - 영업일(주말 제외) dates개, 종목 universe개
+  - 종목별 잠재 점수가 AR(1)로 천천히 움직이고 매일 잡음이 더해짐 → 순위가 날마다 조금씩 바뀜
+    (Top 30 교집합 / 이탈 종목이 실제처럼 생김)
+  - 매일 일부 종목은 사전 필터에서 빠짐 (파일마다 종목 수가 조금씩 다름)
+  - 레코드는 composite_rank 순 정렬, 팩터 점수·가격·PER 등 숫자 필드 포함
+  - web_data는 마지막 web_days일에만 생성 (0이면 없음 → compute_*가 ranking에서 직접 계산)
+
+실행 (backend/ 에서):
+    python benchmarks/synthetic_state.py /tmp/state --dates 250 --universe 2500
+    QUANT_STATE_DIR=/tmp/state uvicorn main:app --port 8001
+"""
+import argparse
+import datetime as dt
+import json
+import random
+from pathlib import Path
+from typing import Optional
+
+SECTORS = ["반도체", "2차전지", "바이오", "금융", "자동차", "화학", "인터넷", "게임", "조선", "건설"]
+SEASONS = [("봄", "🌸", "Q1"), ("여름", "☀️", "Q2"), ("가을", "🍂", "Q3"), ("겨울", "❄️", "Q4")]
+
+
+def business_dates(count: int, end: Optional[dt.date] = None) -> list[str]:
+    """end(기본 2026-01-30)까지 주말을 뺀 count일 (오래된 순, YYYYMMDD)"""
+    day = end or dt.date(2026, 1, 30)
+    dates = []
+    while len(dates) < count:
+        if day.weekday() < 5:
+            dates.append(day.strftime("%Y%m%d"))
+        day -= dt.timedelta(days=1)
+    return dates[::-1]
+
+
+def next_business_date(date: str) -> dt.date:
+    """YYYYMMDD 다음 영업일 (새 파일 투입 시나리오용 — generate_state(..., end=) 에 넘김)"""
+    day = dt.datetime.strptime(date, "%Y%m%d").date() + dt.timedelta(days=1)
+    while day.weekday() >= 5:
+        day += dt.timedelta(days=1)
+    return day
+
+
+class _Universe:
+    """종목별 상태 (잠재 점수, 팩터 성향, 가격, EPS)"""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.rng = rng
+        self.tickers = [f"{i:06d}" for i in range(size)]
+        self.sector = {t: SECTORS[rng.randrange(len(SECTORS))] for t in self.tickers}
+        self.latent = {t: rng.gauss(0, 1) for t in self.tickers}
+        self.tilt = {t: [rng.gauss(0, 1) for _ in range(4)] for t in self.tickers}
+        self.price = {t: rng.randint(2, 500) * 1000 for t in self.tickers}
+        self.eps = {t: self.price[t] / rng.uniform(4, 30) for t in self.tickers}
+
+    def step(self) -> None:
+        rng = self.rng
+        for t in self.tickers:
+            self.latent[t] = 0.97 * self.latent[t] + rng.gauss(0, 0.25)
+            self.price[t] = max(100, round(self.price[t] * (1 + rng.gauss(0, 0.02)), -1))
+            self.eps[t] *= 1 + rng.gauss(0, 0.01)
+
+    def rankings(self, drop_ratio: float) -> list[dict]:
+        rng = self.rng
+        scored = []
+        for t in self.tickers:
+            if rng.random() < drop_ratio:
+                continue  # 사전 필터 탈락
+            scored.append((self.latent[t] + rng.gauss(0, 0.15), t))
+        scored.sort(reverse=True)
+        rows = []
+        for i, (z, t) in enumerate(scored, 1):
+            tilt = self.tilt[t]
+            factors = [round(min(1.0, max(0.0, 0.5 + 0.15 * (z + tilt[k]) + rng.gauss(0, 0.05))), 4)
+                       for k in range(4)]
+            fwd_per = self.price[t] / self.eps[t] if self.eps[t] > 0 else None
+            rows.append({
+                "rank": i,
+                "composite_rank": i,
+                "ticker": t,
+                "name": f"종목{t}",
+                "score": round(60 + 15 * z, 3),
+                "sector": self.sector[t],
+                "per": round(fwd_per * rng.uniform(0.9, 1.2), 2) if fwd_per else None,
+                "pbr": round(rng.uniform(0.3, 5), 2),
+                "roe": round(rng.uniform(-5, 30), 2),
+                "fwd_per": round(fwd_per, 2) if fwd_per else None,
+                "price": self.price[t],
+                "value_s": factors[0],
+                "quality_s": factors[1],
+                "growth_s": factors[2],
+                "momentum_s": factors[3],
+            })
+        return rows
+
+
+def _web_data(date: str, history: list[list[dict]], rng: random.Random) -> dict:
+    """최근 3일 ranking으로 web_data 한 건 (상류 웹 출력과 같은 키)"""
+    t0 = history[-1]
+    t1 = history[-2] if len(history) > 1 else []
+    t2 = history[-3] if len(history) > 2 else []
+    r0 = {s["ticker"]: s["composite_rank"] for s in t0}
+    r1 = {s["ticker"]: s["composite_rank"] for s in t1}
+    r2 = {s["ticker"]: s["composite_rank"] for s in t2}
+    top = [s for s in t0 if s["composite_rank"] <= 30]
+    verified = [s for s in top if r1.get(s["ticker"], 999) <= 30 and r2.get(s["ticker"], 999) <= 30]
+    pending = [s for s in top if s not in verified and r1.get(s["ticker"], 999) <= 30]
+    new_entry = [s for s in top if s not in verified and s not in pending]
+    picks = sorted(
+        verified, key=lambda s: s["composite_rank"] * 0.5 + r1[s["ticker"]] * 0.3 + r2[s["ticker"]] * 0.2
+    )[:5]
+    exited = [
+        {"ticker": s["ticker"], "name": s["name"], "sector": s["sector"], "prev_rank": s["composite_rank"],
+         "rank": r0.get(s["ticker"]), "exit_reason": rng.choice(["📉가격↓", "⚠️전망↓", "📉가격↓ ⚠️전망↓", ""])}
+        for s in t1 if s["composite_rank"] <= 50 and r0.get(s["ticker"], 999) > 50
+    ]
+    season, icon, quadrant = SEASONS[rng.randrange(len(SEASONS))]
+    return {
+        "date": date,
+        "market": {
+            "kospi": {"close": round(rng.uniform(2300, 2900), 2), "change_pct": round(rng.gauss(0, 1), 2)},
+            "kosdaq": {"close": round(rng.uniform(650, 950), 2), "change_pct": round(rng.gauss(0, 1.3), 2)},
+            "warnings": [],
+        },
+        "credit": {
+            "hy": {"hy_spread": round(rng.uniform(2.5, 6), 2), "median_10y": 4.0, "quadrant": quadrant,
+                   "quadrant_label": season, "quadrant_icon": icon, "q_days": rng.randint(1, 60), "signals": []},
+            "kr": {"spread": round(rng.uniform(3, 10), 2), "regime": "normal"},
+            "vix": {"vix_current": round(rng.uniform(11, 35), 2), "vix_pct": round(rng.uniform(0, 100), 1)},
+            "final_action": "평소대로 매수하세요",
+            "concordance": "both_stable",
+        },
+        "pipeline": {"verified": verified, "pending": pending, "new_entry": new_entry},
+        "sectors": {sec: sum(s["sector"] == sec for s in top) for sec in SECTORS if any(s["sector"] == sec for s in top)},
+        "picks": [
+            {**{k: s[k] for k in ("ticker", "name", "sector", "score", "per", "pbr", "roe", "fwd_per")},
+             "rank_t0": s["composite_rank"], "rank_t1": r1[s["ticker"]], "rank_t2": r2[s["ticker"]],
+             "weighted_rank": round(s["composite_rank"] * 0.5 + r1[s["ticker"]] * 0.3 + r2[s["ticker"]] * 0.2, 1)}
+            for s in picks
+        ],
+        "exited": exited,
+        "ai": {"risk_filter": "특이사항 없음", "picks_text": "합성 데이터", "flagged_tickers": []},
+    }
+
+
+def generate_state(
+    state_dir: Path,
+    dates: int = 250,
+    universe: int = 2500,
+    seed: int = 42,
+    web_days: int = 0,
+    drop_ratio: float = 0.03,
+    end: Optional[dt.date] = None,
+) -> list[str]:
+    """state_dir에 합성 파일 생성 — 생성한 날짜 목록(오래된 순) 반환"""
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    stocks = _Universe(universe, rng)
+    day_list = business_dates(dates, end)
+    recent: list[list[dict]] = []
+    for i, date in enumerate(day_list):
+        stocks.step()
+        rows = stocks.rankings(drop_ratio)
+        recent = (recent + [rows])[-3:]
+        data = {
+            "date": date,
+            "generated_at": f"{date[:4]}-{date[4:6]}-{date[6:]}T18:30:00",
+            "rankings": rows,
+            "metadata": {"total_universe": universe, "prefilter_passed": len(rows),
+                         "scored_count": len(rows), "version": "synthetic"},
+        }
+        with open(state_dir / f"ranking_{date}.json", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        if web_days and i >= len(day_list) - web_days:
+            with open(state_dir / f"web_data_{date}.json", "w", encoding="utf-8") as f:
+                json.dump(_web_data(date, recent, rng), f, ensure_ascii=False)
+    return day_list
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="합성 state/ 디렉토리 생성")
+    parser.add_argument("state_dir", type=Path)
+    parser.add_argument("--dates", type=int, default=250, help="영업일 수")
+    parser.add_argument("--universe", type=int, default=2500, help="종목 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--web-days", type=int, default=1, help="web_data를 만들 최근 일수 (0 = 없음)")
+    args = parser.parse_args()
+    dates = generate_state(args.state_dir, args.dates, args.universe, args.seed, args.web_days)
+    size_mb = sum(p.stat().st_size for p in args.state_dir.glob("*.json")) / 1024 / 1024
+    print(f"{args.state_dir}: {dates[0]} ~ {dates[-1]} ({len(dates)}일 × {args.universe}종목, {size_mb:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
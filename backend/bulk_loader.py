@@ -0,0 +1,108 @@
+"""
+ranking 파일 대량 병렬 파싱 (콜드 스타트용)
+
+- 파일 여러 개를 프로세스 풀(또는 스레드 풀)에 나눠 파싱
+- 워커는 dict 목록 대신 컬럼 조각(Fragment)만 돌려줌 — pickle로 넘어가는 건 NumPy 배열 + 문자열 리스트
+- 결과는 입력 순서(날짜 순) 그대로 yield → 메인 프로세스가 순서대로 인덱스에 병합
+- 파일 수가 적거나 CPU가 하나면 풀을 띄우는 비용이 더 크므로 그냥 순차 파싱
+- 풀을 만들 수 없거나 워커가 죽으면 남은 파일은 순차 파싱 (콜드 스타트가 실패하지 않도록)
+- 워커에서 스키마 검증 + 정규화까지 끝냄 (ranking_schema) — 깨진 파일은 on_error로 넘김
+
+환경변수:
+    BULK_LOAD_MODE=process|thread|serial   (기본 process)
+    BULK_LOAD_WORKERS=<n>                  (기본 CPU 수 — 1이면 순차)
+    BULK_LOAD_MIN_FILES=<n>                (이보다 적으면 순차, 기본 16)
+"""
+import json
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from rank_index import Fragment, fragment_from_rankings
+from ranking_schema import normalize_ranking
+
+BULK_LOAD_MODE = os.environ.get("BULK_LOAD_MODE", "process")
+BULK_LOAD_WORKERS = int(os.environ.get("BULK_LOAD_WORKERS", "0")) or (os.cpu_count() or 1)
+BULK_LOAD_MIN_FILES = int(os.environ.get("BULK_LOAD_MIN_FILES", "16"))
+
+
+def parse_fragment(path: str) -> tuple[tuple[int, int], Fragment]:
+    """
+    ranking_YYYYMMDD.json 하나 → (원본 시그니처, Fragment)  (워커에서 실행)
+
+    시그니처는 읽기 전에 잼 — 읽는 도중 파일이 바뀌면 다음 동기화 때 다시 파싱됨
+    """
+    st = os.stat(path)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    date = Path(path).stem.replace("ranking_", "")
+    data = normalize_ranking(data, date)
+    return (st.st_mtime_ns, st.st_size), fragment_from_rankings(date, data["rankings"])
+
+
+def _executor(mode: str, workers: int) -> Optional[Executor]:
+    if mode == "process":
+        # 서버 프로세스는 스레드가 여럿이라 fork 대신 forkserver (Windows는 spawn)
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+    if mode == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-load")
+    return None
+
+
+def bulk_parse(
+    paths: list[Path],
+    mode: Optional[str] = None,
+    workers: Optional[int] = None,
+    min_files: Optional[int] = None,
+    on_error: Optional[Callable[[Path, Exception], None]] = None,
+) -> Iterator[tuple[tuple[int, int], Fragment]]:
+    """
+    파일 목록을 병렬 파싱해 입력 순서대로 (시그니처, Fragment) yield
+
+    파싱 실패한 파일은 건너뜀 — on_error(path, 예외)가 있으면 호출, 없으면 로그만
+    """
+    mode = mode or BULK_LOAD_MODE
+    workers = max(1, min(workers or BULK_LOAD_WORKERS, len(paths)))
+    if len(paths) < (BULK_LOAD_MIN_FILES if min_files is None else min_files) or workers == 1:
+        mode = "serial"
+
+    try:
+        executor = _executor(mode, workers)
+    except (OSError, NotImplementedError) as e:  # 세마포어 등을 쓸 수 없는 환경
+        print(f"[bulk] {mode} 풀 생성 실패 — 순차 파싱: {e}")
+        executor = None
+    if executor is None:
+        yield from _parse_serial(paths, on_error)
+        return
+
+    with executor:
+        futures = [executor.submit(parse_fragment, str(path)) for path in paths]
+        for i, (path, future) in enumerate(zip(paths, futures)):
+            try:
+                yield future.result()
+            except BrokenExecutor as e:
+                print(f"[bulk] 워커 풀 중단 — 남은 {len(paths) - i}개 순차 파싱: {e}")
+                yield from _parse_serial(paths[i:], on_error)
+                return
+            except (OSError, ValueError) as e:
+                _report(path, e, on_error)
+
+
+def _parse_serial(
+    paths: list[Path], on_error: Optional[Callable[[Path, Exception], None]]
+) -> Iterator[tuple[tuple[int, int], Fragment]]:
+    for path in paths:
+        try:
+            yield parse_fragment(str(path))
+        except (OSError, ValueError) as e:
+            _report(path, e, on_error)
+
+
+def _report(path: Path, error: Exception, on_error: Optional[Callable[[Path, Exception], None]]) -> None:
+    if on_error is not None:
+        on_error(Path(path), error)
+    else:
+        print(f"[bulk] {Path(path).name} 파싱 실패: {error}")
@@ -0,0 +1,261 @@
+"""
+ranking 히스토리 컴파일 파일 (RankIndex 행렬 스냅샷 + copy-on-write mmap)
+
+콜드 스타트마다 수백 개 JSON을 다시 파싱하지 않도록 순위 인덱스(종목 × 날짜 행렬) 전체를 하나의 파일로 저장.
+읽는 쪽은 파일을 copy-on-write(ACCESS_COPY)로 매핑하고 그 위의 NumPy 뷰를 RankIndex 배열로 그대로 사용:
+  - 조회는 매핑에서 바로 읽음 — 같은 파일을 매핑한 워커들은 OS 페이지 캐시의 같은 페이지를 공유
+  - 배열은 날짜 우선 배치라 새 날짜 / 재작성된 날짜는 그 열의 페이지만 프로세스 전용으로 복사됨
+  - 매핑은 프로세스가 끝날 때까지 유지 (인덱스 배열이 참조)
+
+파일 구조 (little-endian):
+  [헤더 32B]  magic "RKCOL001" | format u32 | reserved u32 | meta_len u64 | data_offset u64
+  [메타 JSON] {"shape": [행 용량, 열 용량], "tickers", "names", "sectors", "dates", "sigs": {날짜: [mtime_ns, size]},
+              "arrays": {이름: [offset, dtype]}}
+  [배열]*     NUMERIC_COLUMNS 9개 + present + pos — 각각 (행 용량, 열 용량) Fortran order, 페이지 정렬
+행·열 용량에는 여유를 둠 (새 종목 / 새 날짜를 매핑 위에 그대로 추가) — 넘치면 그 프로세스만 메모리로 옮겨 확장.
+
+갱신: 파일은 고쳐 쓰지 않고 임시 파일에 새 스냅샷을 쓴 뒤 os.replace (매핑 중인 프로세스는 이전 파일을 계속 봄).
+  디스크의 스냅샷과 날짜별 원본 시그니처가 같으면 다시 쓰지 않음 (여러 워커가 같은 내용을 중복 저장하지 않도록).
+
+CLI:
+    python compiled_store.py                 # state/ 의 새 날짜 / 바뀐 날짜를 반영해 스냅샷 갱신
+    python compiled_store.py --rebuild       # 처음부터 다시
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from bulk_loader import bulk_parse
+from rank_index import NUMERIC_COLUMNS, RankIndex
+
+try:
+    import fcntl  # 여러 워커가 동시에 쓰지 않도록 (Windows에는 없음 — 단일 워커 가정)
+except ImportError:
+    fcntl = None
+
+MAGIC = b"RKCOL001"
+FORMAT_VERSION = 3  # 3: RankIndex 행렬 스냅샷 (다른 버전 파일은 무시하고 새로 컴파일)
+_HEADER = struct.Struct("<8sIIQQ")  # 32 bytes
+_ALIGN = mmap.PAGESIZE
+
+# 배열 이름 → (dtype, 결측값)
+ARRAYS = {
+    **{c: ("<f8", np.nan) for c in NUMERIC_COLUMNS},
+    "present": ("|b1", False),
+    "pos": ("<i4", -1),
+}
+
+# 스냅샷 용량 여유 — 새 날짜 열 / 새 종목 행을 매핑 위에 바로 추가할 수 있도록
+COL_HEADROOM = 64           # 약 석 달치 거래일
+ROW_HEADROOM_MIN = 256
+ROW_ALIGN = 512             # 열 하나(float64)가 페이지 배수가 되도록
+_WRITE_CHUNK_COLS = 64
+
+
+def _align(n: int, to: int) -> int:
+    return (n + to - 1) // to * to
+
+
+class CompiledHistory:
+    """컴파일된 히스토리 파일 읽기 / 저장"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(self.path.suffix + ".lock")
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------
+
+    def _read_meta(self, f) -> Optional[tuple[dict, int]]:
+        """헤더 + 메타 JSON → (메타, data_offset) — 다른 버전이거나 잘린 파일이면 None"""
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        magic, fmt, _, meta_len, data_offset = _HEADER.unpack(header)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            return None
+        raw = f.read(meta_len)
+        if len(raw) < meta_len:
+            return None
+        return json.loads(raw.decode("utf-8")), data_offset
+
+    def sigs(self) -> Optional[dict[str, tuple[int, int]]]:
+        """디스크 스냅샷의 날짜 → 원본 시그니처 (파일이 없거나 읽을 수 없으면 None)"""
+        try:
+            with open(self.path, "rb") as f:
+                found = self._read_meta(f)
+        except (OSError, ValueError):
+            return None
+        if found is None:
+            return None
+        return {d: tuple(s) for d, s in found[0]["sigs"].items()}
+
+    def load(self) -> Optional[tuple[RankIndex, dict[str, tuple[int, int]]]]:
+        """
+        스냅샷을 copy-on-write로 매핑해 (RankIndex, 날짜 → 원본 시그니처) 반환 (없거나 읽을 수 없으면 None)
+
+        인덱스 배열은 매핑 위의 뷰 — 읽기는 페이지 캐시에서 바로, 쓰기는 해당 페이지만 프로세스 전용으로 복사됨
+        """
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return None
+        with f:
+            found = self._read_meta(f)
+            if found is None:
+                return None
+            meta, _ = found
+            shape = tuple(meta["shape"])
+            end = max(offset + int(np.prod(shape)) * np.dtype(dtype).itemsize
+                      for offset, dtype in meta["arrays"].values())
+            if os.fstat(f.fileno()).st_size < end:
+                return None  # 잘린 파일
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=mm, offset=offset, order="F")
+            for name, (offset, dtype) in meta["arrays"].items()
+        }
+        index = RankIndex.from_arrays(
+            meta["tickers"], meta["names"], meta["sectors"], meta["dates"],
+            {c: arrays[c] for c in NUMERIC_COLUMNS}, arrays["present"], arrays["pos"],
+        )
+        return index, {d: tuple(s) for d, s in meta["sigs"].items()}
+
+    # ------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------
+
+    @contextmanager
+    def _writer(self):
+        """프로세스 내 + 프로세스 간 배타 잠금"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def save(self, index: RankIndex, sigs: dict[str, tuple[int, int]]) -> bool:
+        """
+        인덱스 전체를 새 스냅샷으로 저장 — 디스크 스냅샷과 시그니처가 같으면 쓰지 않고 False
+
+        sigs: 인덱스의 날짜별 원본 (mtime_ns, size). 인덱스는 읽기만 함 (호출자가 변경을 막고 있어야 함)
+        """
+        sigs = {d: tuple(s) for d, s in sigs.items()}
+        with self._writer():
+            if self.sigs() == sigs:
+                return False
+            n_rows, n_cols = index.n_tickers, index.n_dates
+            shape = (_align(n_rows + max(ROW_HEADROOM_MIN, n_rows // 4), ROW_ALIGN), n_cols + COL_HEADROOM)
+
+            meta = {
+                "shape": list(shape),
+                "tickers": index.tickers, "names": index.names, "sectors": index.sectors,
+                "dates": index.dates,
+                "sigs": {d: list(s) for d, s in sigs.items()},
+            }
+            # 배열 offset은 메타 뒤에서 시작 — offset 숫자가 메타 길이를 바꾸지 않도록 넉넉히 잡음
+            data_offset = _align(_HEADER.size + len(json.dumps(meta, ensure_ascii=False).encode("utf-8")) + 1024,
+                                 _ALIGN)
+            offsets = {}
+            offset = data_offset
+            for name, (dtype, _) in ARRAYS.items():
+                offsets[name] = offset
+                offset = _align(offset + shape[0] * shape[1] * np.dtype(dtype).itemsize, _ALIGN)
+            meta["arrays"] = {name: [offsets[name], ARRAYS[name][0]] for name in ARRAYS}
+            raw_meta = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+
+            sources = {**{c: index.col(c) for c in NUMERIC_COLUMNS}, "present": index.mask(),
+                       "pos": index.pos[:n_rows, :n_cols]}
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(raw_meta), data_offset))
+                f.write(raw_meta)
+                for name, (dtype, fill) in ARRAYS.items():
+                    f.seek(offsets[name])
+                    src = sources[name]
+                    for start in range(0, shape[1], _WRITE_CHUNK_COLS):
+                        stop = min(start + _WRITE_CHUNK_COLS, shape[1])
+                        chunk = np.full((shape[0], stop - start), fill, dtype=dtype, order="F")
+                        if start < n_cols:
+                            chunk[:n_rows, : min(stop, n_cols) - start] = src[:, start:stop]
+                        f.write(chunk.tobytes(order="F"))
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            try:
+                os.remove(self.path.with_suffix(self.path.suffix + ".strings.json"))  # 이전 형식(블록)의 문자열 테이블
+            except OSError:
+                pass
+            return True
+
+    def rebuild(self, state_dir: Path) -> int:
+        """처음부터 다시 컴파일"""
+        with self._writer():
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        return compile_state_dir(self, state_dir)
+
+
+def compile_state_dir(store: CompiledHistory, state_dir: Path) -> int:
+    """state/ 의 ranking 파일 중 스냅샷에 없거나 바뀐 날짜만 파싱해 스냅샷 갱신 — 파싱한 날짜 수 반환"""
+    loaded = store.load()
+    index, sigs = loaded if loaded is not None else (RankIndex(), {})
+    current = {}
+    for path in sorted(Path(state_dir).glob("ranking_*.json")):
+        date = path.stem.replace("ranking_", "")
+        if date.isdigit() and len(date) == 8:
+            st = os.stat(path)
+            current[date] = (path, (st.st_mtime_ns, st.st_size))
+
+    for date in [d for d in sigs if d not in current]:
+        index.remove_date(date)
+        del sigs[date]
+    todo = [path for date, (path, sig) in current.items() if sigs.get(date) != sig]
+    parsed = 0
+    for sig, fragment in bulk_parse(todo):
+        index.set_fragment(fragment)
+        sigs[fragment.date] = sig
+        parsed += 1
+    store.save(index, sigs)
+    return parsed
+
+
+def main(argv: Optional[list] = None) -> None:
+    import data_loader
+
+    parser = argparse.ArgumentParser(description="ranking 히스토리 컴파일")
+    parser.add_argument("--state-dir", type=Path, default=data_loader.STATE_DIR)
+    parser.add_argument("--out", type=Path, default=data_loader.COMPILED_HISTORY_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="기존 파일을 지우고 처음부터 컴파일")
+    args = parser.parse_args(argv)
+
+    store = CompiledHistory(args.out)
+    if args.rebuild:
+        n = store.rebuild(args.state_dir)
+    else:
+        n = compile_state_dir(store, args.state_dir)
+    sigs = store.sigs() or {}
+    size = args.out.stat().st_size if args.out.exists() else 0
+    print(f"{n}개 날짜 컴파일 → {args.out} ({len(sigs)}일, {size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,32 +8,643 @@ v2.0 — 웹 대시보드 전용 확장:
   - compute_factor_grades: 팩터별 등급 (A+~D)
   - get_ai_data: AI 분석 결과
   - Enhanced compute_picks / compute_death_list
+
+state/ 는 백그라운드 watcher가 증분 적재하고, 파생 데이터는 데이터 버전당 한 번만 계산
 """
+import functools
+import inspect
 import json
+import math
 import os
 import glob
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
-
-# quant_py-main 프로젝트 경로
-QUANT_PROJECT = Path(__file__).resolve().parent.parent.parent / "quant_py-main" / "claude code" / "quant_py-main"
-STATE_DIR = QUANT_PROJECT / "state"
+from typing import Callable, Iterator, Optional, Union
+
+import numpy as np
+
+from bulk_loader import bulk_parse, parse_fragment
+from compiled_store import CompiledHistory
+from factor_grades import FACTOR_NAMES, GRADES, FactorGradeTable, grade_codes
+from file_cache import FileCache
+from market_refresher import LiveRefresher, LiveSnapshot
+from metrics import COMPUTE_SECONDS, REGISTRY, STAGE_SECONDS, timed
+from rank_index import RankIndex
+from ranking_schema import SchemaError, normalize_ranking, normalize_stock, validate_web_data
+from ranking_snapshot import RankingSnapshot, composite_rank
+from ranking_stream import read_top_rankings
+from single_flight import SingleFlight
+from state_watcher import DataVersion, StateWatcher, scan_state_dir, signature_token
+
+# quant_py-main 프로젝트 경로 (QUANT_PROJECT / QUANT_STATE_DIR 로 변경 — 벤치마크·부하 테스트용 합성 state 등)
+QUANT_PROJECT = Path(os.environ.get(
+    "QUANT_PROJECT", Path(__file__).resolve().parent.parent.parent / "quant_py-main" / "claude code" / "quant_py-main"
+))
+STATE_DIR = Path(os.environ.get("QUANT_STATE_DIR", QUANT_PROJECT / "state"))
 OUTPUT_DIR = QUANT_PROJECT / "output"
 
+# ranking 파일이 composite_rank 순으로 저장돼 있다고 가정 (스트리밍 조기 종료 허용)
+RANKING_ASSUME_SORTED = os.environ.get("RANKING_ASSUME_SORTED", "1") != "0"
+
+# credit_monitor 실시간 수집 주기 / 제한 시간 / circuit breaker (초, 연속 실패 횟수)
+MARKET_LIVE_INTERVAL = float(os.environ.get("MARKET_LIVE_INTERVAL", "300"))
+MARKET_LIVE_TIMEOUT = float(os.environ.get("MARKET_LIVE_TIMEOUT", "20"))
+MARKET_LIVE_FAILURES = int(os.environ.get("MARKET_LIVE_FAILURES", "3"))
+MARKET_LIVE_COOLDOWN = float(os.environ.get("MARKET_LIVE_COOLDOWN", "600"))
+
+# 컴파일된 히스토리 파일 (COMPILED_HISTORY=0 으로 끔)
+COMPILED_HISTORY_PATH = Path(os.environ.get(
+    "COMPILED_HISTORY_PATH", Path(__file__).resolve().parent / ".cache" / "ranking_history.rkc"
+))
+_compiled = CompiledHistory(COMPILED_HISTORY_PATH) if os.environ.get("COMPILED_HISTORY", "1") != "0" else None
+# 인덱스가 컴파일 파일보다 이만큼 (날짜 수) 앞서면 스냅샷을 새로 씀
+COMPILED_REFRESH_DATES = int(os.environ.get("COMPILED_REFRESH_DATES", "5"))
+
+# 동시 miss 합치기 — 파일 파싱 / 파생 데이터 계산
+_load_flight = SingleFlight()
+_compute_flight = SingleFlight()
+
+# 파싱된 JSON 캐시 (환경변수로 크기 조정)
+_file_cache = FileCache(
+    max_entries=int(os.environ.get("FILE_CACHE_MAX_ENTRIES", "64")),
+    max_bytes=int(os.environ.get("FILE_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+    flight=_load_flight,
+)
+
+
+# 적재 단계 메트릭 — child는 여기서 한 번만 만들고 재사용
+_FILES_PARSED = REGISTRY.counter("quant_files_parsed_total", "파싱한 state/ 파일 수", ("kind",))
+_BYTES_READ = REGISTRY.counter("quant_file_bytes_read_total", "파싱한 state/ 파일 바이트", ("kind",))
+_parsed = {kind: (_FILES_PARSED.labels(kind), _BYTES_READ.labels(kind)) for kind in ("ranking", "web_data")}
+_stage = {
+    name: STAGE_SECONDS.labels(name)
+    for name in ("scan", "glob", "read", "json_parse", "normalize", "stream_top",
+                 "fragment_parse", "bulk_parse", "compiled_preload", "compiled_save")
+}
+
+
+def _count_parsed(kind: str, size: int) -> None:
+    files, nbytes = _parsed.get(kind) or _parsed["web_data"]
+    files.inc()
+    nbytes.inc(size)
+
+
+def _read_json(path: Path):
+    """JSON 파일 파싱 (캐시 miss 시 호출) — 읽기 / 파싱 시간과 바이트 수 기록"""
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        raw = f.read()
+    read_done = time.perf_counter()
+    data = json.loads(raw)
+    _stage["read"].observe(read_done - start)
+    _stage["json_parse"].observe(time.perf_counter() - read_done)
+    _count_parsed(Path(path).stem.rpartition("_")[0], len(raw))
+    return data
+
+
+def _read_ranking(path: Path) -> dict:
+    """ranking 파일 파싱 + 스키마 검증·정규화 (캐시 miss 시 호출 — 캐시에는 정규 레코드가 들어감)"""
+    data = _read_json(path)
+    start = time.perf_counter()
+    try:
+        return normalize_ranking(data, path.stem.replace("ranking_", ""))
+    finally:
+        _stage["normalize"].observe(time.perf_counter() - start)
+
+
+def _read_web_data(path: Path) -> dict:
+    """web_data 파일 파싱 + 최상위 구조 확인"""
+    return validate_web_data(_read_json(path))
+
+
+def _load_checked(path: Path, loader) -> Optional[dict]:
+    """파일 캐시 경유 로드 — 깨진 파일은 격리하고 None (요청을 실패시키지 않음)"""
+    if _quarantined(path) is not None:
+        return None
+    try:
+        return _file_cache.get(path, loader)
+    except (OSError, ValueError) as e:  # JSONDecodeError / UnicodeDecodeError / SchemaError 포함
+        _quarantine_file(path, e)
+        return None
+
+
+def get_file_cache_stats() -> dict:
+    """파일 캐시 hit/miss 통계"""
+    return _file_cache.stats()
+
+
+def get_single_flight_stats() -> dict:
+    """동시 호출 합치기 통계 (파일 파싱 / compute_*)"""
+    return {"loaders": _load_flight.stats(), "compute": _compute_flight.stats()}
+
+
+# ============================================================
+# 격리 (파싱·스키마 검증 실패 파일)
+# ============================================================
+
+# 파일명 → {"file", "kind", "date", "error", "quarantined_at", "sig"}
+# 파일이 다시 쓰여 (mtime, size)가 바뀌면 격리를 풀고 다시 검증
+_quarantine: dict[str, dict] = {}
+_quarantine_lock = threading.Lock()
+
+
+def _file_sig(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _quarantine_file(path: Path, error: Exception) -> None:
+    """깨진 파일 격리 — 같은 시그니처인 동안은 다시 파싱하지 않고 날짜 목록에서도 뺌"""
+    path = Path(path)
+    sig = _file_sig(path)
+    if sig is None:
+        return  # 그 사이 삭제됨
+    kind, _, date = path.stem.rpartition("_")
+    entry = {
+        "file": path.name,
+        "kind": kind,
+        "date": date,
+        "error": f"{type(error).__name__}: {error}",
+        "quarantined_at": time.time(),
+        "sig": sig,
+    }
+    with _quarantine_lock:
+        old = _quarantine.get(path.name)
+        if old is not None and old["sig"] == sig:
+            return
+        _quarantine[path.name] = entry
+    _file_cache.invalidate(path)
+    print(f"[quarantine] {path.name} 격리: {entry['error']}")
+
+
+def _quarantined(path: Path) -> Optional[dict]:
+    """격리 중이면 격리 정보 (파일이 바뀌었으면 격리 해제 후 None)"""
+    name = Path(path).name
+    entry = _quarantine.get(name)
+    if entry is None:
+        return None
+    if _file_sig(path) != entry["sig"]:
+        _release_quarantine(name)
+        return None
+    return entry
+
+
+def _release_quarantine(name: str) -> None:
+    with _quarantine_lock:
+        _quarantine.pop(name, None)
+
+
+def get_quarantine() -> list[dict]:
+    """격리된 파일 목록 (health용, 파일명 순)"""
+    with _quarantine_lock:
+        entries = sorted(_quarantine.values(), key=lambda e: e["file"])
+    return [{k: v for k, v in e.items() if k != "sig"} for e in entries]
+
+
+# ============================================================
+# state/ 감시 + 데이터 버전
+# ============================================================
+
+_watcher: Optional[StateWatcher] = None
+_derived: dict = {}  # (version token, 함수명, 인자) -> 결과
+_derived_lock = threading.Lock()
+
+# 파일 종류 → 그 파일이 바뀌면 다시 받아야 하는 대시보드 패널
+PANELS_BY_KIND = {
+    "ranking": ("ranking", "picks", "deathlist", "pipeline"),
+    "web_data": ("market", "picks", "deathlist", "pipeline", "ai"),
+}
+ALL_PANELS = ("ranking", "picks", "deathlist", "market", "pipeline", "ai")
+_changed_kinds: set[str] = set()  # 마지막 버전 발행 이후 적재/삭제된 파일 종류 (watcher 스레드 전용)
+_version_listeners: list[Callable[[dict], None]] = []
+_version_ready = threading.Event()  # 발행된 버전의 파생 데이터 미리 계산까지 끝남
+
+
+def get_data_version() -> Optional[DataVersion]:
+    """현재 발행된 데이터 버전 (watcher 미실행 / 첫 스캔 전이면 None)"""
+    if _watcher is None:
+        return None
+    return _watcher.current
+
+
+def get_data_token() -> str:
+    """
+    현재 데이터 상태 토큰 (ETag 등에 사용)
+
+    watcher가 발행한 버전이 있으면 그 토큰, 없으면 state/ 파일 stat으로 직접 계산
+    """
+    version = get_data_version()
+    if version is not None:
+        return version.token
+    start = time.perf_counter()
+    signatures = scan_state_dir(STATE_DIR)
+    _stage["scan"].observe(time.perf_counter() - start)
+    return signature_token(signatures)
+
+
+def get_market_token() -> Optional[str]:
+    """
+    시장 데이터 출처 토큰 — web_data 캐시가 있으면 데이터 토큰으로 충분하므로 ""
+
+    캐시가 없어 실시간 수집(credit_monitor)으로 응답하는 경우 파일 상태와 무관하므로 None (캐시 검증 불가)
+    """
+    return "" if _get_web_cache_dates() else None
+
+
+def version_event(version: Optional[DataVersion], panels: tuple[str, ...] = ALL_PANELS) -> dict:
+    """버전 변경 알림 (SSE 등) — 새 토큰 / 최신 날짜 / 다시 받아야 하는 패널"""
+    return {
+        "token": version.token if version else None,
+        "date": version.latest_date if version else None,
+        "web_date": version.web_dates[0] if version and version.web_dates else None,
+        "panels": list(panels),
+    }
+
+
+def add_version_listener(listener: Callable[[dict], None]) -> None:
+    """새 데이터 버전의 파생 데이터 계산이 끝나면 version_event로 호출 (watcher 스레드에서)"""
+    _version_listeners.append(listener)
+
+
+def remove_version_listener(listener: Callable[[dict], None]) -> None:
+    if listener in _version_listeners:
+        _version_listeners.remove(listener)
+
+
+def start_watcher(interval: Optional[float] = None) -> StateWatcher:
+    """state/ 감시 스레드 시작 (이미 실행 중이면 그대로 반환)"""
+    global _watcher
+    if _watcher is None:
+        _watcher = StateWatcher(
+            STATE_DIR,
+            prime=_prime_state,
+            ingest=_ingest_file,
+            remove=_remove_file,
+            on_change=_on_version_change,
+            interval=interval if interval is not None else float(os.environ.get("STATE_WATCH_INTERVAL", "2")),
+        )
+    _watcher.start()
+    return _watcher
+
+
+def stop_watcher() -> None:
+    """감시 스레드 종료 — 이후 조회는 다시 glob 경로로 동작"""
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
+    _version_ready.clear()
+    with _derived_lock:
+        _derived.clear()
+
+
+_eager_web_date: Optional[str] = None  # 첫 폴링에서 파싱할 web_data 날짜 (최신 하나)
+
+
+def _prime_state() -> None:
+    """
+    watcher 첫 폴링 전 — 컴파일 파일 적재 + 나머지 ranking 병렬 파싱 (이후 ingest는 건너뜀),
+    첫 폴링에서 미리 파싱할 web_data(최신 날짜)를 정함
+    """
+    global _eager_web_date
+    with _rank_index_lock:
+        _sync_rank_index()
+    web_dates = _get_web_cache_dates()
+    _eager_web_date = web_dates[0] if web_dates else None
+
+
+def _ingest_file(kind: str, date: str, path: Path) -> None:
+    """watcher 콜백 — 새/변경 파일 파싱 (실패 시 예외 → watcher가 재시도)"""
+    entry = _quarantined(path)
+    if entry is not None:
+        raise SchemaError(entry["error"])  # 격리 중 — 파일이 다시 쓰일 때까지 날짜 목록에서 제외
+    _changed_kinds.add(kind)
+    try:
+        if kind == "ranking":
+            _index_ranking_file(date, path)
+        elif _watcher is not None and _watcher.current is None and date != _eager_web_date:
+            return  # 첫 폴링의 지난 web_data는 시그니처만 기록 — 요청 시 파일 캐시로 파싱
+        else:
+            # 최신 / 새로 들어온 / 재작성된 web_data는 파일 캐시에 바로 적재
+            _file_cache.get(path, _read_web_data)
+    except (OSError, ValueError) as e:
+        _quarantine_file(path, e)
+        raise
+
+
+def _index_ranking_file(date: str, path: Path) -> None:
+    """
+    ranking 파일 하나를 검증·파싱해 순위 인덱스에 적재 (같은 시그니처로 이미 적재됐으면 생략)
+
+    파싱은 락 밖에서 — 인덱스를 읽는 요청을 막지 않음. 스키마 오류는 호출자가 격리.
+    """
+    st = os.stat(path)
+    if _rank_index_sigs.get(date) == (st.st_mtime_ns, st.st_size):
+        return  # 컴파일된 히스토리 / 콜드 스타트 병렬 파싱에서 이미 적재
+    start = time.perf_counter()
+    sig, fragment = parse_fragment(str(path))
+    _stage["fragment_parse"].observe(time.perf_counter() - start)
+    _count_parsed("ranking", sig[1])
+    with _rank_index_lock:
+        _rank_index.set_fragment(fragment)
+        _rank_index_sigs[date] = sig
+
+
+def _ranking_accepted(date: str, path: Path) -> bool:
+    """
+    스트리밍 읽기 전 확인 — 파일 전체가 스키마 검증을 통과해 인덱스에 들어갔는지
+
+    스트리밍 리더는 Top N을 채우면 멈추므로 뒷부분의 오류를 보지 못함.
+    아직 인덱스에 없는 (또는 재작성된) 파일은 여기서 한 번 전체 검증 — 실패하면 격리하고 False
+    """
+    if _quarantined(path) is not None:
+        return False
+    try:
+        _index_ranking_file(date, path)
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError) as e:
+        _quarantine_file(path, e)
+        return False
+    return True
+
+
+def _remove_file(kind: str, date: str) -> None:
+    """watcher 콜백 — 삭제된 파일 반영"""
+    _changed_kinds.add(kind)
+    if kind == "ranking":
+        with _rank_index_lock:
+            _rank_index.remove_date(date)
+            _rank_index_sigs.pop(date, None)
+    _file_cache.invalidate(STATE_DIR / f"{kind}_{date}.json")
+    _release_quarantine(f"{kind}_{date}.json")
+
+
+def _on_version_change(version: DataVersion) -> None:
+    """새 데이터 버전 발행 시 — 컴파일 파일 반영, 이전 파생 데이터 폐기 후 기본 파생 데이터 미리 계산"""
+    try:
+        with _rank_index_lock:
+            _flush_compile()
+        with _derived_lock:
+            for key in [k for k in _derived if k[0] != version.token]:
+                del _derived[key]
+        compute_picks()
+        compute_pipeline_status()
+        compute_death_list()
+    finally:
+        _version_ready.set()  # 첫 버전(쓰는 중이던 파일까지 적재)의 기본 파생 데이터 계산 끝 (warm-up이 기다림)
+
+    # 미리 계산이 끝난 뒤 알림 — 구독자가 바로 다시 받아도 계산 대기 없음
+    panels = {p for kind in _changed_kinds for p in PANELS_BY_KIND.get(kind, ())}
+    _changed_kinds.clear()
+    event = version_event(version, tuple(p for p in ALL_PANELS if p in panels))
+    for listener in list(_version_listeners):
+        try:
+            listener(event)
+        except Exception as e:
+            print(f"[watcher] 버전 알림 실패: {e}")
+
+
+_DERIVED_MEMO = REGISTRY.counter(
+    "quant_derived_memo_total", "데이터 버전별 파생 데이터 메모 조회 (hit/miss)", ("function", "result")
+)
+
+
+def _per_data_version(fn=None, *, maxsize: Optional[int] = None, normalize: Optional[Callable[[dict], None]] = None):
+    """
+    파생 데이터를 데이터 버전당 한 번만 계산 (watcher가 없으면 매번 계산)
+
+    감싼 함수는 snap 키워드 인자를 받음 — 생략하면 현재 스냅샷 사용
+    같은 키를 동시에 계산하려는 호출은 single-flight로 한 번만 실행
+    인자는 기본값까지 채워 키로 씀 (f() 와 f(3, 30) 이 같은 결과 공유)
+    maxsize: 파라미터 조합이 많은 함수용 — 이 함수의 결과는 최근 사용 maxsize개만 보관
+    normalize: 키를 만들기 전에 인자 dict를 제자리에서 정규화 (같은 뜻의 다른 표기가 한 항목을 공유하도록)
+    """
+    if fn is None:
+        return functools.partial(_per_data_version, maxsize=maxsize, normalize=normalize)
+
+    signature = inspect.signature(fn)
+    recent: OrderedDict = OrderedDict()  # maxsize 있을 때 이 함수 키의 사용 순서
+    compute = timed(COMPUTE_SECONDS.labels(fn.__name__))(fn)  # 실제 계산만 시간 기록
+    memo_hit, memo_miss = _DERIVED_MEMO.labels(fn.__name__, "hit"), _DERIVED_MEMO.labels(fn.__name__, "miss")
+
+    @functools.wraps(fn)
+    def wrapper(*args, snap: Optional["DataSnapshot"] = None, **kwargs):
+        snap = snap or take_snapshot()
+        version = snap.version
+        bound = signature.bind(*args, snap=snap, **kwargs)
+        bound.apply_defaults()
+        if normalize is not None:
+            normalize(bound.arguments)
+            args, kwargs = bound.args, {k: v for k, v in bound.kwargs.items() if k != "snap"}
+        call_key = (fn.__name__, tuple((k, v) for k, v in bound.arguments.items() if k != "snap"))
+        if version is None:
+            # 버전 없음 — 결과는 보관하지 않고 같은 날짜 목록의 동시 호출만 합침
+            flight_key = (tuple(snap.ranking_dates), tuple(snap.web_dates), *call_key)
+            return _compute_flight.do(flight_key, lambda: compute(*args, snap=snap, **kwargs))
+        key = (version.token, *call_key)
+        with _derived_lock:
+            if key in _derived:
+                if key in recent:
+                    recent.move_to_end(key)
+                memo_hit.inc()
+                return _derived[key]
+        memo_miss.inc()
+        value = _compute_flight.do(key, lambda: compute(*args, snap=snap, **kwargs))
+        with _derived_lock:
+            if get_data_version() is version:
+                _derived[key] = value
+                if maxsize is not None:
+                    recent[key] = None
+                    recent.move_to_end(key)
+                    while len(recent) > maxsize:
+                        _derived.pop(recent.popitem(last=False)[0], None)
+        return value
+    return wrapper
+
+
+# ============================================================
+# 시작 warm-up (readiness)
+# ============================================================
+
+_warmup: dict = {"state": "pending", "started_at": None, "duration_s": None, "steps": {}, "errors": {}}
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def start_warmup() -> None:
+    """warm-up 스레드 시작 (lifespan) — 요청 처리는 바로 시작하고, 끝나면 is_ready()가 True"""
+    global _warmup_thread
+    if _warmup_thread is not None and _warmup_thread.is_alive():
+        return
+    _warmup_thread = threading.Thread(target=warm_up, name="warm-up", daemon=True)
+    _warmup_thread.start()
+
+
+def warm_up() -> dict:
+    """
+    첫 사용자가 콜드 파싱 비용을 치르지 않도록 인덱스와 파생 데이터를 미리 적재
+
+    1. index: watcher 첫 버전 (컴파일 파일 / 병렬 파싱 + picks / pipeline / deathlist 미리 계산)
+       — watcher는 settle 대기 중인 파일이 모두 적재된 뒤에 첫 버전을 발행하므로 빈 버전으로 ready가 되지 않음
+    2. dashboard: 6개 패널 (최신 ranking 전체 파일, market, ai — 파일 캐시에 남음)
+    3. history / picks_history / deathlist_history: 인덱스 기반 히스토리
+    단계 실패는 기록만 하고 계속 진행 (데이터가 없거나 깨져도 서버는 ready — 요청 경로가 같은 방식으로 처리)
+    """
+    global _warmup
+    steps: dict[str, float] = {}
+    errors: dict[str, str] = {}
+    _warmup = {"state": "running", "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "duration_s": None, "steps": steps, "errors": errors}
+    start = time.perf_counter()
+    start_watcher()
+    for name, step in (
+        ("index", _version_ready.wait),
+        ("dashboard", build_dashboard),
+        ("history", get_all_history),
+        ("picks_history", compute_picks_history),
+        ("deathlist_history", compute_deathlist_history),
+    ):
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+            print(f"[warm-up] {name} 실패: {e}")
+        steps[name] = round(time.perf_counter() - step_start, 3)
+    duration = time.perf_counter() - start
+    _warmup = {**_warmup, "state": "done", "duration_s": round(duration, 3)}
+    print(f"[warm-up] 완료 {duration:.2f}s {steps}")
+    return _warmup
+
+
+def is_ready() -> bool:
+    """warm-up이 끝났는지 (readiness probe)"""
+    return _warmup["state"] == "done"
+
+
+def get_warmup_state() -> dict:
+    """warm-up 진행 상태 / 단계별 소요 시간 (health용)"""
+    state = _warmup
+    return {**state, "steps": dict(state["steps"]), "errors": dict(state["errors"])}
+
+
+# ============================================================
+# 데이터 스냅샷 (한 시점의 일관된 뷰)
+# ============================================================
+
+class DataSnapshot:
+    """
+    날짜 목록을 고정한 데이터 뷰
+
+    - 생성 시점의 ranking / web_data 날짜 목록을 그대로 유지
+    - 스냅샷 안에서 읽은 파일은 재사용 (여러 패널이 같은 파싱 결과 공유)
+    - 도중에 새 날짜가 적재돼도 이 스냅샷으로 만든 응답에는 섞이지 않음
+    """
+
+    def __init__(self, version: Optional[DataVersion], ranking_dates: list[str], web_dates: list[str]):
+        self.version = version
+        self.ranking_dates = ranking_dates  # 최신순
+        self.web_dates = web_dates          # 최신순
+        self._rankings: dict[str, Optional[dict]] = {}
+        self._web: dict[str, Optional[dict]] = {}
+        self._tops: dict[tuple, Optional[RankingSnapshot]] = {}
+
+    @property
+    def latest_date(self) -> Optional[str]:
+        return self.ranking_dates[0] if self.ranking_dates else None
+
+    def ranking(self, date: str) -> Optional[dict]:
+        """ranking JSON (스냅샷 내 재사용)"""
+        if date not in self._rankings:
+            self._rankings[date] = load_ranking(date)
+        return self._rankings[date]
+
+    def top_rows(self, date: str, top_n: int, tickers: Optional[set] = None) -> Optional[list[dict]]:
+        """
+        composite_rank ≤ top_n 레코드 + tickers 종목 레코드 (파일 순서, 파일이 없으면 None)
+
+        파일 전체가 이미 메모리(스냅샷 / 파일 캐시)에 있으면 거기서 거르고,
+        없으면 스트리밍으로 필요한 앞부분만 읽음 (응답용 레코드는 Top N만 생성)
+        — 단, 스트리밍 전에 파일 전체가 스키마 검증을 통과해 순위 인덱스에 있어야 함 (_ranking_accepted)
+        """
+        path = STATE_DIR / f"ranking_{date}.json"
+        data = self._rankings.get(date) or _file_cache.peek(path)
+        if data is None:
+            if not _ranking_accepted(date, path):
+                return None  # 격리 — 순위 인덱스 경로(picks 등)와 같은 판정
+            start = time.perf_counter()
+            try:
+                return read_top_rankings(
+                    path, top_n, tickers, assume_sorted=RANKING_ASSUME_SORTED, normalize=normalize_stock
+                )
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                _quarantine_file(path, e)
+                return None
+            finally:
+                _stage["stream_top"].observe(time.perf_counter() - start)
+        wanted = tickers or set()
+        return [
+            stock for stock in data.get("rankings", [])
+            if composite_rank(stock) <= top_n or stock["ticker"] in wanted
+        ]
+
+    def top_snapshot(self, date: str, top_n: int, tickers: Optional[set] = None) -> Optional[RankingSnapshot]:
+        """top_rows 결과를 RankingSnapshot으로 (스냅샷 안에서 같은 요청은 재사용)"""
+        key = (date, top_n, frozenset(tickers) if tickers else None)
+        if key not in self._tops:
+            rows = self.top_rows(date, top_n, tickers)
+            self._tops[key] = None if rows is None else RankingSnapshot(date, rows)
+        return self._tops[key]
+
+    def latest_ranking(self) -> Optional[dict]:
+        if not self.ranking_dates:
+            return None
+        return self.ranking(self.ranking_dates[0])
+
+    def web_cache(self) -> Optional[dict]:
+        """가장 최신 web_data 캐시 (없으면 None)"""
+        if not self.web_dates:
+            return None
+        date = self.web_dates[0]
+        if date not in self._web:
+            self._web[date] = load_web_cache(date)
+        return self._web[date]
+
+
+def take_snapshot() -> DataSnapshot:
+    """현재 데이터 버전 기준 스냅샷 (watcher가 없으면 디렉토리 스캔 결과 기준)"""
+    version = get_data_version()
+    if version is not None:
+        return DataSnapshot(version, list(version.ranking_dates), list(version.web_dates))
+    return DataSnapshot(None, get_available_dates(), _get_web_cache_dates())
+
 
 # ============================================================
 # 기존 함수 (유지)
 # ============================================================
 
 def get_available_dates() -> list[str]:
-    """state/ 디렉토리에서 사용 가능한 날짜 목록 반환 (최신순)"""
+    """state/ 디렉토리에서 사용 가능한 날짜 목록 반환 (최신순, 격리된 파일 제외)"""
+    version = get_data_version()
+    if version is not None:
+        return list(version.ranking_dates)
     pattern = str(STATE_DIR / "ranking_*.json")
+    start = time.perf_counter()
     files = glob.glob(pattern)
+    _stage["glob"].observe(time.perf_counter() - start)
     dates = []
     for f in files:
         name = os.path.basename(f)
         date_str = name.replace("ranking_", "").replace(".json", "")
-        if date_str.isdigit() and len(date_str) == 8:
+        if date_str.isdigit() and len(date_str) == 8 and _quarantined(f) is None:
             dates.append(date_str)
     dates.sort(reverse=True)
     return dates
@@ -41,25 +652,27 @@ def get_available_dates() -> list[str]:
 
 def _get_web_cache_dates() -> list[str]:
     """state/ 디렉토리에서 web_data 캐시 날짜 목록 반환 (최신순)"""
+    version = get_data_version()
+    if version is not None:
+        return list(version.web_dates)
     pattern = str(STATE_DIR / "web_data_*.json")
+    start = time.perf_counter()
     files = glob.glob(pattern)
+    _stage["glob"].observe(time.perf_counter() - start)
     dates = []
     for f in files:
         name = os.path.basename(f)
         date_str = name.replace("web_data_", "").replace(".json", "")
-        if date_str.isdigit() and len(date_str) == 8:
+        if date_str.isdigit() and len(date_str) == 8 and _quarantined(f) is None:
             dates.append(date_str)
     dates.sort(reverse=True)
     return dates
 
 
 def load_ranking(date: str) -> Optional[dict]:
-    """특정 날짜의 ranking JSON 로드"""
+    """특정 날짜의 ranking JSON 로드 (캐시 공유 객체 — 수정하지 말 것)"""
     path = STATE_DIR / f"ranking_{date}.json"
-    if not path.exists():
-        return None
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load_checked(path, _read_ranking)
 
 
 def load_latest_ranking() -> Optional[dict]:
@@ -71,52 +684,188 @@ def load_latest_ranking() -> Optional[dict]:
 
 
 def get_ranking_history(ticker: str) -> list[dict]:
-    """특정 종목의 날짜별 순위 히스토리"""
-    dates = get_available_dates()
-    history = []
-    for date in reversed(dates):  # 오래된 순
-        data = load_ranking(date)
-        if not data:
-            continue
-        for stock in data.get("rankings", []):
-            if stock["ticker"] == ticker:
-                history.append({
-                    "date": date,
-                    "rank": stock.get("rank"),
-                    "composite_rank": stock.get("composite_rank", stock.get("rank")),
-                    "score": stock.get("score", 0),
-                    "value_s": stock.get("value_s"),
-                    "quality_s": stock.get("quality_s"),
-                    "growth_s": stock.get("growth_s"),
-                    "momentum_s": stock.get("momentum_s"),
-                })
-                break
-    return history
+    """특정 종목의 날짜별 순위 히스토리 (오래된 순)"""
+    with locked_rank_index() as idx:
+        return idx.history(ticker)
 
 
 def get_all_history() -> dict:
     """전 종목의 날짜별 순위 변동 (Top 30만)"""
+    with locked_rank_index() as idx:
+        return idx.top_history(30)
+
+
+@_per_data_version(maxsize=16)
+def _ranking_snapshot(date: str, *, snap: DataSnapshot) -> Optional[RankingSnapshot]:
+    """날짜 전체 ranking의 RankingSnapshot (데이터 버전당 한 번 — 섹터 인덱스·순위 배열 재사용)"""
+    data = snap.ranking(date)
+    return None if data is None else RankingSnapshot(date, data["rankings"])
+
+
+def query_ranking(
+    date: str,
+    fields: Optional[tuple[str, ...]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    sector: Optional[str] = None,
+    max_rank: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    ranking 부분 조회 — 필터(sector, composite_rank ≤ max_rank) → 페이지(offset, limit) → 필드 선택
+
+    date="latest"면 최신 날짜. 파일 순서(composite_rank 순) 유지, 없는 날짜면 None
+
+    Returns:
+        {"date": ..., "metadata": ..., "rankings": [...],
+         "page": {"total": 필터 후 종목 수, "offset": 0, "limit": 50, "next_offset": 50}}
+    """
+    snap = take_snapshot()
+    if date == "latest":
+        date = snap.latest_date
+        if date is None:
+            return None
+    ranking = _ranking_snapshot(date, snap=snap)
+    data = snap.ranking(date)
+    if ranking is None or data is None:
+        return None
+
+    positions = ranking.select(sector, max_rank)
+    total = len(positions)
+    end = total if limit is None else min(total, offset + limit)
+    rows = [ranking.rows[i] for i in positions[offset:end].tolist()]
+    if fields:
+        rows = [{f: row[f] for f in fields if f in row} for row in rows]
+
+    result = {k: v for k, v in data.items() if k != "rankings"}
+    result["rankings"] = rows
+    result["page"] = {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "next_offset": end if end < total else None,
+    }
+    return result
+
+
+# ============================================================
+# 순위 인덱스 (종목 × 날짜 행렬)
+# ============================================================
+
+_rank_index = RankIndex()
+_rank_index_sigs: dict[str, tuple[int, int]] = {}  # date -> (mtime_ns, size)
+_rank_index_lock = threading.Lock()
+
+
+def _sync_rank_index() -> None:
+    """
+    ranking 파일 목록과 인덱스 동기화 — 호출자가 _rank_index_lock을 잡고 있어야 함
+
+    - 새 날짜 / 재작성된 파일만 파싱해서 열 추가·교체 (많으면 병렬 파싱)
+    - 사라진 날짜는 열 제거
+    """
+    _preload_compiled_history()
     dates = get_available_dates()
-    result = {}  # ticker -> [{date, rank, name, ...}]
+    for date in set(_rank_index_sigs) - set(dates):
+        _rank_index.remove_date(date)
+        del _rank_index_sigs[date]
 
-    for date in reversed(dates):
-        data = load_ranking(date)
-        if not data:
+    todo = []
+    for date in reversed(dates):  # 오래된 순으로 추가해야 열 이동이 없음
+        path = STATE_DIR / f"ranking_{date}.json"
+        try:
+            st = os.stat(path)
+        except OSError:
             continue
-        for stock in data.get("rankings", []):
-            cr = stock.get("composite_rank", stock.get("rank", 999))
-            if cr > 30:
-                continue
-            ticker = stock["ticker"]
-            if ticker not in result:
-                result[ticker] = {"name": stock["name"], "sector": stock.get("sector", ""), "history": []}
-            result[ticker]["history"].append({
-                "date": date,
-                "composite_rank": cr,
-                "score": stock.get("score", 0),
-            })
+        if _rank_index_sigs.get(date) != (st.st_mtime_ns, st.st_size):
+            todo.append(path)
 
-    return {"stocks": result, "dates": list(reversed(dates))}
+    # 인덱스 구축용 대량 읽기는 LRU 캐시를 거치지 않음 (최신 파일이 밀려나지 않도록)
+    start = time.perf_counter()
+    for sig, fragment in bulk_parse(todo, on_error=_quarantine_file):
+        _rank_index.set_fragment(fragment)
+        _rank_index_sigs[fragment.date] = sig
+        _count_parsed("ranking", sig[1])
+    if todo:
+        _stage["bulk_parse"].observe(time.perf_counter() - start)
+    _flush_compile()
+
+
+# ============================================================
+# 컴파일된 히스토리 (콜드 스타트용 바이너리)
+# ============================================================
+
+_compiled_loaded = False
+_compiled_sigs: Optional[dict] = None  # 디스크 스냅샷의 날짜 → 원본 시그니처 (마지막으로 매핑 / 저장한 것)
+
+
+def _preload_compiled_history() -> None:
+    """
+    콜드 스타트 시 한 번 — 컴파일 파일을 copy-on-write로 매핑해 그대로 순위 인덱스로 사용 (복사 없음)
+
+    스냅샷의 시그니처도 그대로 가져오므로 이어지는 동기화가 사라진 날짜는 빼고 바뀐 날짜만 다시 파싱함.
+    호출자가 _rank_index_lock을 잡고 있어야 함
+    """
+    global _compiled_loaded, _compiled_sigs, _rank_index
+    if _compiled_loaded or _compiled is None:
+        return
+    _compiled_loaded = True
+    if _rank_index.n_dates:
+        return  # 이미 JSON에서 적재한 날짜가 있음 — 섞지 않음 (다음 스냅샷 저장 때 반영)
+    start = time.perf_counter()
+    try:
+        loaded = _compiled.load()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[compiled] 컴파일 파일 적재 실패 (JSON에서 다시 구축): {e}")
+        loaded = None
+    finally:
+        _stage["compiled_preload"].observe(time.perf_counter() - start)
+    if loaded is None:
+        return
+    _rank_index, sigs = loaded
+    _rank_index_sigs.clear()
+    _rank_index_sigs.update(sigs)
+    _compiled_sigs = dict(sigs)
+
+
+def _flush_compile() -> None:
+    """
+    인덱스가 디스크 스냅샷보다 COMPILED_REFRESH_DATES개 이상 (또는 스냅샷이 없으면) 앞서면 새 스냅샷 저장
+
+    호출자가 _rank_index_lock을 잡고 있어야 함 (저장하는 동안 인덱스가 바뀌지 않도록).
+    이 프로세스는 기존 매핑을 계속 쓰고, 새 스냅샷은 다음에 시작하는 워커가 매핑함. 실패해도 서비스에는 영향 없음
+    """
+    global _compiled_sigs
+    if _compiled is None or not _rank_index_sigs:
+        return
+    sigs = dict(_rank_index_sigs)
+    if _compiled_sigs is not None:
+        stale = sum(1 for d, sig in sigs.items() if _compiled_sigs.get(d) != sig)
+        stale += sum(1 for d in _compiled_sigs if d not in sigs)
+        if stale < COMPILED_REFRESH_DATES:
+            return
+    start = time.perf_counter()
+    try:
+        _compiled.save(_rank_index, sigs)
+    except OSError as e:
+        print(f"[compiled] 컴파일 파일 갱신 실패: {e}")
+        return
+    _stage["compiled_save"].observe(time.perf_counter() - start)
+    _compiled_sigs = sigs
+
+
+@contextmanager
+def locked_rank_index() -> Iterator[RankIndex]:
+    """
+    최신 상태로 동기화된 순위 인덱스를 잠근 채 제공
+
+        with locked_rank_index() as idx:
+            mask = idx.top_mask(30)
+    """
+    with _rank_index_lock:
+        if get_data_version() is None:
+            # watcher가 없을 때만 직접 동기화 (있으면 watcher가 증분 적재)
+            _sync_rank_index()
+        yield _rank_index
 
 
 # ============================================================
@@ -129,33 +878,22 @@ def load_web_cache(date: str = None) -> Optional[dict]:
     - date가 None이면 가장 최신 캐시
     - 없으면 None 반환
     """
-    if date:
-        path = STATE_DIR / f"web_data_{date}.json"
-        if not path.exists():
-            return None
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+    if not date:
+        # 최신 캐시 찾기
+        cache_dates = _get_web_cache_dates()
+        if not cache_dates:
             return None
+        date = cache_dates[0]
 
-    # 최신 캐시 찾기
-    cache_dates = _get_web_cache_dates()
-    if not cache_dates:
-        return None
-    path = STATE_DIR / f"web_data_{cache_dates[0]}.json"
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return None
+    path = STATE_DIR / f"web_data_{date}.json"
+    return _load_checked(path, _read_web_data)
 
 
 # ============================================================
 # 새 함수: Market Data (시장 지표)
 # ============================================================
 
-def get_market_data() -> dict:
+def get_market_data(snap: Optional[DataSnapshot] = None) -> dict:
     """
     시장 지표 반환: 인덱스 + 신용시장(HY/KR/VIX) + 행동 등급
 
@@ -163,19 +901,101 @@ def get_market_data() -> dict:
     2순위: credit_monitor.py에서 실시간 수집 (fallback)
     3순위: 빈 기본값 반환
     """
+    snap = snap or take_snapshot()
+
     # 1순위: web_data 캐시
-    cache = load_web_cache()
+    cache = snap.web_cache()
     if cache:
         return _market_from_cache(cache)
 
-    # 2순위: credit_monitor 실시간 수집
-    try:
-        return _market_from_live()
-    except Exception as e:
-        print(f"[market] 실시간 수집 실패: {e}")
+    # 2순위: credit_monitor 실시간 수집 (백그라운드 갱신된 마지막 성공 결과)
+    live = _market_refresher.latest()
+    if live is not None:
+        market = _market_from_live(snap, live.value)
+    else:
+        # 3순위: 기본값 (첫 수집 전이거나 계속 실패 중)
+        market = _market_empty(snap)
+    market["live"] = _live_tag(live)
+    return market
+
+
+def _fetch_credit_status() -> dict:
+    """credit_monitor.get_credit_status() — 백그라운드 수집 스레드에서만 호출"""
+    import sys
+    quant_path = str(QUANT_PROJECT)
+    if quant_path not in sys.path:
+        sys.path.insert(0, quant_path)
+
+    from credit_monitor import get_credit_status
+
+    return get_credit_status()
+
+
+_market_refresher = LiveRefresher(
+    _fetch_credit_status,
+    interval=MARKET_LIVE_INTERVAL,
+    timeout=MARKET_LIVE_TIMEOUT,
+    failure_threshold=MARKET_LIVE_FAILURES,
+    cooldown=MARKET_LIVE_COOLDOWN,
+    name="market-live",
+)
+
+
+def _live_tag(live: Optional[LiveSnapshot]) -> dict:
+    """실시간 수집 결과의 시각·나이 (오래됐으면 stale)"""
+    if live is None:
+        return {
+            "fetched_at": None,
+            "age_seconds": None,
+            "stale": True,
+            "circuit": _market_refresher.circuit,
+        }
+    age = live.age
+    return {
+        "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(live.fetched_at)),
+        "age_seconds": round(age, 1),
+        "stale": age > 2 * MARKET_LIVE_INTERVAL,
+        "circuit": _market_refresher.circuit,
+    }
+
+
+def get_market_live_state() -> dict:
+    """실시간 수집 상태 (health용)"""
+    return _market_refresher.state()
+
+
+def stop_market_refresher() -> None:
+    """실시간 수집 스레드 종료"""
+    _market_refresher.stop()
+
+
+def _collect_metrics():
+    """/metrics 수집 시점 — 파일 캐시 / single-flight / 격리 / 실시간 수집 상태"""
+    cache = _file_cache.stats()
+    yield ("quant_file_cache_requests_total", "counter", "파일 캐시 조회 수",
+           [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])])
+    yield ("quant_file_cache_hit_ratio", "gauge", "파일 캐시 적중률", [({}, cache["hit_ratio"])])
+    yield ("quant_file_cache_evictions_total", "counter", "파일 캐시 LRU 제거 수", [({}, cache["evictions"])])
+    yield ("quant_file_cache_entries", "gauge", "파일 캐시 항목 수", [({}, cache["entries"])])
+    yield ("quant_file_cache_bytes", "gauge", "파일 캐시 크기 (원본 파일 기준)", [({}, cache["bytes"])])
+    yield ("quant_single_flight_coalesced_total", "counter", "합쳐진 동시 호출 수",
+           [({"pool": pool}, st["coalesced"]) for pool, st in get_single_flight_stats().items()])
+    yield ("quant_quarantined_files", "gauge", "격리된 파일 수", [({}, len(_quarantine))])
+    live = _market_refresher.state()
+    yield ("quant_market_live_attempts_total", "counter", "실시간 시장 수집 시도 수", [({}, live["attempts"])])
+    yield ("quant_market_live_failures_total", "counter", "실시간 시장 수집 실패 수 (timeout 포함)",
+           [({}, live["failures"])])
+    yield ("quant_market_live_age_seconds", "gauge", "마지막 성공 수집 이후 경과 시간", [({}, live["age_seconds"])])
+    yield ("quant_market_live_circuit_open", "gauge", "circuit 상태 (0 = closed)",
+           [({}, 0 if live["circuit"] == "closed" else 1)])
+    version = get_data_version()
+    if version is not None:
+        yield ("quant_ranking_dates", "gauge", "적재된 ranking 날짜 수", [({}, len(version.ranking_dates))])
+    yield ("quant_ready", "gauge", "warm-up 완료 여부 (1 = ready)", [({}, 1 if is_ready() else 0)])
+    yield ("quant_warmup_seconds", "gauge", "시작 warm-up 소요 시간", [({}, _warmup["duration_s"])])
+
 
-    # 3순위: 기본값
-    return _market_empty()
+REGISTRY.add_collector(_collect_metrics)
 
 
 def _market_from_cache(cache: dict) -> dict:
@@ -255,16 +1075,9 @@ def _market_from_cache(cache: dict) -> dict:
     }
 
 
-def _market_from_live() -> dict:
-    """credit_monitor.py에서 실시간으로 수집 (fallback)"""
-    import sys
-    quant_path = str(QUANT_PROJECT)
-    if quant_path not in sys.path:
-        sys.path.insert(0, quant_path)
-
-    from credit_monitor import get_credit_status
-
-    credit = get_credit_status()
+@timed(COMPUTE_SECONDS.labels("_market_from_live"))
+def _market_from_live(snap: DataSnapshot, credit: dict) -> dict:
+    """credit_monitor.get_credit_status() 결과에서 마켓 데이터 추출 (fallback)"""
     hy_raw = credit.get("hy") or {}
     kr_raw = credit.get("kr") or {}
     vix_raw = credit.get("vix") or {}
@@ -307,7 +1120,6 @@ def _market_from_live() -> dict:
     action_grade = _action_to_grade(final_action)
     pick_level = _compute_pick_level(final_action)
 
-    dates = get_available_dates()
     return {
         "indices": {
             "kospi": {"close": None, "change_pct": None},
@@ -325,13 +1137,12 @@ def _market_from_live() -> dict:
         },
         "pick_level": pick_level,
         "warnings": [],
-        "date": dates[0] if dates else "",
+        "date": snap.latest_date or "",
     }
 
 
-def _market_empty() -> dict:
+def _market_empty(snap: DataSnapshot) -> dict:
     """마켓 데이터 없을 때 기본값"""
-    dates = get_available_dates()
     return {
         "indices": {
             "kospi": {"close": None, "change_pct": None},
@@ -349,7 +1160,7 @@ def _market_empty() -> dict:
         },
         "pick_level": {"max_picks": 5, "label": "정상", "warning": None},
         "warnings": [],
-        "date": dates[0] if dates else "",
+        "date": snap.latest_date or "",
     }
 
 
@@ -410,7 +1221,8 @@ def _action_to_grade(action_text: str) -> str:
 # 새 함수: Pipeline Status (파이프라인)
 # ============================================================
 
-def compute_pipeline_status(top_n: int = 30) -> dict:
+@_per_data_version
+def compute_pipeline_status(top_n: int = 30, *, snap: DataSnapshot) -> dict:
     """
     Top 30 종목의 파이프라인 상태 계산
 
@@ -426,12 +1238,12 @@ def compute_pipeline_status(top_n: int = 30) -> dict:
         }
     """
     # 1순위: web_data 캐시
-    cache = load_web_cache()
+    cache = snap.web_cache()
     if cache and cache.get("pipeline"):
         return _pipeline_from_cache(cache)
 
     # 2순위: ranking JSON에서 직접 계산
-    return _pipeline_from_rankings(top_n)
+    return _pipeline_from_rankings(snap, top_n)
 
 
 def _pipeline_from_cache(cache: dict) -> dict:
@@ -468,54 +1280,32 @@ def _pipeline_from_cache(cache: dict) -> dict:
     }
 
 
-def _pipeline_from_rankings(top_n: int = 30) -> dict:
+def _pipeline_from_rankings(snap: DataSnapshot, top_n: int = 30) -> dict:
     """ranking JSON에서 직접 파이프라인 계산"""
-    dates = get_available_dates()
+    dates = snap.ranking_dates
     if not dates:
         return {"verified": [], "pending": [], "new_entry": [], "sectors": {}}
 
-    rankings = []
+    # T-0은 Top N만, T-1/T-2는 Top N + T-0 종목(trajectory용)만 읽음
+    days: list[RankingSnapshot] = []
     for i in range(min(3, len(dates))):
-        data = load_ranking(dates[i])
-        if data:
-            rankings.append(data)
+        day = snap.top_snapshot(dates[i], top_n, tickers=set(days[0].position) if days else None)
+        if day is not None:
+            days.append(day)
 
-    if not rankings:
+    if not days:
         return {"verified": [], "pending": [], "new_entry": [], "sectors": {}}
 
-    # T-0 Top N
-    t0_map = {}
-    for stock in rankings[0].get("rankings", []):
-        cr = stock.get("composite_rank", stock.get("rank", 999))
-        if cr <= top_n:
-            t0_map[stock["ticker"]] = stock
-
+    t0 = days[0]
     # T-1, T-2 ticker sets
-    t1_set = set()
-    if len(rankings) > 1:
-        for stock in rankings[1].get("rankings", []):
-            cr = stock.get("composite_rank", stock.get("rank", 999))
-            if cr <= top_n:
-                t1_set.add(stock["ticker"])
-
-    t2_set = set()
-    if len(rankings) > 2:
-        for stock in rankings[2].get("rankings", []):
-            cr = stock.get("composite_rank", stock.get("rank", 999))
-            if cr <= top_n:
-                t2_set.add(stock["ticker"])
-
-    # trajectory 계산 헬퍼
-    def _get_rank_from_day(ticker: str, day_data: dict, top_n: int) -> Optional[int]:
-        for s in day_data.get("rankings", []):
-            if s["ticker"] == ticker:
-                return s.get("composite_rank", s.get("rank", 999))
-        return None
+    t1_set = days[1].top_tickers(top_n) if len(days) > 1 else set()
+    t2_set = days[2].top_tickers(top_n) if len(days) > 2 else set()
 
     verified, pending, new_entry = [], [], []
     sectors = {}
 
-    for ticker, stock in t0_map.items():
+    for ticker, i in t0.position.items():
+        stock = t0.rows[i]
         in_t1 = ticker in t1_set
         in_t2 = ticker in t2_set
 
@@ -524,7 +1314,7 @@ def _pipeline_from_rankings(top_n: int = 30) -> dict:
             "name": stock["name"],
             "sector": stock.get("sector", ""),
             "rank": stock.get("rank", 999),
-            "composite_rank": stock.get("composite_rank", stock.get("rank", 999)),
+            "composite_rank": t0.composite[i],
             "score": _safe_float(stock.get("score")),
             "per": _safe_float(stock.get("per")),
             "pbr": _safe_float(stock.get("pbr")),
@@ -533,22 +1323,15 @@ def _pipeline_from_rankings(top_n: int = 30) -> dict:
         }
 
         # trajectory: [T-2, T-1, T-0]
-        trajectory = []
-        if len(rankings) > 2:
-            trajectory.append(_get_rank_from_day(ticker, rankings[2], 999))
-        if len(rankings) > 1:
-            trajectory.append(_get_rank_from_day(ticker, rankings[1], 999))
-        trajectory.append(stock.get("composite_rank", stock.get("rank", 999)))
+        trajectory = [day.composite_of(ticker) for day in reversed(days[1:])]
+        trajectory.append(t0.composite[i])
         base["trajectory"] = trajectory
 
         if in_t1 and in_t2:
             base["status"] = "verified"
             # 가중순위 계산
-            ranks = []
-            for i, day_data in enumerate(rankings[:3]):
-                r = _get_rank_from_day(ticker, day_data, 999) or 999
-                ranks.append(r)
-            base["weighted_rank"] = round(ranks[0] * 0.5 + ranks[1] * 0.3 + (ranks[2] if len(ranks) > 2 else ranks[-1]) * 0.2, 1)
+            ranks = [day.composite_of(ticker) or 999 for day in days]
+            base["weighted_rank"] = round(ranks[0] * 0.5 + ranks[1] * 0.3 + ranks[2] * 0.2, 1)
             verified.append(base)
         elif in_t1:
             base["status"] = "pending"
@@ -577,7 +1360,7 @@ def _pipeline_from_rankings(top_n: int = 30) -> dict:
 # 새 함수: Factor Grades (팩터 등급)
 # ============================================================
 
-def compute_factor_grades(stocks: list) -> dict:
+def compute_factor_grades(stocks: Union[list, RankingSnapshot]) -> dict:
     """
     Top 30 종목의 팩터별 등급 계산
 
@@ -586,41 +1369,71 @@ def compute_factor_grades(stocks: list) -> dict:
     - 백분위 → 등급: top 10%=A+, 20%=A, 30%=B+, 50%=B, 70%=C, bottom=D
 
     Args:
-        stocks: ranking JSON의 rankings 리스트 (Top 30만)
+        stocks: ranking JSON의 rankings 리스트 (Top 30만) 또는 그 RankingSnapshot
 
     Returns:
         {ticker: {"value": "A+", "quality": "B", "growth": "C", "momentum": "A"}}
     """
     if not stocks:
         return {}
+    if not isinstance(stocks, RankingSnapshot):
+        stocks = RankingSnapshot(None, stocks)
 
     n = len(stocks)
-    factors = {
-        "value_s": "value",
-        "quality_s": "quality",
-        "growth_s": "growth",
-        "momentum_s": "momentum",
-    }
+    groups = np.zeros(n, dtype=np.int64)  # 전체가 한 그룹
+    order = np.arange(n)                   # 동점은 입력 순서 유지
+
+    result = {ticker: {} for ticker in stocks.tickers}
+    for factor_key, factor_name in FACTOR_NAMES.items():
+        # 스코어 높을수록 좋음 — 백분위(0이 최고) → 등급 (결측은 0)
+        values = stocks.column(factor_key)
+        scores = np.where(np.isnan(values), 0.0, values)
+        codes = grade_codes(scores, groups, order)
+        for ticker, code in zip(stocks.tickers, codes):
+            result[ticker][factor_name] = GRADES[code]
 
-    result = {}
-    for stock in stocks:
-        result[stock["ticker"]] = {}
+    return result
 
-    for factor_key, factor_name in factors.items():
-        # 스코어로 정렬 (높을수록 좋음)
-        valid_stocks = [(s["ticker"], s.get(factor_key, 0) or 0) for s in stocks]
-        valid_stocks.sort(key=lambda x: x[1], reverse=True)
 
-        for rank_idx, (ticker, score) in enumerate(valid_stocks):
-            percentile = rank_idx / max(n, 1)  # 0이 최고
-            grade = _percentile_to_grade(percentile)
-            result[ticker][factor_name] = grade
+@_per_data_version(maxsize=4)
+def _factor_grade_table(top_n: Optional[int] = None, *, snap: DataSnapshot) -> FactorGradeTable:
+    """전 날짜 팩터 등급 테이블 (데이터 버전당 한 번 계산 — 종목 × 날짜 크기라 top_n 4가지만 보관)"""
+    with locked_rank_index() as index:
+        return FactorGradeTable.build(index, top_n)
+
+
+def get_grade_history(ticker: str, top_n: Optional[int] = None) -> Optional[list]:
+    """
+    종목의 날짜별 팩터 등급
+
+    top_n=None이면 그날 전 종목 대비, 숫자면 그날 Top N 안에서의 등급 (Top N에 든 날만)
+    """
+    return _factor_grade_table(top_n).history(ticker)
+
+
+def get_grade_distribution(date: str, top_n: Optional[int] = None) -> Optional[dict]:
+    """날짜의 팩터별 등급 분포 (date="latest"면 최신 날짜)"""
+    if date == "latest":
+        dates = get_available_dates()
+        if not dates:
+            return None
+        date = dates[0]
+    return _factor_grade_table(top_n).distribution(date)
 
-    return result
+
+@_per_data_version
+def _latest_factor_grades(top_n: int = 30, *, snap: DataSnapshot) -> Optional[dict]:
+    """최신 ranking Top N의 팩터 등급 (데이터 버전당 한 번 계산)"""
+    if not snap.latest_date:
+        return None
+    top = snap.top_snapshot(snap.latest_date, top_n)
+    if top is None:
+        return None
+    return compute_factor_grades(top)
 
 
 def _percentile_to_grade(percentile: float) -> str:
-    """백분위(0=최고) → 등급 변환"""
+    """백분위(0=최고) → 등급 변환 (factor_grades.GRADE_CUTOFFS와 같은 경계)"""
     if percentile < 0.10:
         return "A+"
     elif percentile < 0.20:
@@ -639,24 +1452,70 @@ def _percentile_to_grade(percentile: float) -> str:
 # Enhanced: compute_picks (3일 교집합)
 # ============================================================
 
-def compute_picks(n_days: int = 3, top_n: int = 30, max_picks: int = 5) -> dict:
+# 기본 가중치 (T-0부터) — 3일은 기존 0.5/0.3/0.2, 그 외는 최근일일수록 큰 선형 가중치
+DEFAULT_PICK_WEIGHTS = (0.5, 0.3, 0.2)
+
+# 파라미터별 picks 결과 보관 개수 (데이터 버전 내)
+PICKS_MEMO_MAX_ENTRIES = int(os.environ.get("PICKS_MEMO_MAX_ENTRIES", "256"))
+
+
+def resolve_pick_weights(n_days: int, weights: Optional[tuple] = None) -> tuple:
     """
-    3일 교집합 (Slow In) 계산 — Enhanced with factor_grades, roe, fwd_per, weight, buy_rationale
+    가중치 확정 — 지정하지 않으면 기본값, 지정했으면 길이·부호 검증
 
-    - 3거래일 연속 Top N에 있는 종목만
-    - 가중순위: T0x0.5 + T1x0.3 + T2x0.2
+    Raises:
+        ValueError: 길이가 n_days와 다르거나, 음수·NaN·무한대가 있거나, 합이 0일 때
+    """
+    if weights is None:
+        if n_days == len(DEFAULT_PICK_WEIGHTS):
+            return DEFAULT_PICK_WEIGHTS
+        total = n_days * (n_days + 1) / 2
+        return tuple((n_days - i) / total for i in range(n_days))
+    weights = tuple(float(w) for w in weights)
+    if len(weights) != n_days:
+        raise ValueError(f"가중치 {len(weights)}개 — n_days({n_days})와 같아야 함")
+    if not all(math.isfinite(w) for w in weights):
+        raise ValueError("가중치는 유한한 숫자여야 함")
+    if any(w < 0 for w in weights):
+        raise ValueError("가중치는 0 이상이어야 함")
+    if sum(weights) == 0:
+        raise ValueError("가중치 합이 0")
+    return weights
+
+
+def _resolve_picks_args(arguments: dict) -> None:
+    """compute_picks 메모 키 정규화 — weights=None과 기본 가중치 튜플이 같은 항목을 쓰도록"""
+    arguments["weights"] = resolve_pick_weights(arguments["n_days"], arguments["weights"])
+
+
+@_per_data_version(maxsize=PICKS_MEMO_MAX_ENTRIES, normalize=_resolve_picks_args)
+def compute_picks(
+    n_days: int = 3,
+    top_n: int = 30,
+    max_picks: int = 5,
+    weights: Optional[tuple] = None,
+    *,
+    snap: DataSnapshot,
+) -> dict:
+    """
+    n일 교집합 (Slow In) 계산 — Enhanced with factor_grades, roe, fwd_per, weight, buy_rationale
+
+    - n_days 거래일 연속 Top N에 있는 종목만
+    - 가중순위: 기본 T0x0.5 + T1x0.3 + T2x0.2 (weights로 변경, T-0부터)
     - 최대 max_picks 종목
+    - 파라미터 조합 + 데이터 버전별로 결과 보관 (최근 PICKS_MEMO_MAX_ENTRIES개)
+    - weights는 메모 키를 만들기 전에 확정됨 (None → 기본 가중치, _resolve_picks_args)
     """
-    # 1순위: web_data 캐시의 picks 사용
-    cache = load_web_cache()
-    if cache and cache.get("picks"):
-        return _picks_from_cache(cache)
+    # 1순위: web_data 캐시의 picks 사용 (기본 파라미터일 때만 — 캐시는 기본값으로 계산됨)
+    cache = snap.web_cache()
+    if cache and cache.get("picks") and (n_days, top_n, max_picks, weights) == (3, 30, 5, DEFAULT_PICK_WEIGHTS):
+        return _picks_from_cache(snap, cache)
 
-    # 2순위: ranking JSON에서 직접 계산
-    return _picks_from_rankings(n_days, top_n, max_picks)
+    # 2순위: 순위 행렬에서 직접 계산
+    return _picks_from_rankings(snap, n_days, top_n, max_picks, weights)
 
 
-def _picks_from_cache(cache: dict) -> dict:
+def _picks_from_cache(snap: DataSnapshot, cache: dict) -> dict:
     """web_data 캐시에서 picks 추출 (이미 계산되어 있음)"""
     picks_raw = cache.get("picks", [])
 
@@ -690,11 +1549,8 @@ def _picks_from_cache(cache: dict) -> dict:
         picks.append(pick)
 
     # factor grades 일괄 계산 (최신 ranking에서)
-    latest = load_latest_ranking()
-    if latest:
-        top30 = [s for s in latest.get("rankings", [])
-                 if s.get("composite_rank", s.get("rank", 999)) <= 30]
-        grades = compute_factor_grades(top30)
+    grades = _latest_factor_grades(snap=snap)
+    if grades is not None:
         for pick in picks:
             pick["factor_grades"] = grades.get(pick["ticker"])
 
@@ -705,54 +1561,67 @@ def _picks_from_cache(cache: dict) -> dict:
     }
 
 
-def _picks_from_rankings(n_days: int = 3, top_n: int = 30, max_picks: int = 5) -> dict:
-    """ranking JSON에서 직접 picks 계산"""
-    dates = get_available_dates()
+def _picks_from_rankings(
+    snap: DataSnapshot,
+    n_days: int = 3,
+    top_n: int = 30,
+    max_picks: int = 5,
+    weights: tuple = DEFAULT_PICK_WEIGHTS,
+) -> dict:
+    """
+    순위 행렬에서 picks 계산
+
+    교집합·가중순위·정렬은 행렬 연산, 선정된 종목의 PER/ROE 등은 T-0 Top N 레코드에서 채움
+    (인덱스를 읽은 뒤 T-0 파일이 다시 쓰여 레코드에 없는 종목은 건너뛰고 다음 후보로 채움)
+    """
+    dates = snap.ranking_dates
     if len(dates) < n_days:
         return {"picks": [], "message": f"순위 데이터가 {len(dates)}일밖에 없습니다 ({n_days}일 필요)"}
 
-    weights = [0.5, 0.3, 0.2]
-    rankings_by_day = []
-
-    for i in range(n_days):
-        data = load_ranking(dates[i])
-        if not data:
-            return {"picks": [], "message": f"{dates[i]} 데이터 로드 실패"}
-        top_stocks = {}
-        for stock in data.get("rankings", []):
-            cr = stock.get("composite_rank", stock.get("rank", 999))
-            if cr <= top_n:
-                top_stocks[stock["ticker"]] = stock
-        rankings_by_day.append(top_stocks)
-
-    # 3일 모두 Top N에 있는 종목 찾기
-    common_tickers = set(rankings_by_day[0].keys())
-    for day_stocks in rankings_by_day[1:]:
-        common_tickers &= set(day_stocks.keys())
-
-    # factor grades from T-0 Top 30
-    t0_top30 = list(rankings_by_day[0].values())
-    grades = compute_factor_grades(t0_top30)
-
-    # 가중순위 계산
-    picks = []
-    for ticker in common_tickers:
-        weighted_rank = 0
-        stock_info = rankings_by_day[0][ticker]  # T-0 정보 사용
-        for i, day_stocks in enumerate(rankings_by_day):
-            cr = day_stocks[ticker].get("composite_rank", day_stocks[ticker].get("rank", 999))
-            weighted_rank += cr * weights[i]
-
-        trajectory = []
-        for i in range(n_days - 1, -1, -1):
-            cr = rankings_by_day[i][ticker].get("composite_rank", rankings_by_day[i][ticker].get("rank", 999))
-            trajectory.append(cr)
+    with locked_rank_index() as idx:
+        cols = []
+        for date in dates[:n_days]:
+            col = idx.col_of.get(date)
+            if col is None:
+                return {"picks": [], "message": f"{date} 데이터 로드 실패"}
+            cols.append(col)
+
+        # n_days일 모두 Top N에 있는 종목
+        common = np.flatnonzero(idx.top_mask(top_n)[:, cols].all(axis=1))
+        crs = idx.col("composite_rank")[common][:, cols]  # 종목 × [T-0, T-1, ...]
+
+        # 가중순위 계산 (T-0부터 순서대로 더함 — 기존 계산과 같은 부동소수 결과)
+        weighted = np.zeros(len(common))
+        for i in range(n_days):
+            weighted = weighted + crs[:, i] * weights[i]
+        candidates = sorted(
+            (round(w, 1), int(crs[j, 0]), idx.tickers[row], j)
+            for j, (row, w) in enumerate(zip(common.tolist(), weighted.tolist()))
+        )
+        selected = [
+            (ticker, weighted_rank, [int(c) for c in crs[j, ::-1]])  # [T-(n-1), ..., T-0]
+            for weighted_rank, _, ticker, j in candidates
+        ]
+
+    t0 = snap.top_snapshot(dates[0], top_n)
+    if t0 is None:
+        return {"picks": [], "message": f"{dates[0]} 데이터 로드 실패"}
+
+    # factor grades from T-0 Top N
+    grades = compute_factor_grades(t0)
 
+    picks = []
+    for ticker, weighted_rank, trajectory in selected:
+        if len(picks) == max_picks:
+            break
+        stock_info = t0.get(ticker)  # T-0 정보 사용
+        if stock_info is None:
+            continue
         pick = {
             "ticker": ticker,
             "name": stock_info["name"],
             "sector": stock_info.get("sector", ""),
-            "weighted_rank": round(weighted_rank, 1),
+            "weighted_rank": weighted_rank,
             "composite_rank": stock_info.get("composite_rank", stock_info.get("rank")),
             "score": _safe_float(stock_info.get("score", 0)),
             "per": _safe_float(stock_info.get("per")),
@@ -760,19 +1629,16 @@ def _picks_from_rankings(n_days: int = 3, top_n: int = 30, max_picks: int = 5) -
             "roe": _safe_float(stock_info.get("roe")),
             "fwd_per": _safe_float(stock_info.get("fwd_per")),
             "weight": 20,
-            "trajectory": trajectory,  # [T-2, T-1, T-0]
+            "trajectory": trajectory,  # [T-(n-1), ..., T-1, T-0]
             "factor_grades": grades.get(ticker),
         }
         pick["buy_rationale"] = _generate_buy_rationale(pick, trajectory)
         picks.append(pick)
 
-    picks.sort(key=lambda x: x["weighted_rank"])
-    picks = picks[:max_picks]
-
     return {
         "picks": picks,
         "dates": dates[:n_days],
-        "total_common": len(common_tickers),
+        "total_common": len(common),
     }
 
 
@@ -818,11 +1684,86 @@ def _generate_buy_rationale(stock: dict, trajectory: list) -> str:
     return " · ".join(parts) if parts else ""
 
 
+# ============================================================
+# 새 함수: Picks History (전 날짜 슬라이딩 윈도우)
+# ============================================================
+
+@_per_data_version(maxsize=16)
+def compute_picks_history(top_n: int = 30, max_picks: int = 5, *, snap: DataSnapshot) -> dict:
+    """
+    아카이브 전 날짜의 picks (3일 교집합 + 가중순위) 와 일별 교체 내역
+
+    - 순위 행렬에서 날짜마다 Top N 집합을 한 번만 뽑아 최근 3일 창(deque)으로 밀고 나감
+      → 날짜마다 파일 3개를 다시 읽지 않음
+    - 가중순위·정렬·max_picks 자르기는 compute_picks와 동일 (동점은 T-0 순위, 종목코드 순)
+    - turnover: 오늘 picks 중 새로 들어온 비율 (added / picks 수)
+
+    Returns:
+        {
+            "dates": [...],            # picks를 계산한 날짜 (오래된 순)
+            "history": [{"date", "picks": [...], "total_common", "added", "removed", "turnover"}],
+            "avg_turnover": 0.23
+        }
+    """
+    weights = DEFAULT_PICK_WEIGHTS
+    n_days = len(weights)
+    history = []
+    with locked_rank_index() as idx:
+        cr = idx.col("composite_rank")
+        top = idx.top_mask(top_n)
+        window = deque(maxlen=n_days)  # [{row: composite_rank}] 오래된 → 최신
+        prev = None
+        for col, date in enumerate(idx.dates):
+            rows = np.flatnonzero(top[:, col])
+            window.append(dict(zip(rows.tolist(), cr[rows, col].tolist())))
+            if len(window) < n_days:
+                continue
+
+            days = list(reversed(window))  # T-0, T-1, T-2
+            common = set(days[0]).intersection(*days[1:])
+            picks = []
+            for row in common:
+                weighted_rank = 0
+                for i, day in enumerate(days):
+                    weighted_rank += day[row] * weights[i]
+                picks.append({
+                    "ticker": idx.tickers[row],
+                    "name": idx.names[row],
+                    "sector": idx.sectors[row],
+                    "weighted_rank": round(weighted_rank, 1),
+                    "composite_rank": int(days[0][row]),
+                    "trajectory": [int(day[row]) for day in reversed(days)],  # [T-2, T-1, T-0]
+                })
+            picks.sort(key=lambda p: (p["weighted_rank"], p["composite_rank"], p["ticker"]))
+            picks = picks[:max_picks]
+
+            tickers = [p["ticker"] for p in picks]
+            added = [t for t in tickers if prev is not None and t not in prev]
+            removed = [t for t in prev if t not in tickers] if prev is not None else []
+            history.append({
+                "date": date,
+                "picks": picks,
+                "total_common": len(common),
+                "added": added,
+                "removed": removed,
+                "turnover": round(len(added) / len(picks), 4) if picks and prev is not None else None,
+            })
+            prev = tickers
+
+    turnovers = [h["turnover"] for h in history if h["turnover"] is not None]
+    return {
+        "dates": [h["date"] for h in history],
+        "history": history,
+        "avg_turnover": round(sum(turnovers) / len(turnovers), 4) if turnovers else None,
+    }
+
+
 # ============================================================
 # Enhanced: compute_death_list (Fast Out)
 # ============================================================
 
-def compute_death_list(top_n: int = 50) -> dict:
+@_per_data_version
+def compute_death_list(top_n: int = 50, *, snap: DataSnapshot) -> dict:
     """
     Death List (Fast Out) 계산 — Enhanced with exit_reason tags
 
@@ -830,12 +1771,12 @@ def compute_death_list(top_n: int = 50) -> dict:
     - 이탈 사유: V↓ Q↓ M↓ (팩터 스코어 비교)
     """
     # 1순위: web_data 캐시
-    cache = load_web_cache()
+    cache = snap.web_cache()
     if cache and cache.get("exited"):
         return _deathlist_from_cache(cache)
 
     # 2순위: ranking JSON에서 직접 계산
-    return _deathlist_from_rankings(top_n)
+    return _deathlist_from_rankings(snap, top_n)
 
 
 def _deathlist_from_cache(cache: dict) -> dict:
@@ -860,58 +1801,50 @@ def _deathlist_from_cache(cache: dict) -> dict:
     }
 
 
-def _deathlist_from_rankings(top_n: int = 50) -> dict:
+def _deathlist_from_rankings(snap: DataSnapshot, top_n: int = 50) -> dict:
     """ranking JSON에서 직접 death list 계산"""
-    dates = get_available_dates()
+    dates = snap.ranking_dates
     if len(dates) < 2:
         return {"death_list": [], "message": "2일 이상의 데이터가 필요합니다"}
 
-    today_data = load_ranking(dates[0])
-    yesterday_data = load_ranking(dates[1])
-    if not today_data or not yesterday_data:
+    # 어제 Top 50
+    yesterday = snap.top_snapshot(dates[1], top_n)
+    yesterday_top = yesterday.top_positions(top_n) if yesterday is not None else []
+
+    # 오늘: Top N + 어제 Top N 종목 (이탈 종목의 현재 순위·스코어 조회용)
+    today = snap.top_snapshot(dates[0], top_n, tickers={yesterday.tickers[i] for i in yesterday_top})
+    if today is None or yesterday is None:
         return {"death_list": [], "message": "데이터 로드 실패"}
 
-    # 어제 Top 50
-    yesterday_top = {}
-    for stock in yesterday_data.get("rankings", []):
-        cr = stock.get("composite_rank", stock.get("rank", 999))
-        if cr <= top_n:
-            yesterday_top[stock["ticker"]] = stock
-
-    # 오늘 전체 순위 맵 (이탈 종목의 현재 스코어 조회용)
-    today_all_map = {}
-    for stock in today_data.get("rankings", []):
-        today_all_map[stock["ticker"]] = stock
-
-    # 오늘 Top N 맵
-    today_rank_map = {}
-    for stock in today_data.get("rankings", []):
-        cr = stock.get("composite_rank", stock.get("rank", 999))
-        today_rank_map[stock["ticker"]] = {**stock, "current_composite": cr}
-
-    # 이탈 종목 찾기
+    # 이탈 종목 찾기: 오늘 파일에 없거나 오늘 순위가 Top N 밖
+    exits = []
+    for i in yesterday_top:
+        j = today.position.get(yesterday.tickers[i])
+        if j is None or today.composite[j] > top_n:
+            exits.append((i, j))
+
+    # exit_reason 계산 (오늘 파일에 있는 종목만)
+    present = [(i, j) for i, j in exits if j is not None]
+    y_pos = np.array([i for i, _ in present], dtype=np.int64)
+    t_pos = np.array([j for _, j in present], dtype=np.int64)
+    reasons = dict(zip((j for _, j in present), _exit_reasons(
+        today.column("price")[t_pos], today.column("fwd_per")[t_pos],
+        yesterday.column("price")[y_pos], yesterday.column("fwd_per")[y_pos],
+    )))
+
     death_list = []
-    for ticker, y_stock in yesterday_top.items():
-        t_info = today_rank_map.get(ticker)
-        if not t_info or t_info["current_composite"] > top_n:
-            yesterday_cr = y_stock.get("composite_rank", y_stock.get("rank", 999))
-            today_cr = t_info["current_composite"] if t_info else None
-
-            # exit_reason 계산
-            exit_reason = ""
-            t0_item = today_all_map.get(ticker)
-            if t0_item:
-                exit_reason = _compute_exit_reason_inline(t0_item, y_stock)
-
-            death_list.append({
-                "ticker": ticker,
-                "name": y_stock["name"],
-                "sector": y_stock.get("sector", ""),
-                "yesterday_rank": yesterday_cr,
-                "today_rank": today_cr,
-                "exit_reason": exit_reason,
-                "dropped_out": today_cr is None,
-            })
+    for i, j in exits:
+        y_stock = yesterday.rows[i]
+        today_cr = None if j is None else today.composite[j]
+        death_list.append({
+            "ticker": yesterday.tickers[i],
+            "name": y_stock["name"],
+            "sector": y_stock.get("sector", ""),
+            "yesterday_rank": yesterday.composite[i],
+            "today_rank": today_cr,
+            "exit_reason": reasons.get(j, ""),
+            "dropped_out": today_cr is None,
+        })
 
     death_list.sort(key=lambda x: x["yesterday_rank"])
 
@@ -944,18 +1877,234 @@ def _compute_exit_reason_inline(t0_item: dict, t1_item: dict) -> str:
     return ' '.join(tags) if tags else ''
 
 
+def _exit_reasons(p0: np.ndarray, fwd0: np.ndarray, p1: np.ndarray, fwd1: np.ndarray) -> list[str]:
+    """_compute_exit_reason_inline의 배열 버전 (0 = T-0, 1 = T-1, 결측은 NaN)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        has0 = (p0 != 0) & ~np.isnan(p0)
+        has1 = (p1 != 0) & ~np.isnan(p1)
+        eps0 = np.where(has0 & (fwd0 > 0), p0 / fwd0, np.nan)
+        eps1 = np.where(has1 & (fwd1 > 0), p1 / fwd1, np.nan)
+        eps_chg = (eps0 - eps1) / np.abs(eps1)
+        pct = np.where(has0 & has1 & (p1 > 0), (p0 - p1) / p1, np.nan)
+        eps_tag = np.where(np.abs(eps_chg) >= 0.03, np.where(eps_chg > 0, 1, -1), 0)
+        price_tag = np.where(np.abs(pct) >= 0.03, np.where(pct > 0, 1, -1), 0)
+    eps_text = {1: '💪전망↑', -1: '⚠️전망↓', 0: ''}
+    price_text = {1: '📈가격↑', -1: '📉가격↓', 0: ''}
+    return [
+        ' '.join(t for t in (eps_text[e], price_text[p]) if t)
+        for e, p in zip(eps_tag.tolist(), price_tag.tolist())
+    ]
+
+
+# (top_n, 어제, 오늘, 어제 시그니처, 오늘 시그니처) -> death list — 새 날짜가 오면 새 쌍만 계산
+# _rank_index_lock 안에서만 접근
+_deathlist_pairs: dict = {}
+_deathlist_top_ns: OrderedDict = OrderedDict()  # 쌍을 보관 중인 top_n (최근 사용 순)
+DEATHLIST_PAIRS_MAX_TOP_N = 4
+
+
+@_per_data_version(maxsize=16)
+def compute_deathlist_history(top_n: int = 50, *, snap: DataSnapshot) -> dict:
+    """
+    연속된 모든 날짜 쌍의 Death List (Fast Out)
+
+    - 어제 Top N → 오늘 N위 밖(또는 파일에서 사라짐) 판정과 이탈 사유(전망/가격 태그)를
+      아직 계산하지 않은 날짜 쌍 전체에 대해 배열 연산 한 번으로 처리
+    - 이미 계산한 쌍은 두 파일이 그대로면 재사용 (새 날짜가 오면 마지막 쌍 하나만 추가 계산)
+    - 종목명/섹터는 최신 기준
+
+    Returns:
+        {
+            "top_n": 50,
+            "history": [{"dates": {"yesterday", "today"}, "death_list": [...]}],  # 오래된 순
+            "summary": {"days": 120, "total_exits": 900, "dropped_out": 12, "reasons": {"📉가격↓": 300, ...}}
+        }
+    """
+    with locked_rank_index() as idx:
+        pairs = []
+        for col in range(1, idx.n_dates):
+            y_date, t_date = idx.dates[col - 1], idx.dates[col]
+            key = (top_n, y_date, t_date, _rank_index_sigs.get(y_date), _rank_index_sigs.get(t_date))
+            pairs.append((col, key))
+        missing = [(col, key) for col, key in pairs if key not in _deathlist_pairs]
+        if missing:
+            _compute_deathlist_pairs(idx, top_n, missing)
+        _prune_deathlist_pairs(top_n, {key[1:] for _, key in pairs})
+        history = [
+            {"dates": {"yesterday": key[1], "today": key[2]}, "death_list": _deathlist_pairs[key]}
+            for _, key in pairs
+        ]
+
+    reasons: dict = {}
+    total = dropped = 0
+    for day in history:
+        for entry in day["death_list"]:
+            total += 1
+            dropped += entry["dropped_out"]
+            for tag in entry["exit_reason"].split():
+                reasons[tag] = reasons.get(tag, 0) + 1
+    return {
+        "top_n": top_n,
+        "history": history,
+        "summary": {"days": len(history), "total_exits": total, "dropped_out": dropped, "reasons": reasons},
+    }
+
+
+def _prune_deathlist_pairs(top_n: int, live: set) -> None:
+    """
+    현재 인덱스의 날짜 쌍(날짜 + 시그니처)이 아닌 항목은 top_n과 관계없이 삭제 (이전 데이터 버전의 쌍),
+    최근에 쓰지 않은 top_n의 항목도 삭제 (DEATHLIST_PAIRS_MAX_TOP_N개만 유지)
+    """
+    _deathlist_top_ns[top_n] = None
+    _deathlist_top_ns.move_to_end(top_n)
+    while len(_deathlist_top_ns) > DEATHLIST_PAIRS_MAX_TOP_N:
+        _deathlist_top_ns.popitem(last=False)
+    for key in [k for k in _deathlist_pairs if k[1:] not in live or k[0] not in _deathlist_top_ns]:
+        del _deathlist_pairs[key]
+
+
+def _compute_deathlist_pairs(idx: RankIndex, top_n: int, missing: list) -> None:
+    """날짜 쌍 여러 개의 이탈 종목을 한 번에 계산해 _deathlist_pairs에 저장"""
+    t_cols = np.array([col for col, _ in missing])
+    y_cols = t_cols - 1
+    present = idx.mask()
+    cr = idx.col("composite_rank")  # 결측이면 이미 rank로 대체돼 있음
+
+    def composite(cols):
+        # 파일에는 있으나 composite_rank·rank 둘 다 없으면 999 (기존 계산과 동일)
+        return np.where(np.isnan(cr[:, cols]) & present[:, cols], 999, cr[:, cols])
+
+    y_cr, t_cr = composite(y_cols), composite(t_cols)
+    y_present, t_present = present[:, y_cols], present[:, t_cols]
+    with np.errstate(invalid="ignore"):
+        exited = y_present & (y_cr <= top_n) & (~t_present | (t_cr > top_n))
+    rows, k = np.nonzero(exited)
+
+    # 이탈 사유 (오늘 파일에 있는 종목만)
+    price, fwd = idx.col("price"), idx.col("fwd_per")
+    reasons = _exit_reasons(
+        price[rows, t_cols[k]], fwd[rows, t_cols[k]], price[rows, y_cols[k]], fwd[rows, y_cols[k]],
+    )
+    on_today = t_present[rows, k]
+
+    # 쌍별로 어제 순위 → 어제 파일 내 위치 순 정렬
+    order = np.lexsort((idx.pos[rows, y_cols[k]], y_cr[rows, k], k))
+    lists = {key: [] for _, key in missing}
+    for i in order.tolist():
+        row, j = int(rows[i]), int(k[i])
+        today = bool(on_today[i])
+        lists[missing[j][1]].append({
+            "ticker": idx.tickers[row],
+            "name": idx.names[row],
+            "sector": idx.sectors[row],
+            "yesterday_rank": int(y_cr[row, j]),
+            "today_rank": int(t_cr[row, j]) if today else None,
+            "exit_reason": reasons[i] if today else "",
+            "dropped_out": not today,
+        })
+    _deathlist_pairs.update(lists)
+
+
+# ============================================================
+# 새 함수: Rank Diff (두 날짜 간 순위 변동)
+# ============================================================
+
+@_per_data_version(maxsize=64)
+def compute_rank_diff(
+    from_date: str, to_date: str, top_n: int = 30, min_score_change: float = 0.01, *, snap: DataSnapshot
+) -> Optional[dict]:
+    """
+    두 날짜 사이 composite_rank / score / Top N 소속이 바뀐 종목만 (순위 행렬에서 배열 연산)
+
+    - score는 |변화| ≥ min_score_change 일 때만 변경으로 봄 (기본 0.01 = 화면 표시 정밀도)
+    - 한쪽 날짜 파일에만 있는 종목도 포함 (없는 쪽 순위·스코어는 None)
+    - top_change: "in" = to에서 Top N 진입, "out" = Top N 이탈, 그 외 None
+    - rank_change: from 순위 - to 순위 (양수 = 상승)
+    - 정렬: to 순위 → (to에 없으면) from 순위 / 종목명·섹터는 최신 기준
+    - 날짜 쌍 + top_n 조합은 데이터 버전당 한 번만 계산
+
+    Returns:
+        {"from": "20260218", "to": "20260219", "top_n": 30, "universe": 2500, "changed": 120,
+         "entries": [...], "exits": [...],
+         "diff": [{"ticker", "name", "sector", "from_rank", "to_rank", "rank_change",
+                   "from_score", "to_score", "score_change", "top_change"}]}
+    """
+    with locked_rank_index() as idx:
+        a, b = idx.col_of.get(from_date), idx.col_of.get(to_date)
+        if a is None or b is None:
+            return None
+        cols = [a, b]
+        present = idx.mask()[:, cols]
+        cr = idx.col("composite_rank")[:, cols]
+        score = idx.col("score")[:, cols]
+        tickers, names, sectors = list(idx.tickers), list(idx.names), list(idx.sectors)
+
+    in_any = present.any(axis=1)
+    with np.errstate(invalid="ignore"):
+        in_top = present & (cr <= top_n)
+        rank_changed = (present[:, 0] != present[:, 1]) | (cr[:, 0] != cr[:, 1])
+        score_nan = np.isnan(score)
+        score_changed = (score_nan[:, 0] != score_nan[:, 1]) | (
+            np.abs(score[:, 1] - score[:, 0]) >= max(min_score_change, np.finfo(float).tiny)
+        )
+    top_changed = in_top[:, 0] != in_top[:, 1]
+    rows = np.flatnonzero(in_any & (rank_changed | score_changed | top_changed))
+
+    # 정렬 키: to 순위 (없으면 뒤로) → from 순위
+    sort_to = np.where(present[rows, 1], cr[rows, 1], np.inf)
+    sort_from = np.where(present[rows, 0], cr[rows, 0], np.inf)
+    rows = rows[np.lexsort((sort_from, sort_to))]
+
+    diff, entries, exits = [], [], []
+    for row in rows.tolist():
+        from_rank = int(cr[row, 0]) if present[row, 0] else None
+        to_rank = int(cr[row, 1]) if present[row, 1] else None
+        from_score = _safe_float(score[row, 0]) if present[row, 0] else None
+        to_score = _safe_float(score[row, 1]) if present[row, 1] else None
+        top_change = None
+        if top_changed[row]:
+            top_change = "in" if in_top[row, 1] else "out"
+            (entries if top_change == "in" else exits).append(tickers[row])
+        diff.append({
+            "ticker": tickers[row],
+            "name": names[row],
+            "sector": sectors[row],
+            "from_rank": from_rank,
+            "to_rank": to_rank,
+            "rank_change": from_rank - to_rank if from_rank is not None and to_rank is not None else None,
+            "from_score": from_score,
+            "to_score": to_score,
+            "score_change": _safe_float(to_score - from_score)
+            if from_score is not None and to_score is not None else None,
+            "top_change": top_change,
+        })
+
+    return {
+        "from": from_date,
+        "to": to_date,
+        "top_n": top_n,
+        "min_score_change": min_score_change,
+        "universe": int(in_any.sum()),
+        "changed": len(diff),
+        "entries": entries,
+        "exits": exits,
+        "diff": diff,
+    }
+
+
 # ============================================================
 # 새 함수: AI Data
 # ============================================================
 
-def get_ai_data() -> dict:
+def get_ai_data(snap: Optional[DataSnapshot] = None) -> dict:
     """
     AI 분석 결과 반환
 
     web_data 캐시의 "ai" 필드에서 로드
     없으면 available: false 반환
     """
-    cache = load_web_cache()
+    snap = snap or take_snapshot()
+    cache = snap.web_cache()
     if not cache:
         return {"available": False, "risk_filter": None, "picks_text": None, "flagged_tickers": []}
 
@@ -971,6 +2120,39 @@ def get_ai_data() -> dict:
     }
 
 
+# ============================================================
+# 새 함수: Dashboard (전체 패널 일괄)
+# ============================================================
+
+def build_dashboard() -> dict:
+    """
+    대시보드 첫 화면의 6개 패널을 하나의 스냅샷에서 생성
+
+    - ranking / picks / deathlist 는 필수, market / pipeline / ai 는 실패 시 None
+    - 모든 패널이 같은 날짜 목록·같은 파싱 결과를 사용
+    """
+    snap = take_snapshot()
+    return {
+        "date": snap.latest_date,
+        "data_version": snap.version.token if snap.version else None,
+        "ranking": snap.latest_ranking(),
+        "picks": compute_picks(snap=snap),
+        "deathlist": compute_death_list(snap=snap),
+        "market": _optional_panel("market", get_market_data, snap),
+        "pipeline": _optional_panel("pipeline", compute_pipeline_status, snap),
+        "ai": _optional_panel("ai", get_ai_data, snap),
+    }
+
+
+def _optional_panel(name: str, fn, snap: DataSnapshot) -> Optional[dict]:
+    """선택 패널 — 예외는 로그만 남기고 None"""
+    try:
+        return fn(snap=snap)
+    except Exception as e:
+        print(f"[dashboard] {name} 생성 실패: {e}")
+        return None
+
+
 # ============================================================
 # 유틸리티
 # ============================================================
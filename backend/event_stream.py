@@ -0,0 +1,101 @@
+"""
+데이터 버전 변경 push 채널 (Server-Sent Events)
+
+대시보드가 Cache-Control TTL까지 기다리지 않고 새 데이터가 들어온 직후 바뀐 패널만 다시 받도록:
+  - watcher 스레드가 버전 이벤트를 publish → call_soon_threadsafe로 이벤트 루프에 넘김
+  - 연결마다 코루틴 하나 + 작은 구독 객체 하나 (스레드풀 워커를 잡지 않음 — 유휴 연결 수천 개 가능)
+  - 느린 연결에 이벤트가 쌓이면 큐 대신 하나로 합침 (최신 버전 + 바뀐 패널 합집합)
+  - 이벤트 없이 heartbeat 간격이 지나면 주석 줄(": ping")로 연결 유지
+  - 재연결 시 Last-Event-ID(버전 토큰)가 현재와 다르면 첫 이벤트로 전체 패널을 알림
+"""
+import asyncio
+from typing import AsyncIterator, Optional
+
+from fast_json import dumps_bytes
+
+
+def format_event(event: dict, name: str = "version") -> bytes:
+    """SSE 메시지 바이트 (id = 버전 토큰)"""
+    head = f"id: {event['token']}\n" if event.get("token") else ""
+    return f"{head}event: {name}\ndata: ".encode() + dumps_bytes(event) + b"\n\n"
+
+
+class _Subscriber:
+    """연결 하나의 대기 중 이벤트 (최대 하나 — 쌓이면 합침)"""
+
+    __slots__ = ("pending", "ready")
+
+    def __init__(self):
+        self.pending: Optional[dict] = None
+        self.ready = asyncio.Event()
+
+    def push(self, event: dict) -> None:
+        if self.pending is not None:
+            panels = sorted(set(self.pending["panels"]) | set(event["panels"]))
+            event = {**event, "panels": panels}
+        self.pending = event
+        self.ready.set()
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        """다음 이벤트 (timeout 동안 없으면 None)"""
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self.ready.clear()
+        event, self.pending = self.pending, None
+        return event
+
+
+class EventBroker:
+    """버전 이벤트를 모든 SSE 연결에 전달 (구독자 관리는 이벤트 루프 스레드에서만)"""
+
+    def __init__(self, heartbeat: float = 15.0, max_clients: int = 10000, retry_ms: int = 5000):
+        self.heartbeat = heartbeat
+        self.max_clients = max_clients
+        self.retry_ms = retry_ms
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: set[_Subscriber] = set()
+        self.published = 0
+        self.connections = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """이벤트를 전달할 루프 (lifespan 시작 시)"""
+        self._loop = loop
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_clients
+
+    def publish(self, event: dict) -> None:
+        """어느 스레드에서나 호출 가능 — 루프가 없으면(서버 밖) 무시"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._broadcast, event)
+
+    def _broadcast(self, event: dict) -> None:
+        self.published += 1
+        for subscriber in self._subscribers:
+            subscriber.push(event)
+
+    async def stream(self, initial: dict) -> AsyncIterator[bytes]:
+        """SSE 본문 — 첫 이벤트(initial) 후 버전 이벤트 / heartbeat (연결이 끊기면 취소됨)"""
+        subscriber = _Subscriber()
+        self._subscribers.add(subscriber)
+        self.connections += 1
+        try:
+            yield f"retry: {self.retry_ms}\n".encode() + format_event(initial)
+            while True:
+                event = await subscriber.next(self.heartbeat)
+                yield b": ping\n\n" if event is None else format_event(event)
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self._subscribers),
+            "max_clients": self.max_clients,
+            "connections": self.connections,
+            "published": self.published,
+        }
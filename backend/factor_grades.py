@@ -0,0 +1,114 @@
+"""
+팩터 등급 엔진 (NumPy) — 전 종목 × 전 날짜 일괄 계산
+
+value_s / quality_s / growth_s / momentum_s 각각:
+  - 날짜(그룹)별로 점수 내림차순 순위 → 백분위 = 순위 / 그룹 크기 (0이 최고)
+  - 동점은 파일 내 순서 유지 (compute_factor_grades의 안정 정렬과 동일)
+  - 결측 점수는 0으로 취급 (s.get(k, 0) or 0 과 동일)
+  - 백분위 → 등급 경계는 _percentile_to_grade와 동일 (A+ < 10%, A < 20%, B+ < 30%, B < 50%, C < 70%, D)
+
+날짜별 정렬을 따로 하지 않고 (날짜, -점수, 파일 내 위치) lexsort 한 번으로 전체를 처리.
+"""
+from typing import Optional
+
+import numpy as np
+
+from rank_index import FACTOR_COLUMNS, RankIndex
+
+GRADES = ("A+", "A", "B+", "B", "C", "D")
+GRADE_CUTOFFS = np.array([0.10, 0.20, 0.30, 0.50, 0.70])
+FACTOR_NAMES = {"value_s": "value", "quality_s": "quality", "growth_s": "growth", "momentum_s": "momentum"}
+
+
+def grade_codes(values: np.ndarray, groups: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """
+    그룹별 내림차순 순위 백분위 → 등급 코드 (GRADES 인덱스, 0=A+ … 5=D)
+
+    values: 점수 (1차원, 결측은 미리 0으로), groups: 그룹 id, order: 동점 시 순서
+    """
+    n = len(values)
+    if n == 0:
+        return np.empty(0, dtype=np.int8)
+    idx = np.lexsort((order, -values, groups))
+    g = groups[idx]
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    sizes = np.diff(np.r_[starts, n])
+    rank = np.arange(n) - np.repeat(starts, sizes)
+    percentile = rank / np.repeat(sizes, sizes)
+    codes = np.empty(n, dtype=np.int8)
+    codes[idx] = np.searchsorted(GRADE_CUTOFFS, percentile, side="right")
+    return codes
+
+
+def _scores(values: np.ndarray) -> np.ndarray:
+    """결측(NaN) → 0"""
+    return np.where(np.isnan(values), 0.0, values)
+
+
+class FactorGradeTable:
+    """
+    종목 × 날짜 팩터 등급 (int8 코드, 대상이 아니면 -1)
+
+    universe: top_n=None이면 그날 파일의 전 종목, 숫자면 그날 composite_rank ≤ top_n 종목끼리 비교
+    생성 시점 인덱스의 종목/날짜 목록을 복사해 두므로 이후 인덱스가 바뀌어도 그대로 유효
+    """
+
+    def __init__(self, tickers: list[str], dates: list[str], codes: dict[str, np.ndarray], top_n: Optional[int]):
+        self.tickers = tickers
+        self.dates = dates
+        self.codes = codes  # {"value": int8[tickers, dates], ...}
+        self.top_n = top_n
+        self.row_of = {t: i for i, t in enumerate(tickers)}
+        self.col_of = {d: i for i, d in enumerate(dates)}
+        self.member = codes["value"] >= 0
+
+    @classmethod
+    def build(cls, index: RankIndex, top_n: Optional[int] = None) -> "FactorGradeTable":
+        mask = index.top_mask(top_n) if top_n else index.mask()
+        cols, rows = np.nonzero(mask.T)  # 날짜 순으로 — 인덱스 배열은 날짜 우선 배치라 모을 때 연속으로 읽음
+        order = index.pos[rows, cols]
+        shape = (index.n_tickers, index.n_dates)
+        codes = {}
+        for factor in FACTOR_COLUMNS:
+            table = np.full(shape, -1, dtype=np.int8)
+            table[rows, cols] = grade_codes(_scores(index.col(factor)[rows, cols]), cols, order)
+            codes[FACTOR_NAMES[factor]] = table
+        return cls(list(index.tickers), list(index.dates), codes, top_n)
+
+    def _grades_at(self, row: int, col: int) -> dict:
+        return {name: GRADES[table[row, col]] for name, table in self.codes.items()}
+
+    def history(self, ticker: str) -> Optional[list[dict]]:
+        """종목의 날짜별 등급 (오래된 순) — 한 번도 대상이 아니었으면 None"""
+        row = self.row_of.get(ticker)
+        if row is None:
+            return None
+        cols = np.flatnonzero(self.member[row])
+        if len(cols) == 0:
+            return None
+        return [{"date": self.dates[c], **self._grades_at(row, c)} for c in cols]
+
+    def grades_on(self, date: str) -> Optional[dict]:
+        """{ticker: {"value": "A+", ...}} — compute_factor_grades와 같은 모양"""
+        col = self.col_of.get(date)
+        if col is None:
+            return None
+        rows = np.flatnonzero(self.member[:, col])
+        return {self.tickers[r]: self._grades_at(r, col) for r in rows}
+
+    def distribution(self, date: str) -> Optional[dict]:
+        """날짜의 팩터별 등급 분포"""
+        col = self.col_of.get(date)
+        if col is None:
+            return None
+        member = self.member[:, col]
+        factors = {}
+        for name, table in self.codes.items():
+            counts = np.bincount(table[member, col], minlength=len(GRADES))
+            factors[name] = {grade: int(c) for grade, c in zip(GRADES, counts)}
+        return {
+            "date": date,
+            "top_n": self.top_n,
+            "count": int(member.sum()),
+            "factors": factors,
+        }
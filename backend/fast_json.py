@@ -0,0 +1,63 @@
+"""
+data_loader 출력 전용 고속 JSON 응답
+
+data_loader 함수들의 반환값은 이미 JSON 기본 타입(str/int/float/None/list/dict)뿐이라
+FastAPI의 jsonable_encoder 순회가 필요 없음.
+엔드포인트에서 FastJSONResponse(data)를 직접 반환하면 검증·인코딩 순회 없이 바로 직렬화.
+
+- orjson 설치 시 orjson, 없으면 표준 json (JSONResponse와 같은 compact 형식)
+- NaN/Infinity는 null로 직렬화 (orjson과 동작 통일)
+"""
+import json
+import math
+import time
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from metrics import STAGE_SECONDS
+
+try:
+    import orjson  # 선택 의존성
+except ImportError:
+    orjson = None
+
+_serialize = STAGE_SECONDS.labels("serialize")
+
+
+def _nan_to_none(obj: Any) -> Any:
+    """표준 json fallback용 — NaN/Infinity → None"""
+    if isinstance(obj, float):
+        return None if math.isnan(obj) or math.isinf(obj) else obj
+    if isinstance(obj, dict):
+        return {k: _nan_to_none(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_nan_to_none(v) for v in obj]
+    return obj
+
+
+def dumps_bytes(content: Any) -> bytes:
+    """JSON 기본 타입으로만 이루어진 값 → UTF-8 JSON 바이트 (직렬화 시간은 stage="serialize")"""
+    start = time.perf_counter()
+    try:
+        return _dumps_bytes(content)
+    finally:
+        _serialize.observe(time.perf_counter() - start)
+
+
+def _dumps_bytes(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    try:
+        text = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    except ValueError:
+        # NaN이 섞인 원본 ranking JSON (드묾) — 정리 후 다시 직렬화
+        text = json.dumps(_nan_to_none(content), ensure_ascii=False, separators=(",", ":"))
+    return text.encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """jsonable_encoder를 거치지 않는 JSON 응답 (엔드포인트에서 직접 생성해 반환)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -0,0 +1,120 @@
+"""
+파일 파싱 결과 캐시 — (mtime, size)로 유효성을 검증하는 LRU 캐시
+
+- 키: 파일 경로 / 검증값: (st_mtime_ns, st_size)
+- 상류 퀀트 작업이 파일을 다시 쓰면 stat이 달라져 자동으로 다시 로드
+- 최대 항목 수 / 최대 바이트(파일 크기 기준) 초과 시 가장 오래 안 쓴 항목부터 제거
+- hit / miss / eviction 카운터 제공
+- 같은 파일을 동시에 여러 스레드가 miss 하면 파싱은 한 번만 (single-flight)
+"""
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from single_flight import SingleFlight
+
+
+class FileCache:
+    """경로별 파싱 결과를 보관하는 스레드 안전 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 256 * 1024 * 1024,
+                 flight: Optional[SingleFlight] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple[tuple[int, int], Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._flight = flight or SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: Union[str, Path], loader: Callable[[Path], Any]) -> Optional[Any]:
+        """
+        캐시된 파싱 결과 반환, 없거나 파일이 바뀌었으면 loader(path)로 다시 로드
+
+        - 파일이 없으면 None (캐시 항목도 제거)
+        - loader 예외는 그대로 전파 (캐시에 저장하지 않음)
+        """
+        key = str(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            self.invalidate(key)
+            return None
+        sig = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == sig:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # 파싱은 락 밖에서 (느린 I/O가 다른 경로 조회를 막지 않도록)
+        # 같은 파일·같은 stat을 동시에 요청한 스레드는 한 번의 파싱 결과를 공유
+        value = self._flight.do((key, sig), lambda: loader(Path(key)))
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[2]
+            if st.st_size <= self.max_bytes:
+                self._entries[key] = (sig, value, st.st_size)
+                self._total_bytes += st.st_size
+                self._evict()
+        return value
+
+    def peek(self, path: Union[str, Path]) -> Optional[Any]:
+        """이미 캐시돼 있고 파일이 그대로일 때만 반환 (로드하지 않음, 카운터 변화 없음)"""
+        key = str(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == (st.st_mtime_ns, st.st_size):
+                return entry[1]
+        return None
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """특정 경로 항목 제거"""
+        with self._lock:
+            old = self._entries.pop(str(path), None)
+            if old is not None:
+                self._total_bytes -= old[2]
+
+    def clear(self) -> None:
+        """전체 비우기 (카운터는 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        """캐시 상태 / 적중률"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+                "coalesced": self._flight.coalesced,
+            }
+
+    def _evict(self) -> None:
+        """LRU 제거 — 호출자가 락을 잡고 있어야 함"""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
@@ -2,25 +2,96 @@
 퀀트 대시보드 API 서버 v2.0
 - quant_py-main의 ranking JSON / web_data JSON / credit_monitor를 읽어서 REST API로 제공
 - 시장 지표, 파이프라인, AI 분석 엔드포인트 추가
+- 시작 시 state/ 감시 스레드 가동 (새 파일만 증분 적재)
+- /api/stream: 새 데이터 버전을 SSE로 push (대시보드는 바뀐 패널만 다시 받음)
+- /metrics: Prometheus 텍스트 형식 메트릭 (라우트별 지연, 적재 단계, 캐시, compute_* 시간)
+- 시작 시 warm-up 스레드가 인덱스·파생 데이터를 미리 적재 (/api/health/ready는 끝날 때까지 503)
 """
-from fastapi import FastAPI, HTTPException, Request, Response
+import asyncio
+import hashlib
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.routing import Match
+
+from event_stream import EventBroker
+from fast_json import FastJSONResponse
+from metrics import REGISTRY, MetricsMiddleware
+from response_store import ResponseStore, negotiate_encoding
 
 from data_loader import (
     get_available_dates,
     load_ranking,
     load_latest_ranking,
+    query_ranking,
     compute_picks,
+    compute_picks_history,
+    resolve_pick_weights,
     compute_death_list,
+    compute_rank_diff,
+    compute_deathlist_history,
     get_ranking_history,
     get_all_history,
     # v2.0 추가
     get_market_data,
     compute_pipeline_status,
     get_ai_data,
+    get_grade_history,
+    get_grade_distribution,
+    build_dashboard,
+    get_file_cache_stats,
+    get_market_live_state,
+    get_quarantine,
+    get_single_flight_stats,
+    get_data_version,
+    get_data_token,
+    add_version_listener,
+    remove_version_listener,
+    version_event,
+    get_market_token,
+    get_warmup_state,
+    is_ready,
+    start_warmup,
+    start_watcher,
+    stop_market_refresher,
+    stop_watcher,
 )
 
-app = FastAPI(title="Quant Dashboard API", version="2.0.0")
+
+# 쿼리 파라미터 상한 — 파생 데이터 메모 키가 되므로 값의 범위를 제한
+MAX_TOP_N = 500
+MAX_PICKS = 50
+
+# 새 데이터 버전 push (SSE) — 연결은 이벤트 루프에서만 처리
+event_broker = EventBroker(
+    heartbeat=float(os.environ.get("STREAM_HEARTBEAT", "15")),
+    max_clients=int(os.environ.get("STREAM_MAX_CLIENTS", "10000")),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    event_broker.bind(asyncio.get_running_loop())
+    add_version_listener(event_broker.publish)
+    start_watcher()
+    start_warmup()
+    yield
+    remove_version_listener(event_broker.publish)
+    stop_watcher()
+    stop_market_refresher()
+
+
+app = FastAPI(title="Quant Dashboard API", version="2.0.0", lifespan=lifespan)
+
+# 핫 엔드포인트(rankings/latest, history, picks) 응답 바이트 저장소
+response_store = ResponseStore(
+    max_entries=int(os.environ.get("RESPONSE_STORE_MAX_ENTRIES", "512")),
+    max_bytes=int(os.environ.get("RESPONSE_STORE_MAX_BYTES", str(128 * 1024 * 1024))),
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -35,90 +106,298 @@ app.add_middleware(
 
 
 # ============================================================
-# Cache-Control 미들웨어
+# Cache-Control / ETag 미들웨어
 # ============================================================
 
 # 정적(변동 적은) 데이터: 1시간 캐시
 STATIC_PATHS = {"/api/market", "/api/ai", "/api/pipeline"}
 # 동적 데이터: 5분 캐시
-DYNAMIC_PATHS = {"/api/picks", "/api/deathlist", "/api/rankings/latest"}
+DYNAMIC_PATHS = {"/api/picks", "/api/deathlist", "/api/rankings/latest", "/api/dashboard"}
+# ETag 제외 (상태 확인용)
+ETAG_EXEMPT_PATHS = {"/api/health", "/api/health/live", "/api/health/ready", "/api/stream"}
+# 실시간 시장 데이터가 섞일 수 있는 경로
+MARKET_PATHS = {"/api/market", "/api/dashboard"}
+
+
+def _cache_control_for(path: str) -> Optional[str]:
+    if path in STATIC_PATHS:
+        return "public, max-age=3600"
+    if path in DYNAMIC_PATHS or path.startswith("/api/rankings/"):
+        return "public, max-age=300"
+    if path.startswith("/api/history"):
+        return "public, max-age=1800"
+    return None
+
+
+def _etag_for(request: Request) -> Optional[str]:
+    """
+    데이터 토큰 + 경로 + 쿼리로 만든 strong ETag
+
+    같은 파일 상태에서 같은 요청이면 응답 본문도 같으므로 본문을 만들기 전에 계산 가능
+    """
+    path = request.url.path
+    if request.method != "GET" or not path.startswith("/api/") or path in ETAG_EXEMPT_PATHS:
+        return None
+    parts = [get_data_token(), path, str(request.url.query)]
+    if path in MARKET_PATHS:
+        market_token = get_market_token()
+        if market_token is None:
+            return None
+        parts.append(market_token)
+    return '"' + hashlib.sha1("|".join(parts).encode()).hexdigest()[:20] + '"'
+
+
+def _encoded_etag(etag: str, encoding: str) -> str:
+    """압축본은 표현이 다르므로 인코딩별로 다른 strong ETag"""
+    if encoding == "identity":
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _etag_matches(if_none_match: str, etags: tuple[str, ...]) -> bool:
+    """If-None-Match 비교 (weak 비교 — W/ 접두사 무시)"""
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in etags:
+            return True
+    return False
+
+
+def _match_route(scope: dict) -> None:
+    """
+    라우팅 전에 응답하는 경우(304) scope["route"]를 직접 채움
+
+    라우터까지 가지 않으면 MetricsMiddleware가 라우트 템플릿을 알 수 없어 "unmatched"로 기록되므로
+    """
+    for route in app.router.routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            scope.update(child_scope)
+            return
 
 
 @app.middleware("http")
 async def add_cache_headers(request: Request, call_next):
-    response: Response = await call_next(request)
     path = request.url.path
+    cache_control = _cache_control_for(path)
+    etag = _etag_for(request)
+
+    # 변경 없음 → 데이터 로드 없이 304
+    if etag is not None:
+        if_none_match = request.headers.get("if-none-match")
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        candidates = (etag, _encoded_etag(etag, encoding))
+        if if_none_match and _etag_matches(if_none_match, candidates):
+            headers = {"ETag": candidates[1]}
+            if cache_control:
+                headers["Cache-Control"] = cache_control
+            _match_route(request.scope)
+            return Response(status_code=304, headers=headers)
 
-    if path in STATIC_PATHS:
-        response.headers["Cache-Control"] = "public, max-age=3600"
-    elif path in DYNAMIC_PATHS or path.startswith("/api/rankings/"):
-        response.headers["Cache-Control"] = "public, max-age=300"
-    elif path.startswith("/api/history"):
-        response.headers["Cache-Control"] = "public, max-age=1800"
+    response: Response = await call_next(request)
+
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    if etag is not None and response.status_code == 200:
+        encoding = response.headers.get("content-encoding", "identity")
+        response.headers["ETag"] = _encoded_etag(etag, encoding)
 
     return response
 
 
+# 가장 바깥 미들웨어 — 캐시 헤더·304 처리까지 포함한 라우트별 지연 (스트림 연결 제외)
+app.add_middleware(MetricsMiddleware, exclude=("/api/stream", "/metrics"))
+
+
+def _collect_server_metrics():
+    """/metrics 수집 시점 — 응답 저장소 / SSE 연결"""
+    store = response_store.stats()
+    yield ("quant_response_store_requests_total", "counter", "응답 바이트 저장소 조회 수",
+           [({"result": "hit"}, store["hits"]), ({"result": "miss"}, store["misses"])])
+    yield ("quant_response_store_hit_ratio", "gauge", "응답 바이트 저장소 적중률", [({}, store["hit_ratio"])])
+    yield ("quant_response_store_bytes", "gauge", "저장된 응답 크기 (원본 JSON 기준)", [({}, store["bytes"])])
+    stream = event_broker.stats()
+    yield ("quant_stream_clients", "gauge", "연결 중인 SSE 클라이언트 수", [({}, stream["clients"])])
+    yield ("quant_stream_events_total", "counter", "발행한 버전 이벤트 수", [({}, stream["published"])])
+
+
+REGISTRY.add_collector(_collect_server_metrics)
+
+
 # ============================================================
 # 기존 엔드포인트 (유지)
 # ============================================================
 
-@app.get("/api/dates")
+@app.get("/api/dates", response_class=FastJSONResponse)
 def api_dates():
     """사용 가능한 날짜 목록"""
-    return {"dates": get_available_dates()}
+    return FastJSONResponse({"dates": get_available_dates()})
+
+
+def _ranking_query(
+    fields: Optional[str] = Query(None, description="쉼표 구분 필드 목록, 예: ticker,name,composite_rank"),
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    offset: int = Query(0, ge=0),
+    sector: Optional[str] = None,
+    max_rank: Optional[int] = Query(None, ge=1),
+) -> Optional[tuple]:
+    """ranking 부분 조회 파라미터 → query_ranking 인자 튜플 (하나도 없으면 None = 전체 파일)"""
+    names = tuple(f.strip() for f in fields.split(",") if f.strip()) if fields else None
+    if names is None and limit is None and not offset and sector is None and max_rank is None:
+        return None
+    return names, limit, offset, sector, max_rank
 
 
 @app.get("/api/rankings/latest")
-def api_latest_ranking():
-    """최신 순위"""
-    data = load_latest_ranking()
-    if not data:
-        raise HTTPException(404, "순위 데이터 없음")
-    return data
+def api_latest_ranking(request: Request, query: Optional[tuple] = Depends(_ranking_query)):
+    """
+    최신 순위
+
+    ?fields=&limit=&offset=&sector=&max_rank= 를 주면 부분 조회 (응답에 page 포함)
+    """
+    if query is None:
+        return response_store.respond(
+            request, ("rankings/latest",), get_data_token(), load_latest_ranking, "순위 데이터 없음"
+        )
+    return response_store.respond(
+        request, ("rankings/latest", *query), get_data_token(),
+        lambda: query_ranking("latest", *query), "순위 데이터 없음",
+    )
+
+
+@app.get("/api/rankings/diff")
+def api_ranking_diff(
+    request: Request,
+    from_date: str = Query(..., alias="from", pattern=r"^\d{8}$"),
+    to_date: str = Query(..., alias="to", pattern=r"^\d{8}$"),
+    top_n: int = Query(30, ge=1, le=MAX_TOP_N),
+    min_score_change: float = Query(0.01, ge=0),
+):
+    """
+    두 날짜 간 순위 변동 — composite_rank / score(|변화| ≥ min_score_change) / Top N 소속이 바뀐 종목만
+
+    ({date} 라우트보다 먼저 선언해야 "diff"가 날짜로 잡히지 않음)
+    """
+    return response_store.respond(
+        request, ("rankings/diff", from_date, to_date, top_n, min_score_change), get_data_token(),
+        lambda: compute_rank_diff(from_date, to_date, top_n, min_score_change),
+        f"{from_date} / {to_date} 데이터 없음",
+    )
 
 
 @app.get("/api/rankings/{date}")
-def api_ranking_by_date(date: str):
-    """특정 날짜 순위"""
-    data = load_ranking(date)
-    if not data:
-        raise HTTPException(404, f"{date} 데이터 없음")
-    return data
+def api_ranking_by_date(date: str, request: Request, query: Optional[tuple] = Depends(_ranking_query)):
+    """특정 날짜 순위 (부분 조회 파라미터는 /api/rankings/latest와 동일)"""
+    if query is None:
+        data = load_ranking(date)
+        if not data:
+            raise HTTPException(404, f"{date} 데이터 없음")
+        return FastJSONResponse(data)
+    return response_store.respond(
+        request, ("rankings", date, *query), get_data_token(),
+        lambda: query_ranking(date, *query), f"{date} 데이터 없음",
+    )
 
 
 @app.get("/api/picks")
-def api_picks():
-    """3일 교집합 최종 추천 — Enhanced with factor_grades, roe, fwd_per, weight, buy_rationale"""
-    return compute_picks()
+def api_picks(
+    request: Request,
+    n_days: int = Query(3, ge=1, le=60),
+    top_n: int = Query(30, ge=1, le=MAX_TOP_N),
+    max_picks: int = Query(5, ge=1, le=MAX_PICKS),
+    weights: Optional[str] = Query(None, description="T-0부터 쉼표 구분 가중치, 예: 0.5,0.3,0.2"),
+):
+    """
+    n일 교집합 최종 추천 — Enhanced with factor_grades, roe, fwd_per, weight, buy_rationale
 
+    파라미터를 바꿔 what-if 조회 가능 (기본: 3일, Top 30, 5종목, 0.5/0.3/0.2)
+    """
+    try:
+        parsed = resolve_pick_weights(
+            n_days, tuple(float(w) for w in weights.split(",")) if weights else None
+        )
+    except ValueError as e:
+        raise HTTPException(422, f"weights 오류: {e}")
+    return response_store.respond(
+        request, ("picks", n_days, top_n, max_picks, parsed), get_data_token(),
+        lambda: compute_picks(n_days, top_n, max_picks, parsed),
+    )
+
+
+@app.get("/api/picks/history")
+def api_picks_history(
+    request: Request,
+    top_n: int = Query(30, ge=1, le=MAX_TOP_N),
+    max_picks: int = Query(5, ge=1, le=MAX_PICKS),
+):
+    """
+    전 날짜 picks 백테스트 — 날짜별 picks + 추가/제외 종목 + turnover
 
-@app.get("/api/deathlist")
+    Response:
+    {
+        "dates": [...],
+        "history": [{"date": "20260219", "picks": [...], "total_common": 8,
+                     "added": [...], "removed": [...], "turnover": 0.2}],
+        "avg_turnover": 0.23
+    }
+    """
+    return response_store.respond(
+        request, ("picks/history", top_n, max_picks), get_data_token(),
+        lambda: compute_picks_history(top_n, max_picks),
+    )
+
+
+@app.get("/api/deathlist", response_class=FastJSONResponse)
 def api_death_list():
     """Death List (이탈 종목) — Enhanced with exit_reason tags"""
-    return compute_death_list()
+    return FastJSONResponse(compute_death_list())
+
+
+@app.get("/api/deathlist/history")
+def api_death_list_history(request: Request, top_n: int = Query(50, ge=1, le=MAX_TOP_N)):
+    """
+    연속된 모든 날짜 쌍의 Death List — 이탈 빈도·사유 추이 분석용
+
+    Response:
+    {
+        "top_n": 50,
+        "history": [{"dates": {"yesterday": "...", "today": "..."}, "death_list": [...]}],
+        "summary": {"days": 120, "total_exits": 900, "dropped_out": 12, "reasons": {"📉가격↓": 300, ...}}
+    }
+    """
+    return response_store.respond(
+        request, ("deathlist/history", top_n), get_data_token(),
+        lambda: compute_deathlist_history(top_n),
+    )
 
 
 @app.get("/api/history/{ticker}")
-def api_stock_history(ticker: str):
+def api_stock_history(ticker: str, request: Request):
     """특정 종목의 순위 히스토리"""
-    history = get_ranking_history(ticker)
-    if not history:
-        raise HTTPException(404, f"{ticker} 히스토리 없음")
-    return {"ticker": ticker, "history": history}
+    def build():
+        history = get_ranking_history(ticker)
+        return {"ticker": ticker, "history": history} if history else None
+
+    return response_store.respond(
+        request, ("history", ticker), get_data_token(), build, f"{ticker} 히스토리 없음"
+    )
 
 
 @app.get("/api/history")
-def api_all_history():
+def api_all_history(request: Request):
     """전체 Top 30 종목 순위 히스토리"""
-    return get_all_history()
+    return response_store.respond(request, ("history",), get_data_token(), get_all_history)
 
 
 # ============================================================
 # 새 엔드포인트 (v2.0)
 # ============================================================
 
-@app.get("/api/market")
+@app.get("/api/market", response_class=FastJSONResponse)
 def api_market():
     """
     시장 지표 — 인덱스(KOSPI/KOSDAQ) + 신용시장(HY/KR/VIX) + 행동 등급
@@ -132,12 +411,12 @@ def api_market():
     }
     """
     try:
-        return get_market_data()
+        return FastJSONResponse(get_market_data())
     except Exception as e:
         raise HTTPException(500, f"시장 데이터 로드 실패: {str(e)}")
 
 
-@app.get("/api/pipeline")
+@app.get("/api/pipeline", response_class=FastJSONResponse)
 def api_pipeline():
     """
     파이프라인 상태 — Top 30 종목의 연속 진입 상태
@@ -151,12 +430,12 @@ def api_pipeline():
     }
     """
     try:
-        return compute_pipeline_status()
+        return FastJSONResponse(compute_pipeline_status())
     except Exception as e:
         raise HTTPException(500, f"파이프라인 데이터 로드 실패: {str(e)}")
 
 
-@app.get("/api/ai")
+@app.get("/api/ai", response_class=FastJSONResponse)
 def api_ai():
     """
     AI 분석 결과 (캐시)
@@ -170,32 +449,140 @@ def api_ai():
     }
     """
     try:
-        return get_ai_data()
+        return FastJSONResponse(get_ai_data())
     except Exception as e:
         raise HTTPException(500, f"AI 데이터 로드 실패: {str(e)}")
 
 
+@app.get("/api/grades/history/{ticker}", response_class=FastJSONResponse)
+def api_grade_history(ticker: str, top_n: Optional[int] = Query(None, ge=1, le=MAX_TOP_N)):
+    """
+    종목의 날짜별 팩터 등급 (A+~D)
+
+    top_n 생략 시 그날 전 종목 대비, 지정 시 그날 Top N 안에서의 등급 (Top N에 든 날만)
+    """
+    history = get_grade_history(ticker, top_n)
+    if not history:
+        raise HTTPException(404, f"{ticker} 등급 히스토리 없음")
+    return FastJSONResponse({"ticker": ticker, "top_n": top_n, "history": history})
+
+
+@app.get("/api/grades/distribution/{date}", response_class=FastJSONResponse)
+def api_grade_distribution(date: str, top_n: Optional[int] = Query(None, ge=1, le=MAX_TOP_N)):
+    """
+    날짜의 팩터별 등급 분포 (date=latest 가능)
+
+    Response:
+    {
+        "date": "20260219", "top_n": null, "count": 2500,
+        "factors": {"value": {"A+": 250, "A": 250, ...}, "quality": {...}, ...}
+    }
+    """
+    data = get_grade_distribution(date, top_n)
+    if data is None:
+        raise HTTPException(404, f"{date} 데이터 없음")
+    return FastJSONResponse(data)
+
+
+@app.get("/api/dashboard", response_class=FastJSONResponse)
+def api_dashboard():
+    """
+    대시보드 일괄 조회 — 6개 패널을 하나의 데이터 스냅샷에서 생성 (요청 1회)
+
+    Response:
+    {
+        "date": "20260219",
+        "data_version": "...",
+        "ranking": {...},      # /api/rankings/latest
+        "picks": {...},        # /api/picks
+        "deathlist": {...},    # /api/deathlist
+        "market": {...},       # /api/market (실패 시 null)
+        "pipeline": {...},     # /api/pipeline (실패 시 null)
+        "ai": {...}            # /api/ai (실패 시 null)
+    }
+    """
+    return FastJSONResponse(build_dashboard())
+
+
+# ============================================================
+# 데이터 버전 push (SSE)
+# ============================================================
+
+@app.get("/api/stream")
+async def api_stream(request: Request):
+    """
+    새 데이터 버전 알림 (text/event-stream)
+
+    event: version
+    data: {"token": "...", "date": "20260219", "web_date": "20260219", "panels": ["ranking", "picks", ...]}
+
+    - 연결 직후 현재 버전을 한 번 보냄 (Last-Event-ID가 현재 토큰과 같으면 panels = [])
+    - 이후 새 버전의 파생 데이터 계산이 끝날 때마다 바뀐 패널과 함께 보냄
+    - async def — 스레드풀 워커를 쓰지 않음 (데이터 로드는 watcher 스레드가 함)
+    """
+    if event_broker.full:
+        raise HTTPException(503, "스트림 연결 수 초과")
+    version = get_data_version()
+    initial = version_event(version)
+    if version is not None and request.headers.get("last-event-id") == version.token:
+        initial["panels"] = []
+    return StreamingResponse(
+        event_broker.stream(initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================
+# Metrics
+# ============================================================
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # ============================================================
 # Health check
 # ============================================================
 
+@app.get("/api/health/live")
+def api_health_live():
+    """liveness — 프로세스가 요청을 받을 수 있으면 200 (warm-up 중에도)"""
+    return {"status": "ok"}
+
+
+@app.get("/api/health/ready")
+def api_health_ready():
+    """readiness — warm-up(인덱스·파생 데이터 적재)이 끝나기 전에는 503"""
+    warmup = get_warmup_state()
+    ready = is_ready()
+    return JSONResponse(
+        {"status": "ready" if ready else "warming_up", "warmup": warmup},
+        status_code=200 if ready else 503,
+    )
+
+
 @app.get("/api/health")
 def api_health():
-    """서버 상태 확인"""
-    dates = get_available_dates()
-    cache_available = False
-    try:
-        from data_loader import load_web_cache
-        cache_available = load_web_cache() is not None
-    except Exception:
-        pass
-
+    """서버 상태 확인 — 메모리 상태만 읽음 (glob / 파일 파싱 없음, 짧은 주기 probe 가능)"""
+    data_version = get_data_version()
     return {
         "status": "ok",
+        "ready": is_ready(),
         "version": "2.0.0",
-        "ranking_dates": len(dates),
-        "latest_date": dates[0] if dates else None,
-        "web_cache_available": cache_available,
+        "data_version": data_version.token if data_version else None,
+        "ranking_dates": len(data_version.ranking_dates) if data_version else 0,
+        "latest_date": data_version.latest_date if data_version else None,
+        "web_cache_available": bool(data_version and data_version.web_dates),
+        "warmup": get_warmup_state(),
+        "file_cache": get_file_cache_stats(),
+        "response_store": response_store.stats(),
+        "single_flight": get_single_flight_stats(),
+        "market_live": get_market_live_state(),
+        "quarantine": get_quarantine(),
+        "stream": event_broker.stats(),
     }
 
 
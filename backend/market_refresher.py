@@ -0,0 +1,172 @@
+"""
+실시간 수집(credit_monitor) 백그라운드 갱신 — stale-while-revalidate
+
+web_data 캐시가 없을 때 /api/market 요청 스레드가 credit_monitor를 직접 부르면
+느린 상류 한 번에 모든 요청이 같이 멈춤. 대신:
+  - 백그라운드 스레드가 주기적으로 수집, 요청은 마지막 성공 결과를 즉시 받음 (수집 시각 포함)
+  - 수집 한 번에 hard timeout — 넘기면 실패로 처리하고 기다리지 않음
+    (파이썬 스레드는 강제 종료가 안 되므로 멈춘 수집이 끝날 때까지 새 수집은 시작하지 않음)
+  - 연속 실패가 쌓이면 circuit open → cooldown 동안 수집 중단, 이후 한 번 시도(half-open)
+"""
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+
+class LiveSnapshot(NamedTuple):
+    """마지막 성공 수집 결과"""
+    value: Any
+    fetched_at: float  # time.time()
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class LiveRefresher:
+    """fetch()를 백그라운드에서 주기적으로 실행하고 마지막 성공 결과를 보관"""
+
+    def __init__(
+        self,
+        fetch: Callable[[], Any],
+        interval: float = 300.0,
+        timeout: float = 20.0,
+        failure_threshold: int = 3,
+        cooldown: float = 600.0,
+        name: str = "live-refresher",
+    ):
+        self.fetch = fetch
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.name = name
+        self._snapshot: Optional[LiveSnapshot] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running: Optional[threading.Thread] = None  # 진행 중(또는 timeout 후 멈춘) 수집
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.attempts = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.last_error: Optional[str] = None
+        self.last_attempt_at: Optional[float] = None
+
+    # ------------------------------------------------------------
+    # 요청 스레드용
+    # ------------------------------------------------------------
+
+    def latest(self) -> Optional[LiveSnapshot]:
+        """마지막 성공 결과 (없으면 None) — 처음 호출 시 백그라운드 스레드 시작"""
+        self.start()
+        return self._snapshot
+
+    @property
+    def circuit(self) -> str:
+        """closed / open / half_open"""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half_open"
+        return "open"
+
+    def state(self) -> dict:
+        """health용 상태"""
+        snap = self._snapshot
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "circuit": self.circuit,
+            "fetched_at": snap.fetched_at if snap else None,
+            "age_seconds": round(snap.age, 1) if snap else None,
+            "attempts": self.attempts,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
+
+    # ------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def wake(self) -> None:
+        """다음 수집을 바로 실행"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh_once()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    # ------------------------------------------------------------
+    # 수집
+    # ------------------------------------------------------------
+
+    def refresh_once(self) -> bool:
+        """수집 한 번 (circuit open이면 건너뜀) — 성공 여부 반환"""
+        if self.circuit == "open":
+            return False
+        if self._running is not None and self._running.is_alive():
+            # 이전 수집이 timeout 후에도 아직 안 끝남 — 겹쳐 쌓지 않음
+            self._record_failure("이전 수집이 아직 진행 중", timed_out=True)
+            return False
+
+        result: dict = {}
+
+        def target():
+            try:
+                result["value"] = self.fetch()
+            except Exception as e:
+                result["error"] = e
+
+        self.attempts += 1
+        self.last_attempt_at = time.time()
+        worker = threading.Thread(target=target, name=f"{self.name}-fetch", daemon=True)
+        self._running = worker
+        worker.start()
+        worker.join(self.timeout)
+
+        if worker.is_alive():
+            self._record_failure(f"timeout ({self.timeout:g}s)", timed_out=True)
+            return False
+        if "error" in result:
+            self._record_failure(f"{type(result['error']).__name__}: {result['error']}")
+            return False
+
+        self._snapshot = LiveSnapshot(result["value"], time.time())
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = None
+        return True
+
+    def _record_failure(self, message: str, timed_out: bool = False) -> None:
+        self.failures += 1
+        self.timeouts += timed_out
+        self.consecutive_failures += 1
+        self.last_error = message
+        if self.consecutive_failures >= self.failure_threshold or self.opened_at is not None:
+            # 임계치 도달 또는 half-open 시도 실패 → (다시) open
+            self.opened_at = time.monotonic()
+        print(f"[{self.name}] 수집 실패: {message} (연속 {self.consecutive_failures}회, circuit {self.circuit})")
@@ -0,0 +1,283 @@
+"""
+Prometheus 텍스트 형식 메트릭 (외부 의존성 없음)
+
+운영에서 켜 둘 수 있도록 기록 경로는 가볍게:
+  - 레이블 조합별 child 객체를 한 번 만들어 두고 재사용 (핫 경로에서 dict 조회 한 번, 새 객체 없음)
+  - child마다 자기 락 (전역 락 없음 — 경합은 같은 레이블을 동시에 기록할 때만)
+  - 히스토그램은 버킷별 개수만 증가 (누적합은 /metrics 렌더링 때 계산)
+  - 캐시 적중률 등 이미 다른 곳에 있는 값은 수집 시점에 콜백으로 읽음 (collector)
+
+사용:
+    LOADS = REGISTRY.counter("quant_files_parsed_total", "파싱한 파일 수", ("kind",))
+    ranking_loads = LOADS.labels("ranking")   # 모듈 로드 시 한 번
+    ranking_loads.inc()
+"""
+import bisect
+import functools
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+# 요청 지연 / 단계별 시간 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# collector 콜백 반환형: [(이름, 타입, 도움말, [(레이블 dict, 값), ...]), ...]
+Samples = Iterable[tuple[str, str, str, list[tuple[dict, float]]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 = +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    def snapshot(self) -> tuple[list[int], float]:
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class _Metric:
+    """레이블 이름이 고정된 메트릭 패밀리 — labels(...)로 child를 얻어 기록"""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """레이블 값 조합의 child (없으면 생성) — 핫 경로에서는 결과를 보관해 두고 재사용"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 레이블 {self.labelnames} 필요, {values} 받음")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _items(self) -> list[tuple[dict, object]]:
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, values)), child) for values, child in items]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        """레이블 없는 카운터용"""
+        self.labels().inc(amount)
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(child.value)}" for labels, child in self._items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """레이블 없는 히스토그램용"""
+        self.labels().observe(value)
+
+    def render(self) -> list[str]:
+        lines = []
+        for labels, child in self._items():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """메트릭 패밀리 + 수집 시점 콜백 모음"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Samples]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing  # 모듈 재로딩 등 — 같은 이름은 같은 패밀리
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], Samples]) -> None:
+        """/metrics 렌더링 때마다 호출 — 다른 모듈의 통계(dict)를 gauge/counter로 변환"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                lines.append(f"# collector 실패: {_escape(e)}")
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    if value is not None:
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# 공용 메트릭 (여러 모듈에서 기록)
+STAGE_SECONDS = REGISTRY.histogram(
+    "quant_stage_seconds", "데이터 적재·직렬화 단계별 소요 시간 (glob/read/json_parse/normalize/...)", ("stage",)
+)
+COMPUTE_SECONDS = REGISTRY.histogram(
+    "quant_compute_seconds", "compute_* 등 파생 데이터 실제 계산 시간 (메모 적중 제외)", ("function",)
+)
+
+
+def timed(child: _HistogramChild):
+    """함수 실행 시간을 child 히스토그램에 기록하는 데코레이터"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 지연 히스토그램 + 상태 코드별 요청 수 (순수 ASGI 미들웨어)
+
+    레이블은 매칭된 라우트 템플릿 (/api/rankings/{date}) — 경로 값마다 시계열이 늘지 않도록.
+    매칭 실패는 "unmatched". exclude 경로(스트림 등 장시간 연결)는 기록하지 않음.
+    """
+
+    def __init__(self, app, exclude: Iterable[str] = (), registry: Optional[Registry] = None):
+        self.app = app
+        self.exclude = frozenset(exclude)
+        registry = registry or REGISTRY
+        self.latency = registry.histogram(
+            "quant_http_request_duration_seconds", "라우트별 요청 처리 시간", ("route",)
+        )
+        self.requests = registry.counter(
+            "quant_http_requests_total", "라우트·상태 코드별 요청 수", ("route", "status")
+        )
+        self._latency_children: dict[str, _HistogramChild] = {}
+        self._status_children: dict[str, dict[int, _CounterChild]] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            name = getattr(route, "path", None) or "unmatched"
+            self._latency(name).observe(elapsed)
+            self._status(name, status).inc()
+
+    def _latency(self, route: str) -> _HistogramChild:
+        child = self._latency_children.get(route)
+        if child is None:
+            child = self._latency_children[route] = self.latency.labels(route)
+        return child
+
+    def _status(self, route: str, status: int) -> _CounterChild:
+        by_status = self._status_children.get(route)
+        if by_status is None:
+            by_status = self._status_children[route] = {}
+        child = by_status.get(status)
+        if child is None:
+            child = by_status[status] = self.requests.labels(route, str(status))
+        return child
@@ -0,0 +1,327 @@
+"""
+종목 × 날짜 순위 행렬 (columnar) 인덱스
+
+ranking_YYYYMMDD.json 전체를 한 번만 읽어 NumPy 배열로 보관:
+  - rank / composite_rank / score / value_s / quality_s / growth_s / momentum_s / price / fwd_per
+  - 각 배열 shape = (종목 수, 날짜 수), 값이 없으면 NaN
+  - 메모리 배치는 날짜 우선 (Fortran order) — 날짜 하나의 열이 연속이라 새 날짜는 끝부분만 씀
+    (컴파일 파일을 copy-on-write로 매핑한 배열도 그대로 쓸 수 있음 — compiled_store)
+  - present: 해당 날짜 파일에 종목이 있었는지 (bool)
+  - pos: 해당 날짜 파일 내 위치 (원본 순서 재현용)
+  - row_of: ticker → 행 번호
+
+새 날짜는 열 하나만 추가 (용량은 2배씩 늘려 amortized O(1))
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# 숫자 컬럼 (모두 float64, 결측 = NaN)
+NUMERIC_COLUMNS = (
+    "rank", "composite_rank", "score", "value_s", "quality_s", "growth_s", "momentum_s", "price", "fwd_per",
+)
+FACTOR_COLUMNS = ("value_s", "quality_s", "growth_s", "momentum_s")
+PRICE_COLUMNS = ("price", "fwd_per")  # Death List 이탈 사유(전망/가격) 계산용
+
+
+def to_float(val) -> float:
+    """JSON 값 → float (None/문자열은 NaN)"""
+    if val is None:
+        return np.nan
+    try:
+        return float(val)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def extract_columns(rankings: list) -> dict[str, np.ndarray]:
+    """ranking 레코드 목록 → 숫자 컬럼 배열 (composite_rank 결측 시 rank로 대체)"""
+    n = len(rankings)
+    values = {c: np.empty(n) for c in NUMERIC_COLUMNS}
+    for i, stock in enumerate(rankings):
+        values["rank"][i] = to_float(stock.get("rank"))
+        values["composite_rank"][i] = to_float(stock.get("composite_rank", stock.get("rank")))
+        values["score"][i] = to_float(stock.get("score", 0))
+        for c in FACTOR_COLUMNS + PRICE_COLUMNS:
+            values[c][i] = to_float(stock.get(c))
+    return values
+
+
+class Fragment(NamedTuple):
+    """날짜 하나의 컬럼 조각 — 파싱 워커가 dict 대신 반환 (pickle 부담 최소화)"""
+    date: str
+    tickers: list[str]
+    names: list[str]
+    sectors: list[str]
+    values: dict[str, np.ndarray]
+
+
+def fragment_from_rankings(date: str, rankings: list) -> Fragment:
+    """ranking 레코드 목록 → Fragment"""
+    return Fragment(
+        date,
+        [s["ticker"] for s in rankings],
+        [s.get("name", "") for s in rankings],
+        [s.get("sector", "") for s in rankings],
+        extract_columns(rankings),
+    )
+
+
+def _opt(val: float) -> Optional[float]:
+    """NaN → None"""
+    return None if val != val else float(val)
+
+
+def _opt_int(val: float) -> Optional[int]:
+    """NaN → None, 나머지는 int"""
+    return None if val != val else int(val)
+
+
+class RankIndex:
+    """종목 × 날짜 순위 행렬"""
+
+    def __init__(self, row_capacity: int = 256, col_capacity: int = 64):
+        self.tickers: list[str] = []
+        self.names: list[str] = []
+        self.sectors: list[str] = []
+        self.row_of: dict[str, int] = {}
+        self.dates: list[str] = []  # 오래된 순
+        self.col_of: dict[str, int] = {}
+        self._row_cap = row_capacity
+        self._col_cap = col_capacity
+        self.columns: dict[str, np.ndarray] = {
+            c: np.full((row_capacity, col_capacity), np.nan, order="F") for c in NUMERIC_COLUMNS
+        }
+        self.present = np.zeros((row_capacity, col_capacity), dtype=bool, order="F")
+        self.pos = np.full((row_capacity, col_capacity), -1, dtype=np.int32, order="F")
+
+    @classmethod
+    def from_arrays(
+        cls,
+        tickers: list[str],
+        names: list[str],
+        sectors: list[str],
+        dates: list[str],
+        columns: dict[str, np.ndarray],
+        present: np.ndarray,
+        pos: np.ndarray,
+    ) -> "RankIndex":
+        """
+        이미 있는 (용량, 용량) 배열을 복사 없이 감쌈 (컴파일 파일 매핑용)
+
+        사용 영역 밖(종목 수 이후 행 / 날짜 수 이후 열)은 결측(NaN / False / -1)이어야 함
+        """
+        index = cls.__new__(cls)
+        index.tickers = list(tickers)
+        index.names = list(names)
+        index.sectors = list(sectors)
+        index.row_of = {t: i for i, t in enumerate(index.tickers)}
+        index.dates = list(dates)
+        index.col_of = {d: i for i, d in enumerate(index.dates)}
+        index._row_cap, index._col_cap = present.shape
+        if len(index.tickers) > index._row_cap or len(index.dates) > index._col_cap:
+            raise ValueError(f"배열 용량 {present.shape}보다 큰 인덱스 ({len(index.tickers)}, {len(index.dates)})")
+        index.columns = {c: columns[c] for c in NUMERIC_COLUMNS}
+        index.present = present
+        index.pos = pos
+        return index
+
+    # ------------------------------------------------------------
+    # 크기 / 뷰
+    # ------------------------------------------------------------
+
+    @property
+    def n_tickers(self) -> int:
+        return len(self.tickers)
+
+    @property
+    def n_dates(self) -> int:
+        return len(self.dates)
+
+    def col(self, name: str) -> np.ndarray:
+        """사용 중인 영역만 잘라낸 뷰 (tickers × dates)"""
+        return self.columns[name][: self.n_tickers, : self.n_dates]
+
+    def mask(self) -> np.ndarray:
+        """present 뷰 (tickers × dates)"""
+        return self.present[: self.n_tickers, : self.n_dates]
+
+    # ------------------------------------------------------------
+    # 적재
+    # ------------------------------------------------------------
+
+    def set_date(self, date: str, rankings: list) -> None:
+        """
+        날짜 하나의 ranking 목록을 열로 기록
+
+        - 새 날짜가 가장 최신이면 열 추가
+        - 이미 있는 날짜면 해당 열을 덮어씀 (상류 재작성)
+        - 과거 날짜가 뒤늦게 들어오면 정렬 위치에 삽입
+        """
+        self.set_fragment(fragment_from_rankings(date, rankings))
+
+    def set_fragment(self, fragment: Fragment) -> None:
+        """Fragment 하나를 열로 기록 (set_date와 동일)"""
+        self.set_columns(
+            fragment.date, fragment.tickers, fragment.values,
+            names=fragment.names, sectors=fragment.sectors,
+        )
+
+    def set_columns(
+        self,
+        date: str,
+        tickers: list[str],
+        values: dict[str, np.ndarray],
+        names: Optional[list[str]] = None,
+        sectors: Optional[list[str]] = None,
+    ) -> None:
+        """
+        날짜 하나를 컬럼 배열로 기록 (set_date의 벡터 버전 — 컴파일된 히스토리 적재용)
+
+        values: NUMERIC_COLUMNS 각각 len(tickers) 길이 배열 (파일 순서)
+        names / sectors: 주어지면 종목명·섹터 갱신 (가장 최신 날짜 기준)
+        """
+        col = self.col_of.get(date)
+        if col is None:
+            col = self._insert_column(date)
+        else:
+            self._clear_column(col)
+
+        latest = col == self.n_dates - 1
+        rows = np.empty(len(tickers), dtype=np.int64)
+        for i, ticker in enumerate(tickers):
+            row = self.row_of.get(ticker)
+            if row is None:
+                row = self._add_ticker(ticker)
+            if names is not None and (latest or not self.names[row]):
+                self.names[row] = names[i]
+                self.sectors[row] = sectors[i] if sectors is not None else ""
+            rows[i] = row
+
+        for c in NUMERIC_COLUMNS:
+            self.columns[c][rows, col] = values[c]
+        self.present[rows, col] = True
+        self.pos[rows, col] = np.arange(len(tickers), dtype=np.int32)
+
+    def remove_date(self, date: str) -> None:
+        """날짜 열 제거 (파일 삭제 시)"""
+        col = self.col_of.get(date)
+        if col is None:
+            return
+        n = self.n_dates
+        for arr in (*self.columns.values(), self.present, self.pos):
+            arr[:, col : n - 1] = arr[:, col + 1 : n]
+        self.dates.pop(col)
+        self.col_of = {d: i for i, d in enumerate(self.dates)}
+        self._clear_column(n - 1)
+
+    def _insert_column(self, date: str) -> int:
+        if self.n_dates >= self._col_cap:
+            self._grow(cols=self._col_cap * 2)
+        n = self.n_dates
+        col = n
+        while col > 0 and self.dates[col - 1] > date:
+            col -= 1
+        if col < n:
+            # 과거 날짜 삽입 — 뒤쪽 열을 한 칸씩 민다
+            for arr in (*self.columns.values(), self.present, self.pos):
+                arr[:, col + 1 : n + 1] = arr[:, col:n]
+        self.dates.insert(col, date)
+        self.col_of = {d: i for i, d in enumerate(self.dates)} if col < n else {**self.col_of, date: col}
+        self._clear_column(col)
+        return col
+
+    def _clear_column(self, col: int) -> None:
+        for arr in self.columns.values():
+            arr[:, col] = np.nan
+        self.present[:, col] = False
+        self.pos[:, col] = -1
+
+    def _add_ticker(self, ticker: str) -> int:
+        if self.n_tickers >= self._row_cap:
+            self._grow(rows=self._row_cap * 2)
+        row = self.n_tickers
+        self.tickers.append(ticker)
+        self.names.append("")
+        self.sectors.append("")
+        self.row_of[ticker] = row
+        return row
+
+    def _grow(self, rows: Optional[int] = None, cols: Optional[int] = None) -> None:
+        rows = rows or self._row_cap
+        cols = cols or self._col_cap
+        r, c = self._row_cap, self._col_cap
+        for name, arr in self.columns.items():
+            new = np.full((rows, cols), np.nan, order="F")
+            new[:r, :c] = arr
+            self.columns[name] = new
+        present = np.zeros((rows, cols), dtype=bool, order="F")
+        present[:r, :c] = self.present
+        self.present = present
+        pos = np.full((rows, cols), -1, dtype=np.int32, order="F")
+        pos[:r, :c] = self.pos
+        self.pos = pos
+        self._row_cap, self._col_cap = rows, cols
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+
+    def history(self, ticker: str) -> list[dict]:
+        """특정 종목의 날짜별 순위 히스토리 (오래된 순)"""
+        row = self.row_of.get(ticker)
+        if row is None:
+            return []
+        n = self.n_dates
+        cols = np.flatnonzero(self.present[row, :n])
+        data = {c: self.columns[c][row, cols] for c in NUMERIC_COLUMNS}
+        history = []
+        for i, col in enumerate(cols):
+            score = data["score"][i]
+            history.append({
+                "date": self.dates[col],
+                "rank": _opt_int(data["rank"][i]),
+                "composite_rank": _opt_int(data["composite_rank"][i]),
+                "score": 0 if score != score else float(score),
+                "value_s": _opt(data["value_s"][i]),
+                "quality_s": _opt(data["quality_s"][i]),
+                "growth_s": _opt(data["growth_s"][i]),
+                "momentum_s": _opt(data["momentum_s"][i]),
+            })
+        return history
+
+    def top_mask(self, top_n: int) -> np.ndarray:
+        """composite_rank ≤ top_n 인 (종목, 날짜) 마스크"""
+        cr = self.col("composite_rank")
+        with np.errstate(invalid="ignore"):
+            return self.mask() & (cr <= top_n)
+
+    def top_history(self, top_n: int = 30) -> dict:
+        """한 번이라도 Top N에 든 종목들의 Top N 구간 히스토리"""
+        mask = self.top_mask(top_n)
+        rows = np.flatnonzero(mask.any(axis=1))
+        # 원본과 같은 순서: 처음 Top N에 든 날짜 → 그날 파일 내 위치
+        first_col = mask[rows].argmax(axis=1)
+        first_pos = self.pos[rows, first_col]
+        rows = rows[np.lexsort((first_pos, first_col))]
+
+        # 대상 행만 행 우선으로 한 번 모음 (배열은 날짜 우선 배치 — 행 단위 루프가 띄엄띄엄 읽지 않도록)
+        sub_mask = np.ascontiguousarray(mask[rows])
+        sub_cr = np.ascontiguousarray(self.col("composite_rank")[rows])
+        sub_score = np.ascontiguousarray(self.col("score")[rows])
+        stocks = {}
+        for i, row in enumerate(rows.tolist()):
+            cols = np.flatnonzero(sub_mask[i])
+            stocks[self.tickers[row]] = {
+                "name": self.names[row],
+                "sector": self.sectors[row],
+                "history": [
+                    {
+                        "date": self.dates[c],
+                        "composite_rank": int(cr),
+                        "score": 0 if score != score else float(score),
+                    }
+                    for c, cr, score in zip(cols.tolist(), sub_cr[i, cols].tolist(), sub_score[i, cols].tolist())
+                ],
+            }
+        return {"stocks": stocks, "dates": list(self.dates)}
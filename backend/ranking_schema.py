@@ -0,0 +1,114 @@
+"""
+ranking_YYYYMMDD.json / web_data_YYYYMMDD.json 스키마 검증 + 정규화 (적재 시 한 번)
+
+파일을 읽는 곳(파일 캐시 / 스트리밍 리더 / 병렬 파서)에서 여기를 거쳐 정규 레코드로 만든 뒤 캐시에 넣음.
+요청 경로의 코드는 정규 레코드를 전제로 조립만 함.
+
+ranking 레코드 정규화:
+  - ticker: 문자열 (숫자로 저장된 경우 6자리 0 채움)
+  - rank / composite_rank: 정수 — composite_rank가 없으면 rank, 둘 다 없으면 999
+  - 숫자 필드: int/float 그대로, 숫자 문자열은 float, NaN/Infinity/해석 불가 값은 None
+  - 그 외 필드는 원본 그대로 (응답 호환)
+
+구조가 깨진 파일(최상위가 객체가 아님, rankings가 배열이 아님, ticker 없는 레코드,
+순위가 숫자가 아님)은 SchemaError — 호출자가 격리(quarantine)함.
+"""
+import math
+from typing import Any, Optional
+
+# 레코드 필드 스키마 (필드 → 종류)
+RANKING_FIELDS = {
+    "ticker": "ticker",
+    "name": "str",
+    "sector": "str",
+    "rank": "rank",
+    "composite_rank": "rank",
+    "score": "number",
+    "per": "number",
+    "pbr": "number",
+    "roe": "number",
+    "fwd_per": "number",
+    "price": "number",
+    "value_s": "number",
+    "quality_s": "number",
+    "growth_s": "number",
+    "momentum_s": "number",
+}
+REQUIRED_FIELDS = ("ticker", "name")
+MISSING_RANK = 999
+
+
+class SchemaError(ValueError):
+    """파일이 선언된 스키마와 맞지 않음"""
+
+
+def _number(value: Any) -> Optional[float]:
+    """숫자 필드 정규화 — 해석할 수 없으면 None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, str):
+        try:
+            f = float(value)
+        except ValueError:
+            return None
+        return f if math.isfinite(f) else None
+    return None
+
+
+def _rank(value: Any, field: str, i: int) -> int:
+    """순위 필드 정규화 — 정수로 해석할 수 없으면 SchemaError"""
+    number = _number(value)
+    if number is None or number != int(number):
+        raise SchemaError(f"rankings[{i}].{field}: 정수 순위가 아님 ({value!r})")
+    return int(number)
+
+
+def normalize_stock(stock: Any, i: int = 0) -> dict:
+    """ranking 레코드 하나 → 정규 레코드 (새 dict)"""
+    if not isinstance(stock, dict):
+        raise SchemaError(f"rankings[{i}]: 객체가 아님")
+    for field in REQUIRED_FIELDS:
+        if stock.get(field) is None:
+            raise SchemaError(f"rankings[{i}]: {field} 없음")
+
+    record = dict(stock)
+    ticker = stock["ticker"]
+    if isinstance(ticker, int) and not isinstance(ticker, bool):
+        record["ticker"] = f"{ticker:06d}"
+    elif not isinstance(ticker, str):
+        raise SchemaError(f"rankings[{i}].ticker: 문자열이 아님 ({ticker!r})")
+    if not isinstance(stock["name"], str):
+        record["name"] = str(stock["name"])
+
+    for field, kind in RANKING_FIELDS.items():
+        if kind == "number" and field in stock:
+            record[field] = _number(stock[field])
+        elif kind == "rank" and stock.get(field) is not None:
+            record[field] = _rank(stock[field], field, i)
+    if record.get("composite_rank") is None:
+        record["composite_rank"] = record.get("rank") if record.get("rank") is not None else MISSING_RANK
+    return record
+
+
+def normalize_ranking(data: Any, date: str) -> dict:
+    """ranking 파일 전체 → {"date", "rankings": [정규 레코드], ...나머지 원본 키}"""
+    if not isinstance(data, dict):
+        raise SchemaError("ranking JSON 최상위가 객체가 아님")
+    rankings = data.get("rankings", [])
+    if not isinstance(rankings, list):
+        raise SchemaError("rankings가 배열이 아님")
+    result = dict(data)
+    result.setdefault("date", date)
+    result["rankings"] = [normalize_stock(stock, i) for i, stock in enumerate(rankings)]
+    return result
+
+
+def validate_web_data(data: Any) -> dict:
+    """web_data 파일 — 최상위 객체만 확인 (섹션별 누락은 조립하는 쪽에서 처리)"""
+    if not isinstance(data, dict):
+        raise SchemaError("web_data JSON 최상위가 객체가 아님")
+    return data
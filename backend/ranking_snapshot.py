@@ -0,0 +1,115 @@
+"""
+날짜 하나의 ranking 레코드 뷰 (RankingSnapshot)
+
+compute_* 함수들이 레코드 목록을 매번 훑거나 stock.get("composite_rank", stock.get("rank", 999))를
+반복하지 않도록 날짜마다 한 번만 만듦:
+  - position: ticker → 레코드 위치 (첫 등장 기준)
+  - composite: composite_rank → rank → 999 순으로 확정한 순위 (원본 JSON 값 그대로)
+  - 숫자 컬럼: float64 배열 (결측 = NaN) — 필요한 컬럼만 처음 접근할 때 생성
+  - rows: 원본 레코드 (응답에 그대로 들어가는 name/per 등 조회용, 복사하지 않음)
+"""
+from typing import Iterable, Optional
+
+import numpy as np
+
+from rank_index import to_float
+
+
+def composite_rank(stock: dict):
+    """레코드의 composite_rank (없으면 rank, 그것도 없으면 999)"""
+    return stock.get("composite_rank", stock.get("rank", 999))
+
+
+class RankingSnapshot:
+    """날짜 하나의 ranking 레코드 + ticker 인덱스 + 컬럼 배열"""
+
+    __slots__ = ("date", "rows", "tickers", "position", "composite", "_composite_arr", "_columns", "_sectors")
+
+    def __init__(self, date: Optional[str], rows: list[dict]):
+        self.date = date
+        self.rows = rows
+        self.tickers = [s["ticker"] for s in rows]
+        self.position: dict[str, int] = {}
+        for i, ticker in enumerate(self.tickers):
+            self.position.setdefault(ticker, i)
+        self.composite = [composite_rank(s) for s in rows]
+        self._composite_arr: Optional[np.ndarray] = None
+        self._columns: dict[str, np.ndarray] = {}
+        self._sectors: Optional[dict[str, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.position
+
+    # ------------------------------------------------------------
+    # 종목 조회
+    # ------------------------------------------------------------
+
+    def get(self, ticker: str) -> Optional[dict]:
+        """종목 레코드 (없으면 None)"""
+        i = self.position.get(ticker)
+        return None if i is None else self.rows[i]
+
+    def composite_of(self, ticker: str):
+        """종목의 composite_rank (파일에 없으면 None)"""
+        i = self.position.get(ticker)
+        return None if i is None else self.composite[i]
+
+    # ------------------------------------------------------------
+    # 배열
+    # ------------------------------------------------------------
+
+    @property
+    def composite_array(self) -> np.ndarray:
+        if self._composite_arr is None:
+            self._composite_arr = np.array([to_float(c) for c in self.composite], dtype=float)
+        return self._composite_arr
+
+    def column(self, name: str) -> np.ndarray:
+        """숫자 컬럼 (float64, 결측 = NaN)"""
+        arr = self._columns.get(name)
+        if arr is None:
+            arr = self._columns[name] = np.array([to_float(s.get(name)) for s in self.rows], dtype=float)
+        return arr
+
+    def positions(self, tickers: Iterable[str]) -> np.ndarray:
+        """종목들의 위치 배열 (모두 있어야 함)"""
+        return np.array([self.position[t] for t in tickers], dtype=np.int64)
+
+    # ------------------------------------------------------------
+    # Top N
+    # ------------------------------------------------------------
+
+    def top_positions(self, top_n: int) -> list[int]:
+        """composite_rank ≤ top_n 인 레코드 위치 (파일 순서)"""
+        with np.errstate(invalid="ignore"):
+            return np.flatnonzero(self.composite_array <= top_n).tolist()
+
+    def top_tickers(self, top_n: int) -> set[str]:
+        return {self.tickers[i] for i in self.top_positions(top_n)}
+
+    def top_rows(self, top_n: int) -> list[dict]:
+        return [self.rows[i] for i in self.top_positions(top_n)]
+
+    # ------------------------------------------------------------
+    # 필터 (페이지 조회용)
+    # ------------------------------------------------------------
+
+    def sector_positions(self, sector: str) -> np.ndarray:
+        """섹터의 레코드 위치 (파일 순서) — 섹터 인덱스는 처음 접근할 때 생성"""
+        if self._sectors is None:
+            groups: dict[str, list[int]] = {}
+            for i, stock in enumerate(self.rows):
+                groups.setdefault(stock.get("sector") or "", []).append(i)
+            self._sectors = {k: np.array(v, dtype=np.int64) for k, v in groups.items()}
+        return self._sectors.get(sector, np.empty(0, dtype=np.int64))
+
+    def select(self, sector: Optional[str] = None, max_rank: Optional[int] = None) -> np.ndarray:
+        """섹터 / composite_rank ≤ max_rank 조건에 맞는 레코드 위치 (파일 순서)"""
+        positions = self.sector_positions(sector) if sector is not None else np.arange(len(self.rows))
+        if max_rank is not None:
+            with np.errstate(invalid="ignore"):
+                positions = positions[self.composite_array[positions] <= max_rank]
+        return positions
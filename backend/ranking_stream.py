@@ -0,0 +1,143 @@
+"""
+ranking_YYYYMMDD.json 스트리밍 리더
+
+파일 전체를 json.load 하지 않고 최상위 "rankings" 배열의 종목 레코드를 하나씩 읽음.
+- 청크 단위로 읽고 레코드 하나씩 json raw_decode → 메모리는 청크 + 레코드 크기로 제한
+- composite_rank 순으로 정렬된 파일이면 컷오프를 넘는 순간 읽기 중단 (나머지 유니버스는 읽지 않음)
+- 정렬 가정이 깨진 게 보이면(순위가 역행) 끝까지 읽으면서 필터링으로 전환
+- 컷오프 이내 레코드를 top_n개 모으기 전에는 중단하지 않음 (첫 레코드부터 순위가 큰 비정렬 파일 대비)
+"""
+import json
+import re
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+_WS = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+CHUNK_SIZE = 64 * 1024
+
+
+class _Reader:
+    """청크 버퍼 위에서 JSON 토큰 단위로 전진하는 최소 파서"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 문자 (파일 끝이면 "")"""
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise json.JSONDecodeError(f"'{ch}' 필요, '{got}' 발견", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """다음 JSON 값 하나 디코드 (버퍼 끝에서 잘렸으면 더 읽고 재시도)"""
+        self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # 숫자·리터럴이 버퍼 끝에 닿았으면 뒤에 더 이어질 수 있음
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_rankings(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """최상위 "rankings" 배열의 레코드를 순서대로 yield (중간에 멈추면 파일도 닫힘)"""
+    with open(path, "r", encoding="utf-8") as f:
+        r = _Reader(f, chunk_size)
+        r.expect("{")
+        if r.peek() == "}":
+            return
+        while True:
+            key = r.value()
+            r.expect(":")
+            if key == "rankings" and r.peek() == "[":
+                r.pos += 1
+                if r.peek() == "]":
+                    r.pos += 1
+                else:
+                    while True:
+                        yield r.value()
+                        ch = r.peek()
+                        r.pos += 1
+                        if ch == "]":
+                            break
+                        if ch != ",":
+                            raise json.JSONDecodeError("rankings 배열 구분자 오류", r.buf, r.pos - 1)
+            else:
+                r.value()  # 다른 최상위 필드는 건너뜀
+            ch = r.peek()
+            r.pos += 1
+            if ch == "}":
+                return
+            if ch != ",":
+                raise json.JSONDecodeError("최상위 객체 구분자 오류", r.buf, r.pos - 1)
+
+
+def _composite_rank(stock: dict):
+    return stock.get("composite_rank", stock.get("rank", 999))
+
+
+def read_top_rankings(
+    path: Path,
+    top_n: int,
+    tickers: Optional[Iterable[str]] = None,
+    assume_sorted: bool = True,
+    normalize: Optional[Callable[[dict, int], dict]] = None,
+) -> list[dict]:
+    """
+    composite_rank ≤ top_n 인 레코드 + tickers에 포함된 레코드 (파일 순서 유지)
+
+    normalize: 레코드마다 (레코드, 위치) → 정규 레코드 (순위 비교 전에 적용)
+
+    assume_sorted=True 이면 컷오프 이내 레코드를 top_n개 모았고, 컷오프를 넘었고,
+    요청 종목을 모두 찾은 시점에 중단. 읽은 구간에서 순위 역행이 보이면 끝까지 읽음.
+    """
+    wanted = set(tickers) if tickers else set()
+    rows = []
+    in_top = 0
+    last_cr = None
+    for i, stock in enumerate(iter_rankings(path)):
+        if normalize is not None:
+            stock = normalize(stock, i)
+        cr = _composite_rank(stock)
+        if assume_sorted and last_cr is not None and cr < last_cr:
+            assume_sorted = False
+        last_cr = cr
+        if cr <= top_n:
+            rows.append(stock)
+            in_top += 1
+            wanted.discard(stock.get("ticker"))
+        elif stock.get("ticker") in wanted:
+            rows.append(stock)
+            wanted.discard(stock.get("ticker"))
+        if assume_sorted and cr > top_n and in_top >= top_n and not wanted:
+            break
+    return rows
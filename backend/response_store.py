@@ -0,0 +1,192 @@
+"""
+핫 엔드포인트 응답 바이트 저장소
+
+- 키: (엔드포인트, 파라미터) / 검증: 데이터 토큰 — 토큰이 바뀌면(새 날짜 적재) 전체 폐기
+- 값: 최종 JSON 바이트 + 압축본 (gzip, br — brotli 미설치 시 deflate)
+- 압축본은 해당 인코딩 요청이 처음 올 때 한 번만 생성
+- Accept-Encoding 협상 후 저장된 바이트를 그대로 반환 (dict 재구성·JSON 인코딩·재압축 없음)
+- 같은 키를 동시에 miss 하면 빌드는 한 번만 (single-flight)
+"""
+import gzip
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from fast_json import dumps_bytes
+from metrics import STAGE_SECONDS
+from single_flight import SingleFlight
+
+try:
+    import brotli  # 선택 의존성
+except ImportError:
+    brotli = None
+
+# 이보다 작은 응답은 압축하지 않음 (헤더 오버헤드가 더 큼)
+MIN_COMPRESS_SIZE = 1024
+
+# 서버 선호 순서
+_PREFERRED = ("br", "gzip", "deflate") if brotli is not None else ("gzip", "deflate")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> str:
+    """Accept-Encoding → 사용할 인코딩 (br / gzip / deflate / identity)"""
+    if not accept_encoding:
+        return "identity"
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    best, best_q = "identity", 0.0
+    for enc in _PREFERRED:
+        q = accepted.get(enc, wildcard)
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+_compress_seconds = STAGE_SECONDS.labels("compress")
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    start = time.perf_counter()
+    try:
+        return _compress_raw(body, encoding)
+    finally:
+        _compress_seconds.observe(time.perf_counter() - start)
+
+
+def _compress_raw(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "deflate":
+        return zlib.compress(body, 6)
+    return body
+
+
+class StoredBody:
+    """한 응답의 바이트 변형들"""
+    __slots__ = ("identity", "variants")
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        self.variants: dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> tuple[bytes, str]:
+        """(본문, 실제 인코딩) — 작은 응답은 항상 identity"""
+        if encoding == "identity" or len(self.identity) < MIN_COMPRESS_SIZE:
+            return self.identity, "identity"
+        body = self.variants.get(encoding)
+        if body is None:
+            body = _compress(self.identity, encoding)
+            self.variants[encoding] = body
+        return body, encoding
+
+
+class ResponseStore:
+    """
+    데이터 토큰 기준으로 무효화되는 응답 바이트 LRU
+
+    max_bytes는 원본 JSON 크기 기준 (압축본은 원본보다 작으므로 실제 사용량은 최대 약 3배)
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 128 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._token: Optional[str] = None
+        self._entries: "OrderedDict[Hashable, Optional[StoredBody]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, token: str, build: Callable[[], Any]) -> Optional[StoredBody]:
+        """
+        저장된 응답 반환, 없으면 build()로 만들어 저장
+
+        build()가 None을 반환하면 (데이터 없음) None도 그대로 저장해 반복 조회를 막음
+        """
+        with self._lock:
+            if token != self._token:
+                # 새 데이터 버전 — 이전 버전 응답은 전부 폐기
+                self._entries.clear()
+                self._total_bytes = 0
+                self._token = token
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # 같은 키를 동시에 miss 한 요청은 한 번의 빌드·직렬화를 공유
+        stored = self._flight.do((token, key), lambda: self._build(build))
+
+        with self._lock:
+            if token == self._token:
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self._total_bytes -= len(old.identity)
+                self._entries[key] = stored
+                if stored is not None:
+                    self._total_bytes += len(stored.identity)
+                self._evict()
+        return stored
+
+    @staticmethod
+    def _build(build: Callable[[], Any]) -> Optional[StoredBody]:
+        content = build()
+        return None if content is None else StoredBody(dumps_bytes(content))
+
+    def respond(self, request: Request, key: Hashable, token: str, build: Callable[[], Any],
+                not_found: str = "데이터 없음") -> Response:
+        """저장된 바이트로 응답 생성 (Accept-Encoding 협상)"""
+        stored = self.get(key, token, build)
+        if stored is None:
+            raise HTTPException(404, not_found)
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        # 락 없이 압축 — 동시에 첫 요청이 오면 중복 압축될 수 있으나 결과는 동일
+        body, encoding = stored.encoded(encoding)
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+                "coalesced": self._flight.coalesced,
+            }
+
+    def _evict(self) -> None:
+        """LRU 제거 — 호출자가 락을 잡고 있어야 함"""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, old = self._entries.popitem(last=False)
+            if old is not None:
+                self._total_bytes -= len(old.identity)
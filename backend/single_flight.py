@@ -0,0 +1,86 @@
+"""
+같은 키의 동시 계산을 하나로 합치는 single-flight
+
+엔드포인트는 sync def라 uvicorn 스레드풀에서 돌아감 — 데이터가 새로 들어온 직후
+여러 요청이 동시에 같은 파일을 파싱하거나 같은 compute_*를 돌리지 않도록:
+  - 키별로 진행 중인 계산이 있으면 새 호출자는 기다렸다가 그 결과(또는 예외)를 공유
+  - 계산이 끝나면 키를 지움 → 결과 보관은 호출하는 쪽 캐시가 담당
+  - calls / leaders / coalesced / errors 카운터 제공
+"""
+import threading
+from typing import Any, Callable, Hashable
+
+
+class _Call:
+    """진행 중인 계산 하나"""
+
+    __slots__ = ("done", "value", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별 진행 중 계산 공유 (스레드 안전)"""
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.leaders = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_waiters = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        fn() 결과 반환 — 같은 key로 이미 진행 중인 계산이 있으면 그 결과를 기다려 공유
+
+        fn 예외는 기다리던 호출자 모두에게 그대로 전파
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value
+
+    def stats(self) -> dict:
+        """합쳐진 호출 수 / 진행 중 키 수"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "in_flight": len(self._calls),
+                "max_waiters": self.max_waiters,
+            }
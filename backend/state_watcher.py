@@ -0,0 +1,208 @@
+"""
+state/ 디렉토리 감시 + 증분 적재
+
+- 폴링 방식 (os.scandir + (mtime, size) 비교) — 외부 의존성 없이 어느 OS에서나 동작
+- 새로 생겼거나 바뀐 ranking_*.json / web_data_*.json 만 ingest 콜백으로 전달
+- 상류 작업이 쓰는 중인 파일은 건너뜀:
+    · 두 번 연속 같은 stat이거나 settle 시간이 지난 파일만 처리
+    · ingest가 파싱 실패하면 다음 폴링에서 재시도
+- 적재가 끝나면 DataVersion(불변 객체)을 새로 만들어 참조를 통째로 교체 (atomic swap)
+- 첫 버전은 대기 중인 파일이 모두 적재된 뒤에만 발행 (빈 / 일부만 담긴 버전으로 시작하지 않도록)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+# 감시 대상 파일 종류 → 파일명 접두사
+KINDS = {"ranking": "ranking_", "web_data": "web_data_"}
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    """특정 시점의 state/ 스냅샷 메타데이터 (불변)"""
+    token: str                       # 파일 시그니처 해시 — 같은 파일 상태면 워커가 달라도 동일
+    ranking_dates: tuple[str, ...]   # 최신순
+    web_dates: tuple[str, ...]       # 최신순
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def latest_date(self) -> Optional[str]:
+        return self.ranking_dates[0] if self.ranking_dates else None
+
+
+def _parse_name(name: str) -> Optional[tuple[str, str]]:
+    """파일명 → (kind, date), 대상이 아니면 None"""
+    if not name.endswith(".json"):
+        return None
+    for kind, prefix in KINDS.items():
+        if name.startswith(prefix):
+            date_str = name[len(prefix):-5]
+            if date_str.isdigit() and len(date_str) == 8:
+                return kind, date_str
+    return None
+
+
+def signature_token(signatures: dict) -> str:
+    """(kind, date) → (mtime_ns, size) 목록의 해시 — 파일 상태가 같으면 항상 같은 값"""
+    items = sorted((k, tuple(v[:2])) for k, v in signatures.items())
+    return hashlib.sha1(repr(items).encode()).hexdigest()[:16]
+
+
+def scan_state_dir(state_dir: Path) -> dict[tuple[str, str], tuple[int, int, float]]:
+    """(kind, date) → (mtime_ns, size, mtime) — 디렉토리가 없으면 빈 dict"""
+    found = {}
+    try:
+        with os.scandir(state_dir) as it:
+            for entry in it:
+                key = _parse_name(entry.name)
+                if key is None:
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                found[key] = (st.st_mtime_ns, st.st_size, st.st_mtime)
+    except OSError:
+        pass
+    return found
+
+
+class StateWatcher:
+    """state/ 폴링 감시 스레드"""
+
+    def __init__(
+        self,
+        state_dir: Path,
+        ingest: Callable[[str, str, Path], None],
+        remove: Callable[[str, str], None],
+        on_change: Optional[Callable[["DataVersion"], None]] = None,
+        interval: float = 2.0,
+        settle: float = 1.0,
+        prime: Optional[Callable[[], None]] = None,
+    ):
+        self.state_dir = Path(state_dir)
+        self.prime = prime  # 첫 폴링 전에 한 번 (대량 적재 — 이후 ingest가 건너뛸 수 있도록)
+        self.ingest = ingest
+        self.remove = remove
+        self.on_change = on_change
+        self.interval = interval
+        self.settle = settle
+
+        self._current: Optional[DataVersion] = None
+        self._ingested: dict[tuple[str, str], tuple[int, int]] = {}  # 적재 완료된 시그니처
+        self._pending: dict[tuple[str, str], tuple[int, int]] = {}   # 지난 폴링에서 본 미확정 시그니처
+        self._failed: dict[tuple[str, str], tuple[int, int]] = {}    # 파싱 실패 (같은 시그니처면 재시도 안 함)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._poll_lock = threading.Lock()
+
+    @property
+    def current(self) -> Optional[DataVersion]:
+        """가장 최근에 발행된 버전 (첫 버전 발행 전에는 None)"""
+        return self._current
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="state-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self) -> None:
+        """다음 폴링을 즉시 실행"""
+        self._wake.set()
+
+    def _run(self) -> None:
+        if self.prime is not None:
+            try:
+                self.prime()
+            except Exception as e:
+                print(f"[watcher] 초기 적재 실패: {e}")
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"[watcher] 폴링 실패: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def poll_once(self) -> bool:
+        """한 번 스캔해서 변경분 적재 — 새 버전을 발행했으면 True"""
+        with self._poll_lock:
+            return self._poll()
+
+    def _poll(self) -> bool:
+        found = scan_state_dir(self.state_dir)
+        now = time.time()
+        changed = False
+
+        # 삭제된 파일
+        for key in list(self._ingested):
+            if key not in found:
+                self.remove(*key)
+                del self._ingested[key]
+                changed = True
+        for stale in (self._pending, self._failed):
+            for key in list(stale):
+                if key not in found:
+                    del stale[key]
+
+        # 신규 / 변경 파일 (오래된 날짜부터 — 인덱스 열이 순서대로 붙도록)
+        for key in sorted(found, key=lambda k: k[1]):
+            mtime_ns, size, mtime = found[key]
+            sig = (mtime_ns, size)
+            if self._ingested.get(key) == sig or self._failed.get(key) == sig:
+                continue
+            # 쓰는 중일 수 있는 파일: 두 번 연속 같은 stat이거나 settle 시간이 지나야 처리
+            if self._pending.get(key) != sig and now - mtime < self.settle:
+                self._pending[key] = sig
+                continue
+            self._pending.pop(key, None)
+            path = self.state_dir / f"{KINDS[key[0]]}{key[1]}.json"
+            try:
+                self.ingest(key[0], key[1], path)
+            except (json.JSONDecodeError, UnicodeDecodeError, ValueError, OSError) as e:
+                # 반쯤 쓰인 파일 — 시그니처가 바뀌면 다시 시도
+                print(f"[watcher] {path.name} 적재 보류: {e}")
+                self._failed[key] = sig
+                continue
+            self._ingested[key] = sig
+            changed = True
+
+        if self._current is None:
+            # 첫 버전: 쓰는 중이던 파일이 자리 잡아 적재될 때까지 보류
+            if self._pending:
+                return False
+            changed = True
+        if changed:
+            self._publish()
+        return changed
+
+    def _publish(self) -> None:
+        digest = signature_token(self._ingested)
+        ranking = sorted((d for k, d in self._ingested if k == "ranking"), reverse=True)
+        web = sorted((d for k, d in self._ingested if k == "web_data"), reverse=True)
+        version = DataVersion(token=digest, ranking_dates=tuple(ranking), web_dates=tuple(web))
+        self._current = version  # 참조 교체 — 읽는 쪽은 항상 완성된 버전만 봄
+        if self.on_change is not None:
+            try:
+                self.on_change(version)
+            except Exception as e:
+                print(f"[watcher] 파생 데이터 갱신 실패: {e}")
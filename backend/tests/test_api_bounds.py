@@ -0,0 +1,29 @@
+"""쿼리 파라미터 상한 — 메모 / 응답 저장소 키가 되는 값은 범위 밖이면 422"""
+import pytest
+from fastapi.testclient import TestClient
+
+import data_loader
+import main
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(data_loader, "_compiled", None)
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("query", [
+    f"top_n={main.MAX_TOP_N + 1}",
+    f"max_picks={main.MAX_PICKS + 1}",
+    "top_n=0",
+    "max_picks=0",
+])
+def test_picks_bounds(client, query):
+    assert client.get(f"/api/picks?{query}").status_code == 422
+
+
+@pytest.mark.parametrize("top_n", [main.MAX_TOP_N + 1, 0])
+def test_rank_diff_bounds(client, top_n):
+    response = client.get(f"/api/rankings/diff?from=20260105&to=20260106&top_n={top_n}")
+    assert response.status_code == 422
@@ -0,0 +1,72 @@
+"""bulk_parse — 병렬 파싱 결과가 순차와 같고, 풀이 깨지면 순차로 이어감"""
+import json
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+import bulk_loader
+from bulk_loader import bulk_parse
+
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = []
+    for d in range(1, 7):
+        date = f"202601{d:02d}"
+        rows = [{"ticker": f"{i:06d}", "name": f"종목{i}", "rank": i, "composite_rank": (i * d) % 20 + 1,
+                 "score": i / d} for i in range(1, 21)]
+        path = tmp_path / f"ranking_{date}.json"
+        path.write_text(json.dumps({"date": date, "rankings": rows}, ensure_ascii=False), encoding="utf-8")
+        paths.append(path)
+    paths[2].write_text("{", encoding="utf-8")  # 3일 파일을 깨뜨림 — on_error로 보고되고 건너뜀
+    return paths
+
+
+def summary(results) -> list:
+    return [(sig, frag.date, frag.tickers, frag.values["composite_rank"].tolist()) for sig, frag in results]
+
+
+def test_default_mode_is_process():
+    assert bulk_loader.BULK_LOAD_MODE == "process"
+
+
+@pytest.mark.parametrize("mode", ["process", "thread"])
+def test_parallel_matches_serial(paths, mode):
+    errors = []
+    serial = summary(bulk_parse(paths, mode="serial"))
+    parallel = summary(bulk_parse(paths, mode=mode, workers=2, min_files=1, on_error=lambda p, e: errors.append(p)))
+    assert parallel == serial
+    assert [p.name for p in errors] == ["ranking_20260103.json"]
+
+
+class BrokenPool:
+    """submit한 작업이 모두 BrokenProcessPool로 끝나는 풀"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+
+def test_broken_pool_falls_back_to_serial(paths, monkeypatch):
+    monkeypatch.setattr(bulk_loader, "_executor", lambda mode, workers: BrokenPool())
+    results = list(bulk_parse(paths, mode="process", workers=2, min_files=1, on_error=lambda p, e: None))
+    assert [frag.date for _, frag in results] == [f"202601{d:02d}" for d in (1, 2, 4, 5, 6)]
+    assert all(isinstance(frag.values["score"], np.ndarray) for _, frag in results)
+
+
+def test_pool_creation_failure_falls_back_to_serial(paths, monkeypatch):
+    def fail(mode, workers):
+        raise NotImplementedError("no sem_open")
+
+    monkeypatch.setattr(bulk_loader, "_executor", fail)
+    results = list(bulk_parse(paths, mode="process", workers=2, min_files=1, on_error=lambda p, e: None))
+    assert len(results) == 5
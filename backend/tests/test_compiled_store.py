@@ -0,0 +1,216 @@
+"""CompiledHistory — RankIndex 스냅샷을 copy-on-write 매핑으로 그대로 사용"""
+import hashlib
+import json
+import mmap
+
+import numpy as np
+import pytest
+
+import data_loader
+from compiled_store import COL_HEADROOM, CompiledHistory, compile_state_dir
+from rank_index import NUMERIC_COLUMNS, RankIndex, fragment_from_rankings
+
+
+def day(d: int, n: int = 40) -> tuple[str, list]:
+    """날짜마다 종목 구성이 조금씩 바뀌는 ranking 레코드"""
+    date = f"2026{(d - 1) // 28 + 1:02d}{(d - 1) % 28 + 1:02d}"
+    rows = [
+        {"ticker": f"{(i + d) % (n + 10):06d}", "name": f"종목{(i + d) % (n + 10)}", "sector": "반도체",
+         "rank": i, "composite_rank": i, "score": round(100 - i + d / 10, 2),
+         "value_s": None if i % 7 == 0 else i / n}
+        for i in range(1, n + 1)
+    ]
+    return date, rows
+
+
+def build(days) -> tuple[RankIndex, dict]:
+    index = RankIndex()
+    sigs = {}
+    for d in days:
+        date, rows = day(d)
+        index.set_fragment(fragment_from_rankings(date, rows))
+        sigs[date] = (d, 100 + d)
+    return index, sigs
+
+
+def assert_same(a: RankIndex, b: RankIndex) -> None:
+    assert a.dates == b.dates
+    assert a.tickers == b.tickers
+    assert a.names == b.names
+    for c in NUMERIC_COLUMNS:
+        np.testing.assert_array_equal(a.col(c), b.col(c))
+    np.testing.assert_array_equal(a.mask(), b.mask())
+    np.testing.assert_array_equal(a.pos[: a.n_tickers, : a.n_dates], b.pos[: b.n_tickers, : b.n_dates])
+    assert a.top_history(10) == b.top_history(10)
+    assert a.history(a.tickers[3]) == b.history(b.tickers[3])
+
+
+def file_digest(path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def test_roundtrip_reads_from_mapping(tmp_path):
+    index, sigs = build(range(1, 21))
+    store = CompiledHistory(tmp_path / "history.rkc")
+    assert store.save(index, sigs) is True
+
+    loaded, loaded_sigs = store.load()
+    assert loaded_sigs == sigs
+    assert_same(loaded, index)
+    # 배열은 매핑 위의 뷰 (복사본 아님)
+    for arr in (*loaded.columns.values(), loaded.present, loaded.pos):
+        assert isinstance(arr.base, mmap.mmap)
+
+
+def test_updates_stay_private(tmp_path):
+    index, sigs = build(range(1, 21))
+    store = CompiledHistory(tmp_path / "history.rkc")
+    store.save(index, sigs)
+    digest = file_digest(store.path)
+
+    loaded, _ = store.load()
+    # 새 날짜 추가 + 기존 날짜 재작성 + 과거 날짜 삭제 — 매핑 위에서 그대로 (파일은 그대로)
+    for d in (21, 22):
+        date, rows = day(d)
+        fragment = fragment_from_rankings(date, rows)
+        loaded.set_fragment(fragment)
+        index.set_fragment(fragment)
+    date, rows = day(5)
+    rewritten = fragment_from_rankings(date, rows[::-1])
+    loaded.set_fragment(rewritten)
+    index.set_fragment(rewritten)
+    loaded.remove_date(day(2)[0])
+    index.remove_date(day(2)[0])
+
+    assert isinstance(loaded.columns["score"].base, mmap.mmap)
+    assert_same(loaded, index)
+    assert file_digest(store.path) == digest
+
+
+def test_growth_past_headroom(tmp_path):
+    index, sigs = build(range(1, 6))
+    store = CompiledHistory(tmp_path / "history.rkc")
+    store.save(index, sigs)
+    loaded, _ = store.load()
+
+    for d in range(6, 6 + COL_HEADROOM + 5):  # 열 용량을 넘김 → 이 프로세스만 메모리로 확장
+        date, rows = day(d)
+        loaded.set_fragment(fragment_from_rankings(date, rows))
+        index.set_fragment(fragment_from_rankings(date, rows))
+    assert_same(loaded, index)
+
+
+def test_save_skipped_when_signatures_match(tmp_path):
+    index, sigs = build(range(1, 6))
+    store = CompiledHistory(tmp_path / "history.rkc")
+    assert store.save(index, sigs) is True
+    assert store.save(index, dict(sigs)) is False
+
+    date, rows = day(6)
+    index.set_fragment(fragment_from_rankings(date, rows))
+    assert store.save(index, {**sigs, date: (6, 106)}) is True
+    assert store.sigs()[date] == (6, 106)
+
+
+def test_replaced_file_does_not_affect_mapped_index(tmp_path):
+    index, sigs = build(range(1, 11))
+    store = CompiledHistory(tmp_path / "history.rkc")
+    store.save(index, sigs)
+    loaded, _ = store.load()
+
+    other, other_sigs = build(range(30, 35))
+    store.save(other, other_sigs)
+    assert_same(loaded, index)
+    assert store.load()[0].dates == other.dates
+
+
+def test_truncated_or_foreign_file_ignored(tmp_path):
+    index, sigs = build(range(1, 6))
+    store = CompiledHistory(tmp_path / "history.rkc")
+    store.save(index, sigs)
+    data = store.path.read_bytes()
+    store.path.write_bytes(data[: len(data) // 2])
+    assert store.load() is None
+    store.path.write_bytes(b"RKCOL001" + b"\0" * 100)
+    assert store.load() is None
+
+
+def write_state(state_dir, days) -> None:
+    for d in days:
+        date, rows = day(d)
+        (state_dir / f"ranking_{date}.json").write_text(
+            json.dumps({"date": date, "rankings": rows}, ensure_ascii=False), encoding="utf-8")
+
+
+def test_compile_state_dir_parses_only_changes(tmp_path):
+    state = tmp_path / "state"
+    state.mkdir()
+    write_state(state, range(1, 11))
+    store = CompiledHistory(tmp_path / "history.rkc")
+    assert compile_state_dir(store, state) == 10
+    assert compile_state_dir(store, state) == 0
+
+    date, rows = day(3)
+    (state / f"ranking_{date}.json").write_text(
+        json.dumps({"date": date, "rankings": rows[:10]}, ensure_ascii=False), encoding="utf-8")
+    (state / f"ranking_{day(4)[0]}.json").unlink()
+    assert compile_state_dir(store, state) == 1
+
+    expected = RankIndex()
+    for path in sorted(state.glob("ranking_*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        expected.set_fragment(fragment_from_rankings(data["date"], data["rankings"]))
+    loaded, _ = store.load()
+    assert loaded.dates == expected.dates
+    for c in NUMERIC_COLUMNS:
+        np.testing.assert_array_equal(loaded.col(c)[[loaded.row_of[t] for t in expected.tickers]],
+                                      expected.col(c))
+
+
+# ============================================================
+# data_loader 콜드 스타트
+# ============================================================
+
+@pytest.fixture
+def cold_start(tmp_path, monkeypatch):
+    state = tmp_path / "state"
+    state.mkdir()
+    monkeypatch.setattr(data_loader, "STATE_DIR", state)
+    monkeypatch.setattr(data_loader, "_compiled", CompiledHistory(tmp_path / "history.rkc"))
+    monkeypatch.setattr(data_loader, "COMPILED_REFRESH_DATES", 2)
+
+    def restart():
+        monkeypatch.setattr(data_loader, "_compiled_loaded", False)
+        monkeypatch.setattr(data_loader, "_compiled_sigs", None)
+        monkeypatch.setattr(data_loader, "_rank_index", RankIndex())
+        monkeypatch.setattr(data_loader, "_rank_index_sigs", {})
+
+    restart()
+    return state, restart
+
+
+def test_cold_start_maps_snapshot(cold_start):
+    state, restart = cold_start
+    write_state(state, range(1, 11))
+    with data_loader.locked_rank_index() as idx:
+        first = idx.top_history(10)
+    assert data_loader._compiled.sigs() is not None  # 스냅샷이 없었으므로 바로 저장
+
+    restart()
+    parsed = data_loader._FILES_PARSED.labels("ranking").value
+    with data_loader.locked_rank_index() as idx:
+        assert isinstance(idx.columns["score"].base, mmap.mmap)
+        assert idx.top_history(10) == first
+    assert data_loader._FILES_PARSED.labels("ranking").value == parsed  # JSON 파싱 없음
+
+    # 새 날짜 하나 — 매핑 위에 추가, 스냅샷은 COMPILED_REFRESH_DATES(2)개가 쌓일 때까지 그대로
+    write_state(state, [11])
+    snapshot_sigs = data_loader._compiled.sigs()
+    with data_loader.locked_rank_index() as idx:
+        assert idx.dates[-1] == day(11)[0]
+        assert isinstance(idx.columns["score"].base, mmap.mmap)
+    assert data_loader._compiled.sigs() == snapshot_sigs
+    write_state(state, [12])
+    with data_loader.locked_rank_index():
+        pass
+    assert day(12)[0] in data_loader._compiled.sigs()
@@ -0,0 +1,77 @@
+"""factor_grades (NumPy) — 기존 compute_factor_grades(파이썬 정렬) 결과와 정확히 일치"""
+import random
+
+import pytest
+
+from data_loader import compute_factor_grades
+from factor_grades import FactorGradeTable
+from rank_index import RankIndex, fragment_from_rankings
+
+FACTORS = {"value_s": "value", "quality_s": "quality", "growth_s": "growth", "momentum_s": "momentum"}
+
+
+def _percentile_to_grade(percentile: float) -> str:
+    if percentile < 0.10:
+        return "A+"
+    elif percentile < 0.20:
+        return "A"
+    elif percentile < 0.30:
+        return "B+"
+    elif percentile < 0.50:
+        return "B"
+    elif percentile < 0.70:
+        return "C"
+    return "D"
+
+
+def reference_grades(stocks: list) -> dict:
+    """기존 compute_factor_grades 구현 그대로 (안정 정렬, 결측 = 0)"""
+    if not stocks:
+        return {}
+    n = len(stocks)
+    result = {s["ticker"]: {} for s in stocks}
+    for factor_key, factor_name in FACTORS.items():
+        ranked = [(s["ticker"], s.get(factor_key, 0) or 0) for s in stocks]
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        for rank_idx, (ticker, _) in enumerate(ranked):
+            result[ticker][factor_name] = _percentile_to_grade(rank_idx / max(n, 1))
+    return result
+
+
+def make_day(rng: random.Random, size: int, universe: int) -> list:
+    """동점(소수 1자리)·결측 키·None이 섞인 ranking 레코드 (composite_rank 순)"""
+    tickers = rng.sample([f"{i:06d}" for i in range(universe)], size)
+    rows = []
+    for i, ticker in enumerate(tickers, 1):
+        row = {"ticker": ticker, "name": f"종목{ticker}", "rank": i, "composite_rank": i}
+        for key in FACTORS:
+            roll = rng.random()
+            if roll < 0.05:
+                continue          # 키 없음
+            row[key] = None if roll < 0.10 else round(rng.random(), 1)
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize("size", [1, 7, 30, 101])
+def test_compute_factor_grades_matches_reference(size):
+    stocks = make_day(random.Random(size), size, 500)
+    assert compute_factor_grades(stocks) == reference_grades(stocks)
+
+
+def test_empty_input():
+    assert compute_factor_grades([]) == {}
+
+
+@pytest.mark.parametrize("top_n", [None, 10, 30])
+def test_grade_table_matches_reference_per_date(top_n):
+    rng = random.Random(7)
+    days = {f"202601{d:02d}": make_day(rng, rng.randint(20, 80), 120) for d in range(1, 11)}
+    index = RankIndex()
+    for date, rows in days.items():
+        index.set_fragment(fragment_from_rankings(date, rows))
+
+    table = FactorGradeTable.build(index, top_n)
+    for date, rows in days.items():
+        universe = rows if top_n is None else [s for s in rows if s["composite_rank"] <= top_n]
+        assert table.grades_on(date) == reference_grades(universe)
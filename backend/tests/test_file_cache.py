@@ -0,0 +1,91 @@
+"""FileCache — (mtime, size) 검증 무효화 / LRU 제거"""
+import os
+
+from file_cache import FileCache
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        return path.read_text()
+
+
+def test_hit_until_file_changes(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_text("one")
+    cache, loader = FileCache(), CountingLoader()
+    assert cache.get(path, loader) == "one"
+    assert cache.get(path, loader) == "one"
+    assert loader.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalidated_when_mtime_changes(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_text("one")
+    cache, loader = FileCache(), CountingLoader()
+    cache.get(path, loader)
+    path.write_text("two")  # 같은 크기
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.get(path, loader) == "two"
+    assert loader.calls == 2
+
+
+def test_invalidated_when_size_changes_with_same_mtime(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_text("one")
+    cache, loader = FileCache(), CountingLoader()
+    cache.get(path, loader)
+    st = os.stat(path)
+    path.write_text("three")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))  # mtime은 그대로, 크기만 다름
+    assert cache.get(path, loader) == "three"
+    assert loader.calls == 2
+    assert cache.peek(path) == "three"
+
+
+def test_missing_file_returns_none_and_drops_entry(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_text("one")
+    cache, loader = FileCache(), CountingLoader()
+    cache.get(path, loader)
+    path.unlink()
+    assert cache.get(path, loader) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_by_entries(tmp_path):
+    paths = []
+    for name in "abc":
+        path = tmp_path / f"{name}.json"
+        path.write_text(name)
+        paths.append(path)
+    a, b, c = paths
+    cache, loader = FileCache(max_entries=2), CountingLoader()
+    cache.get(a, loader)
+    cache.get(b, loader)
+    cache.get(a, loader)  # a가 최근 사용 → b가 가장 오래됨
+    cache.get(c, loader)
+    assert cache.evictions == 1
+    assert cache.peek(a) == "a"
+    assert cache.peek(b) is None
+    assert cache.peek(c) == "c"
+
+
+def test_lru_eviction_by_bytes(tmp_path):
+    a, b = tmp_path / "a.json", tmp_path / "b.json"
+    a.write_text("x" * 60)
+    b.write_text("y" * 60)
+    big = tmp_path / "big.json"
+    big.write_text("z" * 200)
+    cache, loader = FileCache(max_bytes=100), CountingLoader()
+    cache.get(a, loader)
+    cache.get(b, loader)  # 120 bytes > 100 → a 제거
+    assert cache.peek(a) is None and cache.peek(b) is not None
+    assert cache.stats()["bytes"] == 60
+    assert cache.get(big, loader) == "z" * 200  # 상한보다 큰 파일은 반환만 하고 보관하지 않음
+    assert cache.peek(big) is None
@@ -0,0 +1,50 @@
+"""라우트별 HTTP 메트릭 — ETag 304 응답도 실제 라우트 템플릿으로 기록"""
+import json
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+import data_loader
+import main
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(data_loader, "_compiled", None)
+    rows = [{"ticker": "005930", "name": "삼성전자", "rank": 1, "composite_rank": 1}]
+    (tmp_path / "ranking_20260105.json").write_text(
+        json.dumps({"date": "20260105", "rankings": rows}, ensure_ascii=False), encoding="utf-8")
+    yield TestClient(main.app)
+    with data_loader._rank_index_lock:
+        if "20260105" in data_loader._rank_index_sigs:
+            data_loader._rank_index.remove_date("20260105")
+            del data_loader._rank_index_sigs["20260105"]  # with 없이 — lifespan(watcher / warm-up)은 띄우지 않음
+
+
+def request_count(client: TestClient, route: str, status: int) -> int:
+    text = client.get("/metrics").text
+    pattern = rf'^quant_http_requests_total\{{route="{re.escape(route)}",status="{status}"\}} (\d+)$'
+    match = re.search(pattern, text, re.MULTILINE)
+    return int(match.group(1)) if match else 0
+
+
+@pytest.mark.parametrize("path, route", [
+    ("/api/dates", "/api/dates"),
+    ("/api/history/005930", "/api/history/{ticker}"),
+])
+def test_not_modified_labelled_with_route(client, path, route):
+    before_200 = request_count(client, route, 200)
+    before_304 = request_count(client, route, 304)
+    before_unmatched = request_count(client, "unmatched", 304)
+
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    for _ in range(3):
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    assert request_count(client, route, 200) == before_200 + 1
+    assert request_count(client, route, 304) == before_304 + 3
+    assert request_count(client, "unmatched", 304) == before_unmatched
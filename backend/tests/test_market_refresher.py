@@ -0,0 +1,102 @@
+"""LiveRefresher — timeout / circuit breaker(open → half_open → closed) / stale 결과 유지"""
+import threading
+import time
+
+from market_refresher import LiveRefresher
+
+
+class StubFetch:
+    """호출마다 outcomes를 순서대로 적용 (Exception이면 raise, threading.Event면 set될 때까지 대기)"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, threading.Event):
+            outcome.wait(5)
+            return "late"
+        return outcome
+
+
+def make(fetch, **kwargs) -> LiveRefresher:
+    options = {"interval": 3600, "timeout": 1.0, "failure_threshold": 2, "cooldown": 0.2}
+    options.update(kwargs)
+    return LiveRefresher(fetch, **options)
+
+
+def test_success_stores_snapshot():
+    refresher = make(StubFetch({"hy": 1}))
+    assert refresher.refresh_once() is True
+    assert refresher._snapshot.value == {"hy": 1}
+    assert refresher.circuit == "closed"
+    assert refresher.state()["attempts"] == 1
+
+
+def test_timeout_counts_as_failure_and_does_not_overlap():
+    release = threading.Event()
+    fetch = StubFetch(release)
+    refresher = make(fetch, timeout=0.05, failure_threshold=5)
+    try:
+        start = time.monotonic()
+        assert refresher.refresh_once() is False
+        assert time.monotonic() - start < 1.0  # 수집을 기다리지 않음
+        assert refresher.timeouts == 1
+        assert "timeout" in refresher.last_error
+
+        # 멈춘 수집이 아직 진행 중 — 새 수집을 시작하지 않음
+        assert refresher.refresh_once() is False
+        assert fetch.calls == 1
+        assert refresher.timeouts == 2
+    finally:
+        release.set()
+
+
+def test_circuit_open_half_open_closed():
+    fetch = StubFetch(RuntimeError("down"), RuntimeError("down"), RuntimeError("down"), {"hy": 2})
+    refresher = make(fetch)
+
+    assert refresher.refresh_once() is False
+    assert refresher.circuit == "closed"  # 임계치(2) 전
+    assert refresher.refresh_once() is False
+    assert refresher.circuit == "open"
+
+    # open 동안은 수집하지 않음
+    assert refresher.refresh_once() is False
+    assert fetch.calls == 2
+
+    time.sleep(0.25)
+    assert refresher.circuit == "half_open"
+    # half-open 시도 실패 → 다시 open
+    assert refresher.refresh_once() is False
+    assert fetch.calls == 3
+    assert refresher.circuit == "open"
+
+    time.sleep(0.25)
+    assert refresher.circuit == "half_open"
+    assert refresher.refresh_once() is True
+    assert refresher.circuit == "closed"
+    assert refresher.consecutive_failures == 0
+    assert refresher.last_error is None
+
+
+def test_failures_keep_serving_last_good_value():
+    fetch = StubFetch({"hy": 3}, RuntimeError("down"))
+    refresher = make(fetch)
+    assert refresher.refresh_once() is True
+    fetched_at = refresher._snapshot.fetched_at
+    assert refresher.refresh_once() is False
+    assert refresher.refresh_once() is False
+    assert refresher.circuit == "open"
+    try:
+        live = refresher.latest()  # 요청 경로 — 실패 중에도 마지막 성공 결과
+        assert live.value == {"hy": 3}
+        assert live.fetched_at == fetched_at
+        assert live.age >= 0
+        assert refresher.state()["failures"] == 2
+    finally:
+        refresher.stop()
@@ -0,0 +1,44 @@
+"""compute_picks 메모 — 같은 뜻의 인자(weights=None / 기본 가중치)는 한 항목을 공유"""
+import pytest
+
+import data_loader
+from state_watcher import DataVersion
+
+
+@pytest.fixture
+def version(monkeypatch):
+    version = DataVersion(token="test-picks-memo", ranking_dates=("20260107", "20260106", "20260105"), web_dates=())
+    monkeypatch.setattr(data_loader, "get_data_version", lambda: version)
+    calls = []
+    monkeypatch.setattr(data_loader, "_picks_from_rankings",
+                        lambda snap, *args: calls.append(args) or {"picks": [], "args": args})
+    yield version, calls
+    with data_loader._derived_lock:
+        for key in [k for k in data_loader._derived if k[0] == version.token]:
+            del data_loader._derived[key]
+
+
+def test_default_weights_share_memo_entry(version):
+    version, calls = version
+    warm = data_loader.compute_picks()  # warm-up / 버전 발행 시 미리 계산하는 호출
+    resolved = data_loader.resolve_pick_weights(3)
+    request = data_loader.compute_picks(3, 30, 5, resolved)  # /api/picks 기본 요청
+
+    assert request is warm
+    assert calls == [(3, 30, 5, data_loader.DEFAULT_PICK_WEIGHTS)]
+
+
+def test_derived_weights_share_memo_entry(version):
+    version, calls = version
+    first = data_loader.compute_picks(n_days=4)
+    second = data_loader.compute_picks(4, weights=data_loader.resolve_pick_weights(4))
+    assert first is second
+    assert len(calls) == 1
+    assert calls[0][3] == (0.4, 0.3, 0.2, 0.1)
+
+
+def test_invalid_weights_rejected_before_compute(version):
+    _, calls = version
+    with pytest.raises(ValueError):
+        data_loader.compute_picks(3, weights=(1.0, 0.0))
+    assert calls == []
@@ -0,0 +1,44 @@
+"""_picks_from_rankings — 인덱스와 T-0 레코드가 어긋나도 (파일 재작성) 요청이 실패하지 않음"""
+import json
+
+import pytest
+
+import data_loader
+from ranking_snapshot import RankingSnapshot
+
+DATES = ["20260105", "20260106", "20260107"]
+
+
+def rows(n: int = 10) -> list:
+    return [{"ticker": f"{i:06d}", "name": f"종목{i}", "rank": i, "composite_rank": i, "score": 100.0 - i}
+            for i in range(1, n + 1)]
+
+
+@pytest.fixture
+def snap(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(data_loader, "_compiled", None)
+    for date in DATES:
+        (tmp_path / f"ranking_{date}.json").write_text(
+            json.dumps({"date": date, "rankings": rows()}, ensure_ascii=False), encoding="utf-8")
+    yield data_loader.DataSnapshot(None, list(reversed(DATES)), [])
+    with data_loader._rank_index_lock:
+        for date in DATES:
+            if date in data_loader._rank_index_sigs:
+                data_loader._rank_index.remove_date(date)
+                del data_loader._rank_index_sigs[date]
+
+
+def test_all_present(snap):
+    result = data_loader._picks_from_rankings(snap, 3, 30, 2)
+    assert [p["ticker"] for p in result["picks"]] == ["000001", "000002"]
+
+
+def test_ticker_missing_from_t0_skipped(snap, monkeypatch):
+    # 인덱스 교집합 이후 T-0 파일이 다시 쓰여 1위 종목이 빠진 경우
+    rewritten = RankingSnapshot(DATES[-1], [r for r in rows() if r["ticker"] != "000001"])
+    monkeypatch.setattr(snap, "top_snapshot", lambda date, top_n: rewritten)
+
+    result = data_loader._picks_from_rankings(snap, 3, 30, 2)
+    assert [p["ticker"] for p in result["picks"]] == ["000002", "000003"]
+    assert result["picks"][0]["name"] == "종목2"
@@ -0,0 +1,117 @@
+"""ranking 스키마 검증 + 깨진 파일 격리"""
+import json
+
+import pytest
+
+import data_loader
+from bulk_loader import parse_fragment
+from ranking_schema import SchemaError, normalize_ranking
+
+DATE = "20260105"
+
+
+def stock(i: int, **overrides) -> dict:
+    row = {"ticker": f"{i:06d}", "name": f"종목{i}", "rank": i, "composite_rank": i, "score": 1.0 / i}
+    row.update(overrides)
+    return row
+
+
+def ranking(*rows) -> dict:
+    return {"date": DATE, "rankings": list(rows)}
+
+
+# ============================================================
+# normalize_ranking
+# ============================================================
+
+def test_normalizes_numeric_strings_and_int_ticker():
+    data = normalize_ranking(ranking(stock(1, ticker=5930, rank="1", composite_rank=1.0)), DATE)
+    row = data["rankings"][0]
+    assert row["ticker"] == "005930"
+    assert row["rank"] == 1 and isinstance(row["rank"], int)
+    assert row["composite_rank"] == 1
+
+
+@pytest.mark.parametrize("value", ["1.5", 2.5, "abc", float("nan"), True, [1]])
+def test_non_integer_rank_raises(value):
+    with pytest.raises(SchemaError, match="정수 순위"):
+        normalize_ranking(ranking(stock(1), stock(2, composite_rank=value)), DATE)
+
+
+@pytest.mark.parametrize("data", [[], "x", None, {"rankings": {}}])
+def test_bad_top_level_raises(data):
+    with pytest.raises(SchemaError):
+        normalize_ranking(data, DATE)
+
+
+def test_missing_ticker_raises():
+    row = stock(1)
+    del row["ticker"]
+    with pytest.raises(SchemaError, match="ticker"):
+        normalize_ranking(ranking(row), DATE)
+
+
+def test_schema_error_is_value_error():
+    # 호출하는 쪽은 (OSError, ValueError)로 잡아 격리함
+    assert issubclass(SchemaError, ValueError)
+
+
+# ============================================================
+# 파일 → 격리
+# ============================================================
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "STATE_DIR", tmp_path)
+    yield tmp_path
+    with data_loader._quarantine_lock:
+        data_loader._quarantine.clear()
+
+
+def write_truncated(path) -> None:
+    text = json.dumps(ranking(*(stock(i) for i in range(1, 40))), ensure_ascii=False)
+    path.write_text(text[: len(text) // 2], encoding="utf-8")
+
+
+def test_parse_fragment_rejects_truncated_file(tmp_path):
+    path = tmp_path / f"ranking_{DATE}.json"
+    write_truncated(path)
+    with pytest.raises(ValueError):
+        parse_fragment(str(path))
+
+
+def test_truncated_file_quarantined(state_dir):
+    path = state_dir / f"ranking_{DATE}.json"
+    write_truncated(path)
+
+    assert data_loader._ranking_accepted(DATE, path) is False
+    assert data_loader.load_ranking(DATE) is None
+    assert DATE not in data_loader.get_available_dates()
+    [entry] = data_loader.get_quarantine()
+    assert entry["file"] == path.name
+    assert entry["kind"] == "ranking" and entry["date"] == DATE
+    assert "sig" not in entry
+
+
+def test_bad_rank_past_top_n_quarantined(state_dir):
+    # Top N 스트리밍이 도달하지 않는 뒷부분 오류도 전체 검증에서 걸려야 함
+    rows = [stock(i) for i in range(1, 60)] + [stock(60, composite_rank="sixty")]
+    path = state_dir / f"ranking_{DATE}.json"
+    path.write_text(json.dumps(ranking(*rows), ensure_ascii=False), encoding="utf-8")
+
+    assert data_loader._ranking_accepted(DATE, path) is False
+    [entry] = data_loader.get_quarantine()
+    assert entry["error"].startswith("SchemaError")
+
+
+def test_rewritten_file_released(state_dir):
+    path = state_dir / f"ranking_{DATE}.json"
+    write_truncated(path)
+    assert data_loader.load_ranking(DATE) is None
+    assert data_loader.get_quarantine()
+
+    path.write_text(json.dumps(ranking(stock(1), stock(2)), ensure_ascii=False), encoding="utf-8")
+    data = data_loader.load_ranking(DATE)
+    assert [s["ticker"] for s in data["rankings"]] == ["000001", "000002"]
+    assert data_loader.get_quarantine() == []
+    assert data_loader.get_available_dates() == [DATE]
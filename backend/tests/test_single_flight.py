@@ -0,0 +1,66 @@
+"""SingleFlight — 동시 호출 합치기 / 예외를 기다리던 호출자 모두에게 전파"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+
+WAITERS = 8
+
+
+def _run_concurrently(flight: SingleFlight, fn):
+    """WAITERS개 스레드가 같은 키로 do() — 리더가 fn 안에 있는 동안 나머지가 모두 합류하도록 대기"""
+    entered = threading.Event()
+    release = threading.Event()
+
+    def leader_fn():
+        entered.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(WAITERS) as pool:
+        futures = [pool.submit(flight.do, "key", leader_fn)]
+        entered.wait(5)
+        futures += [pool.submit(flight.do, "key", leader_fn) for _ in range(WAITERS - 1)]
+        while flight.stats()["coalesced"] < WAITERS - 1:
+            threading.Event().wait(0.001)
+        release.set()
+        return [f.exception() or f.result() for f in futures]
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"value": 42}
+
+    results = _run_concurrently(flight, compute)
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)  # 같은 객체 공유
+    stats = flight.stats()
+    assert (stats["leaders"], stats["coalesced"], stats["in_flight"]) == (1, WAITERS - 1, 0)
+
+
+def test_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    error = ValueError("broken file")
+
+    def compute():
+        raise error
+
+    results = _run_concurrently(flight, compute)
+    assert all(r is error for r in results)
+    assert flight.stats()["errors"] == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2  # 결과를 보관하지 않음
+    with pytest.raises(KeyError):
+        flight.do("key", lambda: {}["missing"])
+    assert flight.do("key", lambda: 3) == 3
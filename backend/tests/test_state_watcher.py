@@ -0,0 +1,59 @@
+"""StateWatcher — 쓰는 중인 파일이 남아 있으면 첫 버전을 발행하지 않음"""
+import json
+import os
+import time
+
+from state_watcher import StateWatcher
+
+DATES = ["20260105", "20260106", "20260107"]
+
+
+def write_ranking(state_dir, date: str, age: float = 0.0) -> None:
+    rows = [{"ticker": f"{i:06d}", "name": f"종목{i}", "rank": i, "composite_rank": i} for i in range(1, 11)]
+    path = state_dir / f"ranking_{date}.json"
+    path.write_text(json.dumps({"date": date, "rankings": rows}, ensure_ascii=False), encoding="utf-8")
+    if age:
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+
+def make_watcher(state_dir, versions: list) -> StateWatcher:
+    return StateWatcher(state_dir, ingest=lambda *a: None, remove=lambda *a: None,
+                        on_change=versions.append, settle=60.0)
+
+
+def test_first_version_waits_for_pending_files(tmp_path):
+    write_ranking(tmp_path, DATES[0], age=120)
+    for date in DATES[1:]:
+        write_ranking(tmp_path, date)  # settle 시간 안에 쓰인 파일
+    versions = []
+    watcher = make_watcher(tmp_path, versions)
+
+    assert watcher.poll_once() is False
+    assert watcher.current is None and versions == []
+
+    # 다음 폴링에서 같은 stat이면 자리 잡은 것으로 보고 전부 적재한 뒤 첫 버전 발행
+    assert watcher.poll_once() is True
+    assert [v.ranking_dates for v in versions] == [tuple(reversed(DATES))]
+    assert watcher.current is versions[0]
+
+
+def test_empty_dir_publishes_empty_version(tmp_path):
+    versions = []
+    watcher = make_watcher(tmp_path, versions)
+    assert watcher.poll_once() is True
+    assert versions[0].ranking_dates == ()
+    assert watcher.poll_once() is False
+    assert len(versions) == 1
+
+
+def test_pending_file_after_first_version_does_not_republish(tmp_path):
+    write_ranking(tmp_path, DATES[0], age=120)
+    versions = []
+    watcher = make_watcher(tmp_path, versions)
+    watcher.poll_once()
+    write_ranking(tmp_path, DATES[1])
+
+    assert watcher.poll_once() is False
+    assert watcher.poll_once() is True
+    assert [v.ranking_dates for v in versions] == [(DATES[0],), (DATES[1], DATES[0])]
@@ -0,0 +1,51 @@
+"""warm-up / readiness — 방금 쓰인 state/ 파일로 부팅해도 데이터가 적재된 뒤에만 ready"""
+import json
+
+import pytest
+
+import data_loader
+
+DATES = ["20260105", "20260106", "20260107"]
+
+
+def write_ranking(state_dir, date: str) -> None:
+    rows = [
+        {"ticker": f"{i:06d}", "name": f"종목{i}", "rank": i, "composite_rank": i, "score": 100.0 - i}
+        for i in range(1, 31)
+    ]
+    path = state_dir / f"ranking_{date}.json"
+    path.write_text(json.dumps({"date": date, "rankings": rows}, ensure_ascii=False), encoding="utf-8")
+
+
+@pytest.fixture
+def fresh_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, "STATE_DIR", tmp_path)
+    monkeypatch.setattr(data_loader, "_compiled", None)
+    monkeypatch.setattr(data_loader, "_warmup", data_loader._warmup)
+    monkeypatch.setenv("STATE_WATCH_INTERVAL", "0.05")
+    yield tmp_path
+    data_loader.stop_watcher()
+    data_loader.stop_market_refresher()
+    with data_loader._rank_index_lock:
+        for date in DATES:
+            if date in data_loader._rank_index_sigs:
+                data_loader._rank_index.remove_date(date)
+                del data_loader._rank_index_sigs[date]
+
+
+def test_ready_only_after_just_written_files_ingested(fresh_state):
+    events = []
+    data_loader.add_version_listener(events.append)
+    try:
+        for date in DATES:
+            write_ranking(fresh_state, date)  # watcher settle 시간(1초) 안에 부팅
+        state = data_loader.warm_up()
+    finally:
+        data_loader.remove_version_listener(events.append)
+
+    assert data_loader.is_ready()
+    assert "index" not in state["errors"]
+    assert data_loader.get_data_version().ranking_dates == tuple(reversed(DATES))
+    # 첫 알림부터 모든 날짜가 들어간 버전
+    assert events and events[0]["date"] == DATES[-1]
+    assert data_loader.compute_picks()["picks"]
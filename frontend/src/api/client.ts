@@ -1,5 +1,8 @@
 import type {
   RankingData,
+  RankingPage,
+  RankDiffResponse,
+  Stock,
   PicksResponse,
   DeathListResponse,
   MarketResponse,
@@ -7,12 +10,57 @@ import type {
   AIResponse,
   StockHistory,
   AllHistoryResponse,
+  DashboardResponse,
+  PicksHistoryResponse,
+  DeathListHistoryResponse,
+  GradeHistoryResponse,
+  GradeDistributionResponse,
+  VersionEvent,
 } from "../types";
 
 const API_BASE = "/api";
 
-async function fetchJson<T>(path: string): Promise<T> {
-  const res = await fetch(`${API_BASE}${path}`);
+/** /api/picks what-if 파라미터 (생략 시 서버 기본값: 3일, Top 30, 5종목, 0.5/0.3/0.2) */
+export interface PicksParams {
+  n_days?: number;
+  top_n?: number;
+  max_picks?: number;
+  weights?: number[];
+}
+
+function picksQuery(params?: PicksParams): string {
+  if (!params) return "";
+  const q = new URLSearchParams();
+  if (params.n_days) q.set("n_days", String(params.n_days));
+  if (params.top_n) q.set("top_n", String(params.top_n));
+  if (params.max_picks) q.set("max_picks", String(params.max_picks));
+  if (params.weights?.length) q.set("weights", params.weights.join(","));
+  const s = q.toString();
+  return s ? `?${s}` : "";
+}
+
+/** /api/rankings 부분 조회 파라미터 */
+export interface RankingQuery {
+  fields?: (keyof Stock)[];
+  limit?: number;
+  offset?: number;
+  sector?: string;
+  max_rank?: number;
+}
+
+function rankingQuery(query: RankingQuery): string {
+  const q = new URLSearchParams();
+  if (query.fields?.length) q.set("fields", query.fields.join(","));
+  if (query.limit) q.set("limit", String(query.limit));
+  if (query.offset) q.set("offset", String(query.offset));
+  if (query.sector) q.set("sector", query.sector);
+  if (query.max_rank) q.set("max_rank", String(query.max_rank));
+  const s = q.toString();
+  return s ? `?${s}` : "";
+}
+
+async function fetchJson<T>(path: string, init?: RequestInit): Promise<T> {
+  const res = await fetch(`${API_BASE}${path}`, init);
   if (!res.ok) {
     throw new Error(`API ${res.status}: ${path}`);
   }
@@ -23,25 +71,36 @@ async function fetchJson<T>(path: string): Promise<T> {
  * Wrapper that catches errors and returns null instead of throwing.
  * Useful for optional endpoints (market, AI, pipeline) that may not be available.
  */
-async function fetchOptional<T>(path: string): Promise<T | null> {
+async function fetchOptional<T>(path: string, init?: RequestInit): Promise<T | null> {
   try {
-    return await fetchJson<T>(path);
+    return await fetchJson<T>(path, init);
   } catch {
     return null;
   }
 }
 
 export const api = {
+  /* ── Dashboard: every panel from one server snapshot ── */
+  getDashboard: () => fetchJson<DashboardResponse>("/dashboard"),
+
   /* ── Dates ── */
   getDates: () => fetchJson<{ dates: string[] }>("/dates"),
 
   /* ── Rankings ── */
   getLatestRanking: () => fetchJson<RankingData>("/rankings/latest"),
   getRanking: (date: string) => fetchJson<RankingData>(`/rankings/${date}`),
+  /** date: YYYYMMDD 또는 "latest" */
+  getRankingPage: (date: string, query: RankingQuery) =>
+    fetchJson<RankingPage>(`/rankings/${date}${rankingQuery(query)}`),
+  getRankDiff: (from: string, to: string, topN?: number) =>
+    fetchJson<RankDiffResponse>(`/rankings/diff?from=${from}&to=${to}${topN ? `&top_n=${topN}` : ""}`),
 
   /* ── Picks / Death List ── */
-  getPicks: () => fetchJson<PicksResponse>("/picks"),
+  getPicks: (params?: PicksParams) =>
+    fetchJson<PicksResponse>(`/picks${picksQuery(params)}`),
+  getPicksHistory: () => fetchJson<PicksHistoryResponse>("/picks/history"),
   getDeathList: () => fetchJson<DeathListResponse>("/deathlist"),
+  getDeathListHistory: () => fetchJson<DeathListHistoryResponse>("/deathlist/history"),
 
   /* ── Market (optional - may not be implemented yet) ── */
   getMarket: () => fetchOptional<MarketResponse>("/market"),
@@ -56,4 +115,38 @@ export const api = {
   getStockHistory: (ticker: string) =>
     fetchJson<{ ticker: string; history: StockHistory[] }>(`/history/${ticker}`),
   getAllHistory: () => fetchJson<AllHistoryResponse>("/history"),
+
+  /* ── Factor grades (top_n 생략 시 전 종목 대비) ── */
+  getGradeHistory: (ticker: string, topN?: number) =>
+    fetchJson<GradeHistoryResponse>(
+      `/grades/history/${ticker}${topN ? `?top_n=${topN}` : ""}`,
+    ),
+  getGradeDistribution: (date = "latest", topN?: number) =>
+    fetchJson<GradeDistributionResponse>(
+      `/grades/distribution/${date}${topN ? `?top_n=${topN}` : ""}`,
+    ),
+};
+
+/**
+ * 새 데이터 버전 알림 (SSE) — 해제 함수 반환.
+ * EventSource가 끊기면 자동 재연결하고, 재연결 시 Last-Event-ID로 놓친 버전을 알려줌.
+ */
+export function subscribeVersions(onVersion: (event: VersionEvent) => void): () => void {
+  const source = new EventSource(`${API_BASE}/stream`);
+  source.addEventListener("version", (e) => {
+    onVersion(JSON.parse((e as MessageEvent<string>).data) as VersionEvent);
+  });
+  return () => source.close();
+}
+
+/** 버전 알림 후 다시 받기 — 브라우저 캐시(max-age)를 건너뛰고 ETag로 재검증 */
+const REVALIDATE: RequestInit = { cache: "no-cache" };
+
+export const refetchPanel = {
+  ranking: () => fetchJson<RankingData>("/rankings/latest", REVALIDATE),
+  picks: () => fetchJson<PicksResponse>("/picks", REVALIDATE),
+  deathlist: () => fetchJson<DeathListResponse>("/deathlist", REVALIDATE),
+  market: () => fetchOptional<MarketResponse>("/market", REVALIDATE),
+  pipeline: () => fetchOptional<PipelineResponse>("/pipeline", REVALIDATE),
+  ai: () => fetchOptional<AIResponse>("/ai", REVALIDATE),
 };
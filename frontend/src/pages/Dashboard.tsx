@@ -1,5 +1,5 @@
-import { useEffect, useState, useMemo } from "react";
-import { api } from "../api/client";
+import { useEffect, useRef, useState, useMemo } from "react";
+import { api, refetchPanel, subscribeVersions } from "../api/client";
 import type {
   RankingData, PicksResponse, DeathListResponse, MarketResponse,
   PipelineResponse, AIResponse, Stock, HYData, KRData, VIXData,
@@ -23,24 +23,35 @@ export default function Dashboard() {
   const [pipeline, setPipeline] = useState<PipelineResponse | null>(null);
   const [ai, setAi] = useState<AIResponse | null>(null);
   const [loading, setLoading] = useState(true);
+  const dataVersion = useRef<string | null | undefined>(undefined);  // undefined = 첫 로드 전
 
   useEffect(() => {
-    Promise.all([
-      api.getLatestRanking(),
-      api.getPicks(),
-      api.getDeathList(),
-      api.getMarket(),
-      api.getPipeline(),
-      api.getAI(),
-    ])
-      .then(([r, p, d, m, pl, a]) => {
-        setRanking(r); setPicks(p); setDeathList(d);
-        setMarket(m); setPipeline(pl); setAi(a);
+    api.getDashboard()
+      .then((d) => {
+        dataVersion.current = d.data_version;
+        setRanking(d.ranking); setPicks(d.picks); setDeathList(d.deathlist);
+        setMarket(d.market); setPipeline(d.pipeline); setAi(d.ai);
       })
       .catch(console.error)
       .finally(() => setLoading(false));
   }, []);
 
+  // 새 데이터 버전 push → 바뀐 패널만 다시 받음
+  useEffect(() => subscribeVersions((ev) => {
+    if (!ev.token || dataVersion.current === undefined || ev.token === dataVersion.current) return;
+    dataVersion.current = ev.token;
+    for (const panel of ev.panels) {
+      switch (panel) {
+        case "ranking": refetchPanel.ranking().then(setRanking).catch(console.error); break;
+        case "picks": refetchPanel.picks().then(setPicks).catch(console.error); break;
+        case "deathlist": refetchPanel.deathlist().then(setDeathList).catch(console.error); break;
+        case "market": refetchPanel.market().then(setMarket); break;
+        case "pipeline": refetchPanel.pipeline().then(setPipeline); break;
+        case "ai": refetchPanel.ai().then(setAi); break;
+      }
+    }
+  }), []);
+
   if (loading) return <LoadingSkeleton />;
 
   const credit = market?.credit;
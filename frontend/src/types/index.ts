@@ -31,6 +31,46 @@ export interface RankingData {
   metadata?: RankingMetadata;
 }
 
+/** /api/rankings 부분 조회 응답 (fields를 주면 rankings 항목은 요청한 필드만) */
+export interface RankingPage {
+  date: string;
+  generated_at?: string;
+  rankings: Partial<Stock>[];
+  metadata?: RankingMetadata;
+  page: {
+    total: number;
+    offset: number;
+    limit: number | null;
+    next_offset: number | null;
+  };
+}
+
+/** /api/rankings/diff — 바뀐 종목만 */
+export interface RankDiffEntry {
+  ticker: string;
+  name: string;
+  sector: string;
+  from_rank: number | null;
+  to_rank: number | null;
+  rank_change: number | null;
+  from_score: number | null;
+  to_score: number | null;
+  score_change: number | null;
+  top_change: "in" | "out" | null;
+}
+
+export interface RankDiffResponse {
+  from: string;
+  to: string;
+  top_n: number;
+  min_score_change: number;
+  universe: number;
+  changed: number;
+  entries: string[];
+  exits: string[];
+  diff: RankDiffEntry[];
+}
+
 /* ───────────── Picks ───────────── */
 export interface FactorGrades {
   value: string;
@@ -64,6 +104,30 @@ export interface PicksResponse {
   message?: string;
 }
 
+export interface PicksHistoryPick {
+  ticker: string;
+  name: string;
+  sector: string;
+  weighted_rank: number;
+  composite_rank: number;
+  trajectory: number[];
+}
+
+export interface PicksHistoryEntry {
+  date: string;
+  picks: PicksHistoryPick[];
+  total_common: number;
+  added: string[];
+  removed: string[];
+  turnover: number | null;
+}
+
+export interface PicksHistoryResponse {
+  dates: string[];
+  history: PicksHistoryEntry[];
+  avg_turnover: number | null;
+}
+
 /* ───────────── Death List ───────────── */
 export interface DeathListItem {
   ticker: string;
@@ -81,6 +145,17 @@ export interface DeathListResponse {
   message?: string;
 }
 
+export interface DeathListHistoryResponse {
+  top_n: number;
+  history: { dates: { yesterday: string; today: string }; death_list: DeathListItem[] }[];
+  summary: {
+    days: number;
+    total_exits: number;
+    dropped_out: number;
+    reasons: Record<string, number>;
+  };
+}
+
 /* ───────────── Market ───────────── */
 export interface IndexData {
   close: number | null;
@@ -142,6 +217,15 @@ export interface MarketResponse {
   pick_level?: PickLevel | null;
   warnings: string[];
   date: string;
+  /** web_data 캐시 없이 실시간 수집으로 응답할 때만 */
+  live?: MarketLive;
+}
+
+export interface MarketLive {
+  fetched_at: string | null;
+  age_seconds: number | null;
+  stale: boolean;
+  circuit: "closed" | "open" | "half_open";
 }
 
 /* ───────────── Pipeline ───────────── */
@@ -194,6 +278,28 @@ export interface AllHistoryResponse {
   dates: string[];
 }
 
+/* ───────────── Data version push (/api/stream) ───────────── */
+export type DashboardPanel = "ranking" | "picks" | "deathlist" | "market" | "pipeline" | "ai";
+
+export interface VersionEvent {
+  token: string | null;
+  date: string | null;
+  web_date: string | null;
+  panels: DashboardPanel[];
+}
+
+/* ───────────── Dashboard (bootstrap) ───────────── */
+export interface DashboardResponse {
+  date: string | null;
+  data_version: string | null;
+  ranking: RankingData | null;
+  picks: PicksResponse;
+  deathlist: DeathListResponse;
+  market: MarketResponse | null;
+  pipeline: PipelineResponse | null;
+  ai: AIResponse | null;
+}
+
 /* ───────────── Factor Grades ───────────── */
 export type GradeLetter = "A+" | "A" | "B+" | "B" | "C" | "D";
 
@@ -205,6 +311,23 @@ export interface FactorInfo {
   score: number | null;
 }
 
+export interface GradeHistoryEntry extends FactorGrades {
+  date: string;
+}
+
+export interface GradeHistoryResponse {
+  ticker: string;
+  top_n: number | null;
+  history: GradeHistoryEntry[];
+}
+
+export interface GradeDistributionResponse {
+  date: string;
+  top_n: number | null;
+  count: number;
+  factors: Record<FactorInfo["key"], Record<GradeLetter, number>>;
+}
+
 /* ───────────── Sort ───────────── */
 export type SortDirection = "asc" | "desc";
 export interface SortConfig {